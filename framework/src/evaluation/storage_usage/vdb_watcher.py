@@ -27,7 +27,7 @@ class VDBWatcher:
     # If needed implement this as part of the vdb interface.
     def get_memory_usage(self) -> int:
         if isinstance(self.__vdb_connector, InMemoryVDB):
-            return sys.getsizeof(self.__vdb_connector._vdb)
+            return sum(sys.getsizeof(partition.object_ids) for partition in self.__vdb_connector._partitions.values())
         if isinstance(self.__vdb_connector, QdrantVDBConnector):
             snapshot = self.__vdb_connector._client.create_full_snapshot()
             name, size = (snapshot.name, snapshot.size) if snapshot is not None else (None, 0)
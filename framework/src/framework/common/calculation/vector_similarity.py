@@ -32,5 +32,25 @@ class VectorSimilarityCalculator:
             case _:
                 raise ValueError(f"Unsupported calculation method: {self.__method}")
 
+    def calculate_similarities_np(self, matrix: NPArray, vector: NPArray) -> NPArray:
+        match self.__method:
+            case DistanceMetric.INNER_PRODUCT:
+                return self.__calculate_inner_products(matrix, vector)
+            case _:
+                raise ValueError(f"Unsupported calculation method: {self.__method}")
+
+    def calculate_similarity_matrix_np(self, matrix: NPArray, vectors: NPArray) -> NPArray:
+        """
+        Return the similarities of every matrix row (first axis) to every vector (second axis).
+        """
+        match self.__method:
+            case DistanceMetric.INNER_PRODUCT:
+                return self.__calculate_inner_products(matrix, vectors.T)
+            case _:
+                raise ValueError(f"Unsupported calculation method: {self.__method}")
+
     def __calculate_inner_product(self, vector_a: NPArray, vector_b: NPArray) -> float:
         return np.inner(vector_a, vector_b)
+
+    def __calculate_inner_products(self, matrix: NPArray, vector: NPArray) -> NPArray:
+        return matrix @ vector
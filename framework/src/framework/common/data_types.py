@@ -14,8 +14,10 @@
 
 from __future__ import annotations
 
+from functools import cache
+
 import numpy as np
-from beartype.typing import Any, Mapping, Sequence
+from beartype.typing import Any, Iterable, Mapping, Sequence
 
 from superlinked.framework.common.exception import (
     MismatchingDimensionException,
@@ -23,32 +25,60 @@ from superlinked.framework.common.exception import (
 )
 from superlinked.framework.common.schema.blob_information import BlobInformation
 from superlinked.framework.common.schema.image_data import ImageData
+from superlinked.framework.common.settings import Settings
 
 Json = Mapping[str, Any]
 NPArray = np.ndarray[
     Any,
-    np.dtype[np.float64],  # type: ignore # numpy stub is missing for mypy-pylance
+    np.dtype[np.floating],  # type: ignore # numpy stub is missing for mypy-pylance
 ]
 NP_PRINT_PRECISION = 6
+NO_NEGATIVE_FILTER_INDICES: frozenset[int] = frozenset()
+
+
+@cache
+def get_vector_dtype() -> np.dtype:
+    return np.dtype(Settings().SUPERLINKED_VECTOR_DTYPE)
 
 
 class Vector:
+    """
+    Immutable vector of `SUPERLINKED_VECTOR_DTYPE` components.
+    The value is a read-only array, so derived vectors share the arrays they do not change instead of copying them.
+    Arrays passed in are wrapped in read-only views, leaving the caller's array writable.
+    Negative filters are kept as a read-only boolean mask (None if there are none), shared the same way;
+    their indices are only materialized on demand.
+    """
+
+    __slots__ = ("value", "__dimension", "__negative_filter_mask", "__negative_filter_indices", "__denormalizer")
+
     def __init__(
         self,
         value: Sequence[float] | Sequence[np.float64] | NPArray,
         negative_filter_indices: set[int] | frozenset[int] | None = None,
         denormalizer: float = 1.0,
+        negative_filter_mask: NPArray | None = None,
     ) -> None:
-        if isinstance(value, np.ndarray):
-            value_to_set = value
-        else:
-            value_to_set = np.array(list(value), dtype=np.float64)
-        self.value: NPArray = value_to_set
+        """
+        The negative filters are given either by their indices or by a boolean mask of the dimension of the value;
+        the mask takes precedence.
+        """
+        self.value: NPArray = Vector.__to_read_only_array(value)
         self.__dimension: int = len(self.value)
-        self.__negative_filter_indices = (
-            frozenset(negative_filter_indices) if negative_filter_indices else frozenset({})
-        )
-        self.__validate_negative_filter_indices()
+        self.__negative_filter_indices: frozenset[int] | None
+        if negative_filter_mask is not None:
+            self.__negative_filter_mask = self.__to_read_only_mask(negative_filter_mask)
+            # the indices of a mask are computed on demand
+            self.__negative_filter_indices = NO_NEGATIVE_FILTER_INDICES if self.__negative_filter_mask is None else None
+        elif negative_filter_indices:
+            self.__negative_filter_indices = frozenset(negative_filter_indices)
+            self.__validate_negative_filter_indices(self.__negative_filter_indices)
+            self.__negative_filter_mask = Vector.create_negative_filter_mask(
+                self.__dimension, self.__negative_filter_indices
+            )
+        else:
+            self.__negative_filter_indices = NO_NEGATIVE_FILTER_INDICES
+            self.__negative_filter_mask = None
         self.__denormalizer = denormalizer
 
     @property
@@ -63,13 +93,29 @@ class Vector:
     def empty_vector() -> Vector:
         return Vector([])
 
+    @staticmethod
+    def create_negative_filter_mask(dimension: int, negative_filter_indices: Iterable[int]) -> NPArray:
+        """
+        Create a read-only negative filter mask, to be shared by the vectors filtering the same indices.
+        """
+        mask = np.zeros(dimension, dtype=np.bool_)
+        mask[list(negative_filter_indices)] = True
+        mask.flags.writeable = False
+        return mask
+
+    @property
+    def negative_filter_mask(self) -> NPArray | None:
+        return self.__negative_filter_mask
+
     @property
     def negative_filter_indices(self) -> frozenset[int]:
+        if self.__negative_filter_indices is None:
+            self.__negative_filter_indices = frozenset(np.flatnonzero(self.__negative_filter_mask).tolist())
         return self.__negative_filter_indices
 
     @property
     def non_negative_filter_indices(self) -> set[int]:
-        return set(range(self.dimension)) - set(self.negative_filter_indices)
+        return set(np.flatnonzero(self.non_negative_filter_mask).tolist())
 
     @property
     def is_empty(self) -> bool:
@@ -77,13 +123,15 @@ class Vector:
 
     @property
     def without_negative_filter(self) -> Vector:
+        if self.__negative_filter_mask is None:
+            return Vector(self.value)
         return Vector(self.value[self.non_negative_filter_mask])
 
     @property
     def non_negative_filter_mask(self) -> np.ndarray:
-        mask = np.ones(self.dimension, dtype=np.bool_)
-        mask[list(self.negative_filter_indices)] = False
-        return mask
+        if self.__negative_filter_mask is None:
+            return np.ones(self.dimension, dtype=np.bool_)
+        return ~self.__negative_filter_mask
 
     def normalize(self, length: float) -> Vector:
         if length in [0, 1] or self.is_empty:
@@ -96,67 +144,80 @@ class Vector:
 
     def aggregate(self, vector: Vector) -> Vector:
         if self.is_empty:
-            return vector.__copy()
+            return vector
         if vector.is_empty:
-            return self.__copy()
+            return self
         if self.dimension != vector.dimension:
             raise MismatchingDimensionException(
                 f"Cannot aggregate vectors with different dimensions: {self.dimension} != {vector.dimension}"
             )
+        if self.__negative_filter_mask is None or vector.__negative_filter_mask is None:
+            return self.copy_with_new(self.value + vector.value, NO_NEGATIVE_FILTER_INDICES)
         return self.copy_with_new(
             self.value + vector.value,
-            negative_filter_indices=self.negative_filter_indices.intersection(vector.negative_filter_indices),
+            negative_filter_mask=self.__negative_filter_mask & vector.__negative_filter_mask,
         )
 
-    def __validate_negative_filter_indices(self) -> None:
-        if not self.negative_filter_indices:
-            return
-        if len(self.negative_filter_indices) > self.dimension:
-            raise NegativeFilterException(
-                f"Invalid number of negative filter indices: {len(self.negative_filter_indices)}."
-            )
-        index_min = min(self.negative_filter_indices)
+    def __validate_negative_filter_indices(self, negative_filter_indices: frozenset[int]) -> None:
+        if len(negative_filter_indices) > self.dimension:
+            raise NegativeFilterException(f"Invalid number of negative filter indices: {len(negative_filter_indices)}.")
+        index_min = min(negative_filter_indices)
         if index_min < 0:
             raise NegativeFilterException(f"Invalid negative filter index: {index_min}.")
-        index_max = max(self.negative_filter_indices)
+        index_max = max(negative_filter_indices)
         if index_max > self.dimension - 1:
             raise NegativeFilterException(f"Invalid negative filter index: {index_max}.")
 
+    def __to_read_only_mask(self, mask: NPArray) -> NPArray | None:
+        if mask.dtype != np.bool_ or mask.shape != (self.dimension,):
+            raise NegativeFilterException(
+                f"Invalid negative filter mask of {mask.dtype} and shape {mask.shape} for dimension {self.dimension}."
+            )
+        if not mask.any():
+            return None
+        if mask.flags.writeable:
+            mask = mask.view()
+            mask.flags.writeable = False
+        return mask
+
     def apply_negative_filter(self, other: Vector) -> Vector:
-        if self.negative_filter_indices == other.negative_filter_indices:
-            values = [
-                (self.value[i] if i not in other.negative_filter_indices else value)
-                for i, value in enumerate(other.value)
-            ]
+        mask = other.non_negative_filter_mask
+        is_aligned = Vector.__are_masks_equal(self.__negative_filter_mask, other.__negative_filter_mask)
+        # unless aligned with other, self holds only the values of the non negative filter indices of other
+        value_count = other.dimension if is_aligned else int(np.count_nonzero(mask))
+        if self.dimension < value_count:
+            raise MismatchingDimensionException(
+                f"Cannot apply negative filter, the vector is too short: {self.dimension} < {value_count}"
+            )
+        if is_aligned:
+            values = np.where(mask, self.value[:value_count], other.value)
         else:
-            value_iterator = iter(self.value)
-            values = [
-                (next(value_iterator) if i not in other.negative_filter_indices else value)
-                for i, value in enumerate(other.value)
-            ]
-        return self.copy_with_new(values, other.negative_filter_indices)
+            values = other.value.copy()
+            values[mask] = self.value[:value_count]
+        if other.__negative_filter_mask is None:
+            return self.copy_with_new(values, NO_NEGATIVE_FILTER_INDICES)
+        return self.copy_with_new(values, negative_filter_mask=other.__negative_filter_mask)
 
     def replace_negative_filters(self, new_negative_filter_value: float) -> Vector:
-        return self.copy_with_new(
-            [
-                (new_negative_filter_value if i in self.negative_filter_indices else original_value)
-                for i, original_value in enumerate(self.value)
-            ]
-        )
+        if self.__negative_filter_mask is None:
+            return self
+        return self.copy_with_new(np.where(self.__negative_filter_mask, new_negative_filter_value, self.value))
 
     def concatenate(self, other: Any) -> Vector:
         if not isinstance(other, Vector):
             return NotImplemented
         if self.is_empty:
-            return other.__copy()
+            return other
         if other.is_empty:
-            return self.__copy()
-        negative_filter_indices = self.negative_filter_indices.union(
-            {i + self.dimension for i in other.negative_filter_indices}
-        )
+            return self
+        value = np.concatenate((self.value, other.value))
+        if self.__negative_filter_mask is None and other.__negative_filter_mask is None:
+            return self.copy_with_new(value, NO_NEGATIVE_FILTER_INDICES)
         return self.copy_with_new(
-            np.concatenate((self.value, np.array(other.value, dtype=np.float64))),
-            negative_filter_indices,
+            value,
+            negative_filter_mask=np.concatenate(
+                (self.__get_dense_negative_filter_mask(), other.__get_dense_negative_filter_mask())
+            ),
         )
 
     def split(self, lengths: list[int]) -> list[Vector]:
@@ -166,23 +227,16 @@ class Vector:
             )
         indices = list(np.cumsum(np.array([0] + lengths))[1:].tolist())
         split_values = np.split(self.value, indices)
-        split_vectors = []
-        for i, length in enumerate(lengths):
-            start_index = indices[i - 1] if i > 0 else 0
-            end_index = start_index + length
-            negative_filter_indices = {
-                idx - start_index for idx in self.negative_filter_indices if start_index <= idx < end_index
-            }
-            split_vectors.append(Vector(split_values[i], negative_filter_indices))
-        return split_vectors
+        if self.__negative_filter_mask is None:
+            return [Vector(split_values[i]) for i in range(len(lengths))]
+        split_masks = np.split(self.__negative_filter_mask, indices)
+        return [Vector(split_values[i], negative_filter_mask=split_masks[i]) for i in range(len(lengths))]
 
     def __mul__(self, other: float | int | Vector) -> Vector:
         if self.is_empty:
             return self
         if isinstance(other, int | float):
-            return (
-                self.copy_with_new(self.value) if float(other) == 1.0 else self.copy_with_new(self.value * float(other))
-            )
+            return self if float(other) == 1.0 else self.copy_with_new(self.value * float(other))
         if self.dimension != other.dimension:
             raise ValueError(
                 f"Vector dimensions are not equal. First Vector dimension={self.dimension} "
@@ -199,9 +253,8 @@ class Vector:
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Vector):
-            return (
-                np.array_equal(self.value, other.value)
-                and self.negative_filter_indices == other.negative_filter_indices
+            return np.array_equal(self.value, other.value) and Vector.__are_masks_equal(
+                self.__negative_filter_mask, other.__negative_filter_mask
             )
         return False
 
@@ -213,25 +266,50 @@ class Vector:
         value: list[float] | list[np.float64] | NPArray | None = None,
         negative_filter_indices: set[int] | frozenset[int] | None = None,
         denormalizer: float | None = None,
+        negative_filter_mask: NPArray | None = None,
     ) -> Vector:
-        value_to_use = self.value if value is None else value
-        denormalizer_to_use = self.denormalizer if denormalizer is None else denormalizer
-        negative_filter_indices_to_use = (
-            self.negative_filter_indices if negative_filter_indices is None else negative_filter_indices
-        )
+        """
+        Return a vector with the given attributes replaced. The unchanged ones are shared, not copied.
+        """
+        if negative_filter_mask is None and negative_filter_indices is None:
+            negative_filter_mask = self.__negative_filter_mask
         return Vector(
-            value_to_use.copy(),
-            negative_filter_indices_to_use.copy(),
-            denormalizer_to_use,
+            self.value if value is None else value,
+            negative_filter_indices,
+            self.denormalizer if denormalizer is None else denormalizer,
+            negative_filter_mask,
         )
 
     def to_list(self) -> list[float]:
         return [float(x) for x in self.value.tolist()]
 
-    def __copy(self) -> Vector:
-        if self.is_empty:
-            return self
-        return self.copy_with_new()
+    def __get_dense_negative_filter_mask(self) -> NPArray:
+        if self.__negative_filter_mask is None:
+            return np.zeros(self.dimension, dtype=np.bool_)
+        return self.__negative_filter_mask
+
+    @staticmethod
+    def __are_masks_equal(mask: NPArray | None, other_mask: NPArray | None) -> bool:
+        if mask is None or other_mask is None:
+            return mask is other_mask
+        if mask.shape != other_mask.shape:
+            # masks of vectors of different dimensions are equal if they filter the same indices
+            return np.array_equal(np.flatnonzero(mask), np.flatnonzero(other_mask))
+        return mask is other_mask or np.array_equal(mask, other_mask)
+
+    @staticmethod
+    def __to_read_only_array(value: Sequence[float] | Sequence[np.float64] | NPArray) -> NPArray:
+        dtype = get_vector_dtype()
+        if not isinstance(value, np.ndarray):
+            array = np.array(value if isinstance(value, list | tuple) else list(value), dtype=dtype)
+        elif value.dtype != dtype:
+            array = value.astype(dtype)
+        elif not value.flags.writeable:
+            return value
+        else:
+            array = value.view()
+        array.flags.writeable = False
+        return array
 
     def __str__(self) -> str:
         return np.array_str(  # type: ignore # numpy stub is missing for mypy-pylance
@@ -243,7 +321,177 @@ class Vector:
 
     @classmethod
     def init_zero_vector(cls, length: int) -> Vector:
-        return Vector([0] * length)
+        return Vector(np.zeros(length, dtype=get_vector_dtype()))
+
+
+class VectorBatch:
+    """
+    Immutable batch of vectors of the same dimension, kept as the rows of a single read-only 2D array,
+    so operations on a batch are a few array operations instead of one per vector.
+    The negative filter mask is either shared by every row (1D), given per row (2D) or None;
+    the denormalizers are given per row. The vectors of a batch are views of its rows.
+    """
+
+    __slots__ = ("value", "__negative_filter_mask", "__denormalizers")
+
+    def __init__(
+        self,
+        value: NPArray,
+        negative_filter_mask: NPArray | None = None,
+        denormalizers: NPArray | None = None,
+    ) -> None:
+        if value.ndim != 2:
+            raise MismatchingDimensionException(f"Vector batch values must be 2D, got shape {value.shape}.")
+        self.value: NPArray = VectorBatch.__to_read_only(value, get_vector_dtype())
+        self.__negative_filter_mask = self.__validate_negative_filter_mask(negative_filter_mask)
+        self.__denormalizers: NPArray = (
+            np.ones(self.size) if denormalizers is None else VectorBatch.__to_read_only(denormalizers, np.float64)
+        )
+
+    @property
+    def size(self) -> int:
+        return self.value.shape[0]
+
+    @property
+    def dimension(self) -> int:
+        return self.value.shape[1]
+
+    @property
+    def negative_filter_mask(self) -> NPArray | None:
+        """
+        The mask of the whole batch, a broadcast view if the mask is shared by the rows.
+        """
+        if self.__negative_filter_mask is None or self.__negative_filter_mask.ndim == 2:
+            return self.__negative_filter_mask
+        return np.broadcast_to(self.__negative_filter_mask, self.value.shape)
+
+    @property
+    def denormalizers(self) -> NPArray:
+        return self.__denormalizers
+
+    @staticmethod
+    def can_batch(vectors: Sequence[Vector]) -> bool:
+        """
+        Whether the vectors are non-empty and have the same dimension.
+        """
+        return bool(vectors) and len({vector.dimension for vector in vectors}) == 1 and not vectors[0].is_empty
+
+    @staticmethod
+    def from_vectors(vectors: Sequence[Vector]) -> VectorBatch:
+        if not vectors:
+            raise ValueError("Cannot create a vector batch without vectors.")
+        if len({vector.dimension for vector in vectors}) != 1:
+            raise MismatchingDimensionException("Cannot batch vectors of different dimensions.")
+        masks = [vector.negative_filter_mask for vector in vectors]
+        negative_filter_mask: NPArray | None
+        if all(mask is masks[0] for mask in masks):
+            negative_filter_mask = masks[0]
+        else:
+            negative_filter_mask = np.stack([vector.non_negative_filter_mask for vector in vectors])
+            np.logical_not(negative_filter_mask, out=negative_filter_mask)
+        return VectorBatch(
+            np.stack([vector.value for vector in vectors]),
+            negative_filter_mask,
+            np.fromiter((vector.denormalizer for vector in vectors), dtype=np.float64, count=len(vectors)),
+        )
+
+    def to_vectors(self) -> list[Vector]:
+        denormalizers = self.__denormalizers.tolist()
+        if self.__negative_filter_mask is None or self.__negative_filter_mask.ndim == 1:
+            return [
+                Vector(self.value[i], denormalizer=denormalizers[i], negative_filter_mask=self.__negative_filter_mask)
+                for i in range(self.size)
+            ]
+        return [
+            Vector(self.value[i], denormalizer=denormalizers[i], negative_filter_mask=self.__negative_filter_mask[i])
+            for i in range(self.size)
+        ]
+
+    def normalize(self, lengths: NPArray) -> VectorBatch:
+        """
+        Divide every vector by its length, leaving the negative filters and the vectors of 0 or 1 length unchanged.
+        """
+        is_normalized = (lengths != 0) & (lengths != 1)
+        if self.dimension == 0 or not is_normalized.any():
+            return self
+        divisors = np.where(is_normalized, lengths, 1.0)
+        value = self.value / divisors.astype(self.value.dtype)[:, np.newaxis]
+        if self.__negative_filter_mask is not None:
+            value = np.where(self.__negative_filter_mask, self.value, value)
+        return VectorBatch(
+            value, self.__negative_filter_mask, np.where(is_normalized, 1 / divisors, self.__denormalizers)
+        )
+
+    def denormalize(self) -> VectorBatch:
+        return self.normalize(self.__denormalizers)
+
+    def replace_negative_filters(self, new_negative_filter_value: float) -> VectorBatch:
+        if self.__negative_filter_mask is None:
+            return self
+        return VectorBatch(
+            np.where(self.__negative_filter_mask, new_negative_filter_value, self.value),
+            self.__negative_filter_mask,
+            self.__denormalizers,
+        )
+
+    @staticmethod
+    def concatenate_all(batches: Sequence[VectorBatch]) -> VectorBatch:
+        """
+        Concatenate the batches row by row, with a single allocation.
+        The denormalizers are taken from the first non-empty batch, like `Vector.concatenate` does.
+        """
+        if not batches:
+            raise ValueError("Cannot concatenate 0 vector batches.")
+        if len({batch.size for batch in batches}) != 1:
+            raise MismatchingDimensionException("Cannot concatenate vector batches of different sizes.")
+        masks = [batch.__negative_filter_mask for batch in batches]
+        negative_filter_mask: NPArray | None = None
+        if any(mask is not None and mask.ndim == 2 for mask in masks):
+            negative_filter_mask = np.hstack([batch.__get_dense_negative_filter_mask() for batch in batches])
+        elif any(mask is not None for mask in masks):
+            # shared masks concatenate into a shared mask
+            negative_filter_mask = np.concatenate(
+                [
+                    np.zeros(batch.dimension, dtype=np.bool_) if mask is None else mask
+                    for batch, mask in zip(batches, masks)
+                ]
+            )
+        first_batch = next((batch for batch in batches if batch.dimension), batches[-1])
+        return VectorBatch(
+            np.hstack([batch.value for batch in batches]), negative_filter_mask, first_batch.__denormalizers
+        )
+
+    def __mul__(self, other: float | int) -> VectorBatch:
+        if float(other) == 1.0 or self.dimension == 0:
+            return self
+        return VectorBatch(self.value * float(other), self.__negative_filter_mask, self.__denormalizers)
+
+    def __get_dense_negative_filter_mask(self) -> NPArray:
+        if self.__negative_filter_mask is None:
+            return np.zeros(self.value.shape, dtype=np.bool_)
+        return np.broadcast_to(self.__negative_filter_mask, self.value.shape)
+
+    def __validate_negative_filter_mask(self, mask: NPArray | None) -> NPArray | None:
+        if mask is None:
+            return None
+        if mask.dtype != np.bool_ or mask.shape not in [(self.dimension,), self.value.shape]:
+            raise NegativeFilterException(
+                f"Invalid negative filter mask of {mask.dtype} and shape {mask.shape} for batch {self.value.shape}."
+            )
+        if not mask.any():
+            return None
+        return VectorBatch.__to_read_only(mask, np.bool_)
+
+    @staticmethod
+    def __to_read_only(array: NPArray, dtype: Any) -> NPArray:
+        if array.dtype != dtype:
+            array = array.astype(dtype)
+        elif not array.flags.writeable:
+            return array
+        else:
+            array = array.view()
+        array.flags.writeable = False
+        return array
 
 
 PythonTypes = float | int | str | Vector | list[float] | list[str] | BlobInformation
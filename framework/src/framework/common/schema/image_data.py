@@ -21,3 +21,5 @@ from PIL.Image import Image
 class ImageData:
     image: Image | None
     description: str | None
+    # sha256 of the encoded image bytes, identifying the image without decoding its pixels
+    image_hash: str | None = None
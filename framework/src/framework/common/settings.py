@@ -16,7 +16,7 @@
 import json
 
 import structlog
-from beartype.typing import Any
+from beartype.typing import Any, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing_extensions import override
 
@@ -35,6 +35,18 @@ class Settings(BaseSettings):
     SUPERLINKED_MODEL_CACHE_SIZE: int = 10
     GPU_EMBEDDING_THRESHOLD: int = 0
     SUPERLINKED_DISABLE_HALF_PRECISION_EMBEDDING: bool = True
+    SUPERLINKED_EMBEDDING_CACHE_PATH: str | None = None  # sqlite file of the persistent embedding cache
+    SUPERLINKED_IMAGE_EMBEDDING_CACHE_SIZE_BYTES: int = 128 * 1024 * 1024
+    SUPERLINKED_IMAGE_PIPELINE_WORKER_COUNT: int | None = None  # defaults to the CPU count
+    SUPERLINKED_IMAGE_PIPELINE_MAX_IN_FLIGHT_IMAGES: int = 256
+    SUPERLINKED_IMAGE_PIPELINE_BATCH_SIZE: int = 32
+    SUPERLINKED_QUERY_EMBEDDING_BATCH_WINDOW_MS: float = 0.0  # 0 disables batching the texts of concurrent queries
+    SUPERLINKED_QUERY_EMBEDDING_MAX_BATCH_SIZE: int = 32
+    SUPERLINKED_EMBEDDING_WORKER_COUNT: int = 0  # 0 disables embedding large batches in worker processes
+    SUPERLINKED_EMBEDDING_WORKER_MIN_SHARD_SIZE: int = 64
+    SUPERLINKED_ONNX_QUANTIZATION_CONFIG: Literal["arm64", "avx2", "avx512", "avx512_vnni"] = "avx2"
+    # vector specific params
+    SUPERLINKED_VECTOR_DTYPE: Literal["float32", "float64"] = "float64"
     # model downloading specific params
     SENTENCE_TRANSFORMERS_MODEL_LOCK_MAX_RETRIES: int = 10
     SENTENCE_TRANSFORMERS_MODEL_LOCK_RETRY_DELAY: int = 1
@@ -46,6 +58,9 @@ class Settings(BaseSettings):
     SUPERLINKED_EXPERIMENTAL_ENABLE_CONCURRENT_DAG_EVALUATION: bool = False
     # hugging face api embedding specific params
     HUGGING_FACE_API_TOKEN: str | None = None
+    SUPERLINKED_HUGGINGFACE_MAX_CONCURRENT_REQUESTS: int = 16
+    SUPERLINKED_HUGGINGFACE_MAX_RETRIES: int = 5
+    SUPERLINKED_HUGGINGFACE_RETRY_BASE_DELAY_MS: int = 500
     # profiling specific params
     ENABLE_PROFILING: bool = False
     SUPERLINKED_EXECUTION_TIMER_INTERVAL_MS: int = 10
@@ -71,23 +71,26 @@ class VectorAggregation(Aggregation[Vector]):
         Applies the previous negative filter on those indices where
         there was a negative filter in all aggregated vectors.
         """
-        all_negative_filter_indices = set().union(*(vector.negative_filter_indices for vector in vectors))
-        return aggregated_vector.copy_with_new(
-            negative_filter_indices={
-                i
-                for i, original_value in enumerate(aggregated_vector.value)
-                if original_value == constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE
-                and i in all_negative_filter_indices
-            }
-        ).replace_negative_filters(self.__calculate_negative_filter(vectors))
+        negative_filter_masks = [
+            vector.negative_filter_mask for vector in vectors if vector.negative_filter_mask is not None
+        ]
+        if not negative_filter_masks:
+            return aggregated_vector.copy_with_new(negative_filter_indices=frozenset())
+        negative_filter_mask = np.logical_or.reduce(negative_filter_masks) & (
+            aggregated_vector.value == constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE
+        )
+        return aggregated_vector.copy_with_new(negative_filter_mask=negative_filter_mask).replace_negative_filters(
+            self.__calculate_negative_filter(vectors)
+        )
 
     def __calculate_negative_filter(self, vectors: Sequence[Vector]) -> float:
-        if negative_filter_values := {
-            vector.value[negative_filter_index]
-            for vector in vectors
-            for negative_filter_index in vector.negative_filter_indices
-            if vector.value[negative_filter_index] != constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE
-        }:
+        masked_values = np.concatenate(
+            [vector.value[vector.negative_filter_mask] for vector in vectors if vector.negative_filter_mask is not None]
+        )
+        negative_filter_values = set(
+            np.unique(masked_values[masked_values != constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE]).tolist()
+        )
+        if negative_filter_values:
             if len(negative_filter_values) > 1:
                 raise NegativeFilterException(
                     f"Cannot aggregate vectors with different negative filter values: {negative_filter_values}."
@@ -19,12 +19,14 @@ from pathlib import Path
 from beartype.typing import Any
 from typing_extensions import override
 
+from superlinked.framework.common.settings import Settings
 from superlinked.framework.common.space.config.embedding.embedding_config import (
     EmbeddingConfig,
 )
 from superlinked.framework.common.space.embedding.hugging_face_manager import (
     HuggingFaceManager,
 )
+from superlinked.framework.common.space.embedding.onnx_manager import OnnxManager
 from superlinked.framework.common.space.embedding.sentence_transformer_manager import (
     SentenceTransformerManager,
 )
@@ -33,14 +35,35 @@ from superlinked.framework.common.space.embedding.sentence_transformer_manager i
 class TextModelHandler(Enum):
     SENTENCE_TRANSFORMERS = "sentence_transformers"
     HUGGING_FACE = "hugging_face"
+    ONNX = "onnx"
+    ONNX_INT8 = "onnx_int8"
 
     def create_manager(
-        self, model_name: str, model_cache_dir: Path | None = None
+        self,
+        model_name: str,
+        model_cache_dir: Path | None = None,
+        batch_size: int | None = None,
+        token_budget: int | None = None,
     ) -> SentenceTransformerManager | HuggingFaceManager:
         if self == TextModelHandler.SENTENCE_TRANSFORMERS:
-            return SentenceTransformerManager(model_name, model_cache_dir)
+            return SentenceTransformerManager(model_name, model_cache_dir, batch_size, token_budget)
+        if self in (TextModelHandler.ONNX, TextModelHandler.ONNX_INT8):
+            return OnnxManager(
+                model_name, model_cache_dir, batch_size, token_budget, is_quantized=self == TextModelHandler.ONNX_INT8
+            )
         return HuggingFaceManager(model_name)
 
+    def get_cache_model_key(self, model_name: str) -> str:
+        """
+        Key of the model in the persistent embedding cache. The handlers, and the quantization configs of ONNX_INT8,
+        produce different embeddings for the same model, so they must not share cached vectors.
+        """
+        if self == TextModelHandler.SENTENCE_TRANSFORMERS:
+            return model_name
+        if self == TextModelHandler.ONNX_INT8:
+            return f"{model_name}:{self.value}:{Settings().SUPERLINKED_ONNX_QUANTIZATION_CONFIG}"
+        return f"{model_name}:{self.value}"
+
 
 @dataclass(frozen=True)
 class TextSimilarityEmbeddingConfig(EmbeddingConfig[str]):
@@ -49,10 +72,16 @@ class TextSimilarityEmbeddingConfig(EmbeddingConfig[str]):
     cache_size: int
     length_to_use: int
     text_model_handler: TextModelHandler = TextModelHandler.SENTENCE_TRANSFORMERS
+    batch_size: int | None = None
+    token_budget: int | None = None
 
     def __post_init__(self) -> None:
         if self.cache_size < 0:
             raise ValueError("cache_size must be non-negative")
+        if self.batch_size is not None and self.batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if self.token_budget is not None and self.token_budget <= 0:
+            raise ValueError("token_budget must be positive")
 
     @property
     @override
@@ -28,6 +28,8 @@ from superlinked.framework.common.space.config.embedding.categorical_similarity_
 from superlinked.framework.common.space.embedding.embedding import InvertibleEmbedding
 from superlinked.framework.common.util.collection_util import CollectionUtil
 
+MAX_NEGATIVE_FILTER_MASK_COUNT = 1024
+
 
 class CategoricalSimilarityEmbedding(InvertibleEmbedding[list[str], CategoricalSimilarityEmbeddingConfig]):
 
@@ -39,35 +41,49 @@ class CategoricalSimilarityEmbedding(InvertibleEmbedding[list[str], CategoricalS
         self._other_category_index: int | None = self.length - 1 if self._config.uncategorized_as_category else None
         self._category_index_map: dict[str, int] = {elem: i for i, elem in enumerate(self._config.categories)}
         self._default_n_hot_encoding = np.full(self.length, self._config.negative_filter, dtype=np.float64)
+        # read-only masks shared by the vectors of the same categories, as every index but theirs is a negative filter
+        self._negative_filter_masks: dict[frozenset[int], NPArray] = {}
 
     @override
     def embed(self, input_: list[str], context: ExecutionContext) -> Vector:
-        n_hot_encoding: NPArray = self._n_hot_encode(input_, context.is_query_context)
-        negative_filter_indices = set(i for i in range(self.length) if i not in self._get_category_indices(input_))
-        return Vector(n_hot_encoding, negative_filter_indices)
+        category_indices = self._get_category_indices(input_)
+        n_hot_encoding: NPArray = self._n_hot_encode(category_indices, len(input_), context.is_query_context)
+        return Vector(n_hot_encoding, negative_filter_mask=self._get_negative_filter_mask(category_indices))
 
     @override
     def inverse_embed(self, vector: Vector, context: ExecutionContext) -> list[str]:
+        category_indices = np.flatnonzero(
+            vector.non_negative_filter_mask & (vector.value != constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE)
+        )
         return [
             self._config.categories[i] if i < len(self._config.categories) else self._other_category_name
-            for i in vector.non_negative_filter_indices
-            if vector.value[i] != constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE
+            for i in category_indices.tolist()
         ]
 
     def get_categorical_encoding_value(self, len_category_list: int, is_query: bool) -> float:
         sqrt_len_config_categories: float = math.sqrt(len(self._config.categories))
         return sqrt_len_config_categories / (len_category_list or 1.0) if is_query else 1.0 / sqrt_len_config_categories
 
-    def _n_hot_encode(self, category_list: Sequence[str], is_query: bool) -> NPArray:
+    def _n_hot_encode(self, category_indices: Sequence[int], category_count: int, is_query: bool) -> NPArray:
         n_hot_encoding = self._default_n_hot_encoding.copy()
-        categorical_value = self.get_categorical_encoding_value(len(category_list), is_query)
+        categorical_value = self.get_categorical_encoding_value(category_count, is_query)
         if is_query:
             n_hot_encoding.fill(constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE)
-        category_indices = self._get_category_indices(category_list)
         if category_indices:
             n_hot_encoding[category_indices] = categorical_value
         return n_hot_encoding
 
+    def _get_negative_filter_mask(self, category_indices: Sequence[int]) -> NPArray:
+        key = frozenset(category_indices)
+        if (negative_filter_mask := self._negative_filter_masks.get(key)) is None:
+            negative_filter_mask = np.ones(self.length, dtype=np.bool_)
+            negative_filter_mask[category_indices] = False
+            negative_filter_mask.flags.writeable = False
+            # concurrent embeds may build the same mask, either of the equal copies can be kept
+            if len(self._negative_filter_masks) < MAX_NEGATIVE_FILTER_MASK_COUNT:
+                self._negative_filter_masks[key] = negative_filter_mask
+        return negative_filter_mask
+
     def _get_category_indices(self, text_input: Sequence[str]) -> list[int]:
         return list(
             {
@@ -84,9 +100,9 @@ class CategoricalSimilarityEmbedding(InvertibleEmbedding[list[str], CategoricalS
 
     def _reallocate_vector_values(self, vector: Vector, scaling_factors: Mapping[int, float]) -> Vector:
         if scaling_factors:
-            new_values: NPArray = vector.value
+            new_values: NPArray = vector.value.copy()
             new_values[np.array(list(scaling_factors.keys()))] *= np.array(list(scaling_factors.values()))
-            new_vector = Vector(new_values, vector.negative_filter_indices)
+            new_vector = Vector(new_values, negative_filter_mask=vector.negative_filter_mask)
             sum_values = sum(CollectionUtil.get_positive_values_ndarray(new_vector.value))
             normalizing_factor = sum_values / math.sqrt(len(self._config.categories))
             return new_vector.normalize(normalizing_factor)
@@ -100,8 +116,8 @@ class CategoricalSimilarityEmbedding(InvertibleEmbedding[list[str], CategoricalS
         return reallocated_vector
 
     def _get_scaling_factors_for_vector(self, vector: Vector) -> dict[int, float]:
-        vector_value: NPArray = vector.value
-        return dict(zip(vector.non_negative_filter_indices, vector_value[list(vector.non_negative_filter_indices)]))
+        non_negative_filter_indices = np.flatnonzero(vector.non_negative_filter_mask)
+        return dict(zip(non_negative_filter_indices.tolist(), vector.value[non_negative_filter_indices].tolist()))
 
     @property
     @override
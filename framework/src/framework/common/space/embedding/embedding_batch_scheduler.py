@@ -0,0 +1,114 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from beartype.typing import Callable, Sequence
+
+from superlinked.framework.common.dag.context import ExecutionContext
+from superlinked.framework.common.data_types import Vector
+
+
+@dataclass(frozen=True)
+class EmbeddingRequest:
+    inputs: Sequence[str]
+    context: ExecutionContext
+    future: Future[list[Vector]] = field(default_factory=Future)
+
+
+class EmbeddingBatchScheduler:
+    """
+    Coalesces the embedding requests of concurrent callers into batches.
+    A batch is collected for `window_ms` after its first request arrives, or until it holds `max_batch_size` inputs,
+    then embedded with a single call; every caller gets the vectors of its own inputs.
+    Only requests of the same kind (query or not) are batched together, as they may be embedded with different prompts.
+    The worker thread only runs while there are requests to serve.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[Sequence[str], ExecutionContext], list[Vector]],
+        window_ms: float,
+        max_batch_size: int,
+    ) -> None:
+        self.__embed = embed
+        self.__window_seconds = window_ms / 1000
+        self.__max_batch_size = max_batch_size
+        self.__condition = threading.Condition()
+        self.__pending_requests: list[EmbeddingRequest] = []
+        self.__pending_input_count = 0
+        self.__is_worker_running = False
+
+    def embed(self, inputs: Sequence[str], context: ExecutionContext) -> list[Vector]:
+        if not inputs:
+            return []
+        request = EmbeddingRequest(inputs, context)
+        with self.__condition:
+            self.__pending_requests.append(request)
+            self.__pending_input_count += len(inputs)
+            if not self.__is_worker_running:
+                self.__is_worker_running = True
+                threading.Thread(target=self.__run, name="embedding-batch-scheduler", daemon=True).start()
+            elif self.__pending_input_count >= self.__max_batch_size:
+                self.__condition.notify()
+        return request.future.result()
+
+    def __run(self) -> None:
+        while batch := self.__collect_batch():
+            self.__embed_batch(batch)
+
+    def __collect_batch(self) -> list[EmbeddingRequest]:
+        with self.__condition:
+            if not self.__pending_requests:
+                self.__is_worker_running = False
+                return []
+            deadline = time.monotonic() + self.__window_seconds
+            while self.__pending_input_count < self.__max_batch_size and (remaining := deadline - time.monotonic()) > 0:
+                self.__condition.wait(remaining)
+            return self.__take_batch()
+
+    def __take_batch(self) -> list[EmbeddingRequest]:
+        is_query = self.__pending_requests[0].context.is_query_context
+        batch: list[EmbeddingRequest] = []
+        remaining_requests: list[EmbeddingRequest] = []
+        input_count = 0
+        for request in self.__pending_requests:
+            # requests left out stay in order, the oldest of them starts the next batch
+            if request.context.is_query_context == is_query and (
+                not batch or input_count + len(request.inputs) <= self.__max_batch_size
+            ):
+                batch.append(request)
+                input_count += len(request.inputs)
+            else:
+                remaining_requests.append(request)
+        self.__pending_requests = remaining_requests
+        self.__pending_input_count -= input_count
+        return batch
+
+    def __embed_batch(self, batch: Sequence[EmbeddingRequest]) -> None:
+        inputs = [input_ for request in batch for input_ in request.inputs]
+        try:
+            vectors = self.__embed(inputs, batch[0].context)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        start = 0
+        for request in batch:
+            request.future.set_result(vectors[start : start + len(request.inputs)])
+            start += len(request.inputs)
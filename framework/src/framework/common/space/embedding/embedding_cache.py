@@ -12,64 +12,246 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass
 
-from beartype.typing import Sequence
+import numpy as np
+from beartype.typing import Callable, Sequence, TypeVar, cast
 from cachetools import LRUCache
 
+from superlinked.framework.common.dag.context import ExecutionContext
 from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.settings import Settings
 from superlinked.framework.common.space.embedding.exception import EmbeddingException
+from superlinked.framework.common.space.embedding.persistent_embedding_cache import (
+    PersistentEmbeddingCache,
+)
+
+QUERY_PROMPT_NAME = "query"
+DOCUMENT_PROMPT_NAME = "document"
+
+InputT = TypeVar("InputT")
 
 
 @dataclass(frozen=True)
 class CacheInformation:
+    """
+    The inputs to embed are distinct; `embedded_vector_indices` maps every input not found in the cache
+    to the vector of its input to embed, `first_uncached_indices` maps every input to embed to its first occurrence.
+    """
+
     inputs_to_embed: Sequence[str]
     found_indices: Sequence[int]
     existing_vectors: Sequence[Vector]
+    embedded_vector_indices: Sequence[int]
+    first_uncached_indices: Sequence[int]
 
-    def combine_vectors(self, uncached_vectors: list[Vector]) -> list[Vector]:
+    def combine_vectors(self, uncached_vectors: Sequence[Vector]) -> list[Vector]:
         vectors: list[Vector] = []
         existing_index = 0
         new_index = 0
-        item_count = len(self.existing_vectors) + len(self.inputs_to_embed)
+        item_count = len(self.existing_vectors) + len(self.embedded_vector_indices)
         for i in range(item_count):
             if existing_index < len(self.found_indices) and self.found_indices[existing_index] == i:
                 vectors.append(self.existing_vectors[existing_index])
                 existing_index += 1
             else:
-                vectors.append(uncached_vectors[new_index])
+                vectors.append(uncached_vectors[self.embedded_vector_indices[new_index]])
                 new_index += 1
         return vectors
 
+    def select_uncached(self, inputs: Sequence[InputT]) -> list[InputT]:
+        """
+        Select the items of the inputs (parallel to the cache keys) that have to be embedded.
+        """
+        return [inputs[i] for i in self.first_uncached_indices]
+
 
 class EmbeddingCache:
-    def __init__(self, cache_size: int) -> None:
+    """
+    LRU cache of embeddings in memory, keyed by the input and whether it is embedded for a query.
+    Use `get_or_embed` to embed the inputs that are not cached, deduplicated and coalesced with the concurrent callers.
+    The cache size is the number of cached vectors, or the bytes they take if `is_size_in_bytes` is set.
+    It may be used from several threads at once.
+    If `SUPERLINKED_EMBEDDING_CACHE_PATH` is set and the model name is given, the in-memory cache is
+    backed by a persistent cache on local disk, shared by the processes using the same path.
+    """
+
+    def __init__(self, cache_size: int, model_name: str | None = None, is_size_in_bytes: bool = False) -> None:
         self._cache_size = cache_size
-        self._cache: LRUCache = LRUCache(self._cache_size)
+        self._cache: LRUCache = LRUCache(
+            self._cache_size, getsizeof=EmbeddingCache.__get_vector_size if is_size_in_bytes else None
+        )
+        self._model_name = model_name
+        self._persistent_cache = self.__init_persistent_cache(model_name)
+        self.__in_flight_futures: dict[tuple[str, str], Future[Vector]] = {}
+        self.__in_flight_lock = threading.Lock()
+        # LRUCache is not thread-safe, and even reading it reorders it
+        self.__memory_lock = threading.Lock()
 
-    def calculate_cache_info(self, inputs: Sequence[str]) -> CacheInformation:
-        if self._cache_size == 0:
-            return CacheInformation(inputs, [], [])
+    @property
+    def is_enabled(self) -> bool:
+        return self._cache_size > 0 or self._persistent_cache is not None
+
+    def calculate_cache_info(self, inputs: Sequence[str], context: ExecutionContext | None = None) -> CacheInformation:
+        prompt_name = self.__get_prompt_name(context)
+        vectors: list[Vector | None] = [self.__get_from_memory(prompt_name, input_) for input_ in inputs]
+        if self._persistent_cache is not None and self._model_name is not None:
+            missing_indices = [i for i, vector in enumerate(vectors) if vector is None]
+            stored_values = self._persistent_cache.get_many(
+                self._model_name, prompt_name, [inputs[i] for i in missing_indices]
+            )
+            for i, stored_value in zip(missing_indices, stored_values):
+                if stored_value is not None:
+                    vectors[i] = Vector(stored_value)
+                    self.__put_in_memory(prompt_name, inputs[i], vectors[i])
 
-        inputs_to_embed = []
+        embedded_vector_index_by_input: dict[str, int] = {}
+        first_uncached_indices = []
+        embedded_vector_indices = []
         found_indices = []
         existing_vectors = []
 
-        for i, input_ in enumerate(inputs):
-            vector = self._cache.get(input_)
+        for i, (input_, vector) in enumerate(zip(inputs, vectors)):
             if vector is None:
-                inputs_to_embed.append(input_)
+                if input_ not in embedded_vector_index_by_input:
+                    embedded_vector_index_by_input[input_] = len(first_uncached_indices)
+                    first_uncached_indices.append(i)
+                embedded_vector_indices.append(embedded_vector_index_by_input[input_])
             else:
                 existing_vectors.append(vector)
                 found_indices.append(i)
-        return CacheInformation(inputs_to_embed, found_indices, existing_vectors)
+        return CacheInformation(
+            list(embedded_vector_index_by_input),
+            found_indices,
+            existing_vectors,
+            embedded_vector_indices,
+            first_uncached_indices,
+        )
 
-    def update(self, inputs_to_embed: Sequence[str], uncached_vectors: Sequence[Vector]) -> None:
-        if self._cache_size == 0:
-            return
-        if not inputs_to_embed:
+    def get_or_embed(
+        self,
+        keys: Sequence[str],
+        inputs: Sequence[InputT],
+        embed: Callable[[Sequence[InputT]], list[Vector]],
+        context: ExecutionContext | None = None,
+    ) -> list[Vector]:
+        """
+        Return the vectors of the inputs identified by the keys, embedding the ones that are not cached.
+        Every distinct key is embedded once; keys being embedded by another thread are waited for, not embedded again.
+        """
+        cache_info = self.calculate_cache_info(keys, context)
+        inputs_to_embed = cache_info.select_uncached(inputs)
+        prompt_name = self.__get_prompt_name(context)
+        own_indices, other_futures = self.__claim_keys(prompt_name, cache_info.inputs_to_embed)
+        vectors: list[Vector | None] = [None] * len(inputs_to_embed)
+        if own_indices:
+            own_vectors = self.__embed_claimed(
+                prompt_name,
+                [cache_info.inputs_to_embed[i] for i in own_indices],
+                [inputs_to_embed[i] for i in own_indices],
+                embed,
+                context,
+            )
+            for i, vector in zip(own_indices, own_vectors):
+                vectors[i] = vector
+        failed_indices = []
+        for i, future in other_futures.items():
+            try:
+                vectors[i] = future.result()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # the failure belongs to the other caller, the input is embedded again
+                failed_indices.append(i)
+        if failed_indices:
+            for i, vector in zip(failed_indices, embed([inputs_to_embed[i] for i in failed_indices])):
+                vectors[i] = vector
+        return cache_info.combine_vectors(cast(list[Vector], vectors))
+
+    def update(
+        self,
+        inputs_to_embed: Sequence[str],
+        uncached_vectors: Sequence[Vector],
+        context: ExecutionContext | None = None,
+    ) -> None:
+        if not self.is_enabled or not inputs_to_embed:
             return
         if (input_len := len(inputs_to_embed)) != (vector_len := len(uncached_vectors)):
             raise EmbeddingException(f"Number of inputs ({input_len}) must match number of vectors ({vector_len})")
+        prompt_name = self.__get_prompt_name(context)
         for input_, vector in zip(inputs_to_embed, uncached_vectors):
-            self._cache[input_] = vector
+            self.__put_in_memory(prompt_name, input_, vector)
+        if self._persistent_cache is not None and self._model_name is not None:
+            self._persistent_cache.put_many(self._model_name, prompt_name, inputs_to_embed, uncached_vectors)
+
+    def __claim_keys(
+        self, prompt_name: str, keys: Sequence[str]
+    ) -> tuple[list[int], dict[int, Future[Vector]]]:
+        """
+        Register the keys not yet being embedded as embedded by the caller.
+        Returns the indices of the keys claimed, and the futures of the ones being embedded by others.
+        """
+        own_indices: list[int] = []
+        other_futures: dict[int, Future[Vector]] = {}
+        with self.__in_flight_lock:
+            for i, key in enumerate(keys):
+                if (future := self.__in_flight_futures.get((prompt_name, key))) is not None:
+                    other_futures[i] = future
+                else:
+                    self.__in_flight_futures[(prompt_name, key)] = Future()
+                    own_indices.append(i)
+        return own_indices, other_futures
+
+    def __embed_claimed(  # pylint: disable=too-many-arguments
+        self,
+        prompt_name: str,
+        keys: Sequence[str],
+        inputs: Sequence[InputT],
+        embed: Callable[[Sequence[InputT]], list[Vector]],
+        context: ExecutionContext | None,
+    ) -> list[Vector]:
+        with self.__in_flight_lock:
+            futures = [self.__in_flight_futures[(prompt_name, key)] for key in keys]
+        try:
+            vectors = embed(inputs)
+            self.update(keys, vectors, context)
+        except BaseException as e:
+            for future in futures:
+                future.set_exception(e)
+            raise
+        finally:
+            with self.__in_flight_lock:
+                for key in keys:
+                    del self.__in_flight_futures[(prompt_name, key)]
+        for future, vector in zip(futures, vectors):
+            future.set_result(vector)
+        return vectors
+
+    def __get_from_memory(self, prompt_name: str, input_: str) -> Vector | None:
+        if self._cache_size == 0:
+            return None
+        with self.__memory_lock:
+            return self._cache.get((prompt_name, input_))
+
+    def __put_in_memory(self, prompt_name: str, input_: str, vector: Vector) -> None:
+        if self._cache.getsizeof(vector) > self._cache_size:
+            return
+        if isinstance(vector.value.base, np.ndarray) and vector.value.base.nbytes > vector.value.nbytes:
+            # a cached row of a batch must not keep the whole batch alive
+            vector = vector.copy_with_new(vector.value.copy())
+        with self.__memory_lock:
+            self._cache[(prompt_name, input_)] = vector
+
+    @staticmethod
+    def __get_vector_size(vector: Vector) -> int:
+        return vector.value.nbytes
+
+    def __get_prompt_name(self, context: ExecutionContext | None) -> str:
+        # the prompt used by the model only depends on the model and whether it embeds a query
+        return QUERY_PROMPT_NAME if context is not None and context.is_query_context else DOCUMENT_PROMPT_NAME
+
+    def __init_persistent_cache(self, model_name: str | None) -> PersistentEmbeddingCache | None:
+        path = Settings().SUPERLINKED_EMBEDDING_CACHE_PATH
+        if path is None or model_name is None:
+            return None
+        return PersistentEmbeddingCache.for_path(path)
@@ -0,0 +1,176 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing.queues import Queue
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from beartype.typing import Callable, Sequence
+from PIL.Image import Image
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.data_types import NPArray
+from superlinked.framework.common.settings import Settings
+from superlinked.framework.common.util.singleton_decorator import singleton
+
+EmbedFunction = Callable[[Sequence[str | Image], ExecutionContext], NPArray]
+
+
+@dataclass(frozen=True)
+class EmbeddingWorkerTask:
+    """
+    Embedding of a shard of a batch in a worker process. `embed` is a bound method of a model manager,
+    which loads its own copy of the model in the worker on first use.
+    """
+
+    embed: EmbedFunction
+    inputs: Sequence[str | Image]
+    environment: ExecutionEnvironment
+
+
+@dataclass(frozen=True)
+class EmbeddingWorkerResult:
+    shared_memory_name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+@singleton
+class EmbeddingWorkerPool:
+    """
+    Pool of worker processes embedding the shards of large batches, each pinned to its share of the CPU cores.
+    A single process does not scale CPU inference across many cores, separate processes with their own model
+    copies do. The embeddings are returned in shared memory, only the inputs are pickled.
+    Disabled unless `SUPERLINKED_EMBEDDING_WORKER_COUNT` is set.
+    """
+
+    def __init__(self) -> None:
+        settings = Settings()
+        self.__worker_count = settings.SUPERLINKED_EMBEDDING_WORKER_COUNT
+        self.__min_shard_size = max(settings.SUPERLINKED_EMBEDDING_WORKER_MIN_SHARD_SIZE, 1)
+        self.__executor: ProcessPoolExecutor | None = None
+        self.__lock = threading.Lock()
+
+    def should_shard(self, input_count: int) -> bool:
+        return self.__calculate_shard_count(input_count) > 1
+
+    def embed(self, embed: EmbedFunction, inputs: Sequence[str | Image], context: ExecutionContext) -> NPArray:
+        """
+        Embed the inputs with the bound `_embed` method of a model manager, sharded across the workers.
+        If a worker dies, the batch fails and the pool is restarted on its next use.
+        """
+        bounds = np.linspace(0, len(inputs), self.__calculate_shard_count(len(inputs)) + 1).astype(int).tolist()
+        executor = self.__get_executor()
+        try:
+            futures = [
+                executor.submit(embed_shard, EmbeddingWorkerTask(embed, list(inputs[start:stop]), context.environment))
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            return np.concatenate(self.__collect_embeddings(futures))
+        except BrokenProcessPool:
+            self.__discard_executor(executor)
+            raise
+
+    def close(self) -> None:
+        """
+        Stop the workers. The pool restarts on its next use.
+        """
+        with self.__lock:
+            if self.__executor:
+                self.__executor.shutdown()
+                self.__executor = None
+
+    def __discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        # a broken pool rejects every later task, concurrent callers may have replaced it already
+        with self.__lock:
+            if self.__executor is executor:
+                self.__executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def __calculate_shard_count(self, input_count: int) -> int:
+        return min(self.__worker_count, input_count // self.__min_shard_size)
+
+    def __collect_embeddings(self, futures: Sequence[Future[EmbeddingWorkerResult]]) -> list[NPArray]:
+        embeddings: list[NPArray] = []
+        error: Exception | None = None
+        for future in futures:
+            # every result is read, so no shard leaks its shared memory if another one failed
+            try:
+                embeddings.append(self.__read_shared_embeddings(future.result()))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                error = error or e
+        if error:
+            raise error
+        return embeddings
+
+    def __read_shared_embeddings(self, result: EmbeddingWorkerResult) -> NPArray:
+        shared_memory = SharedMemory(name=result.shared_memory_name)
+        try:
+            return np.array(np.ndarray(result.shape, dtype=result.dtype, buffer=shared_memory.buf))
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                # spawned workers do not inherit the locks, threads and loaded models of the serving process
+                context = multiprocessing.get_context("spawn")
+                core_queue = context.Queue()
+                for cores in self.__split_cores():
+                    core_queue.put(cores)
+                self.__executor = ProcessPoolExecutor(
+                    self.__worker_count, mp_context=context, initializer=init_worker, initargs=(core_queue,)
+                )
+            return self.__executor
+
+    def __split_cores(self) -> list[list[int]]:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+        return [shard.tolist() for shard in np.array_split(np.array(cores, dtype=np.int64), self.__worker_count)]
+
+
+def init_worker(core_queue: Queue) -> None:
+    """
+    Pin the worker process to its share of the cores, sizing the intra-op thread pool of torch to match.
+    Torch is imported here, so importing the pool does not load it into every process.
+    """
+    try:
+        cores = core_queue.get(timeout=1)
+    except queue.Empty:
+        return
+    if cores and hasattr(os, "sched_setaffinity"):
+        import torch  # pylint: disable=import-outside-toplevel
+
+        os.sched_setaffinity(0, cores)
+        torch.set_num_threads(len(cores))
+
+
+def embed_shard(task: EmbeddingWorkerTask) -> EmbeddingWorkerResult:
+    """
+    Embed a shard in a worker process, returning the embeddings in a shared memory the caller unlinks.
+    """
+    embeddings = np.ascontiguousarray(task.embed(task.inputs, ExecutionContext(task.environment)))
+    shared_memory = SharedMemory(create=True, size=max(embeddings.nbytes, 1))
+    np.ndarray(embeddings.shape, dtype=embeddings.dtype, buffer=shared_memory.buf)[:] = embeddings
+    shared_memory.close()
+    return EmbeddingWorkerResult(shared_memory.name, embeddings.shape, embeddings.dtype.str)
@@ -0,0 +1,157 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import os
+import random
+from time import perf_counter
+
+import structlog
+from beartype.typing import Any, Mapping, Sequence
+from huggingface_hub import AsyncInferenceClient
+
+from superlinked.framework.common.data_types import NPArray
+from superlinked.framework.common.util.event_loop_thread import EventLoopThread
+
+logger = structlog.getLogger(__name__)
+
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+RETRYABLE_STATUS_CODES = OVERLOAD_STATUS_CODES | {500, 502, 504}
+RETRY_AFTER_HEADER = "Retry-After"
+INITIAL_CONCURRENCY_LIMIT = 4
+# responses slower than this multiple of the fastest one signal a saturated endpoint
+LATENCY_TOLERANCE = 2.0
+LATENCY_BACKOFF_FACTOR = 0.9
+OVERLOAD_BACKOFF_FACTOR = 0.5
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Bounds the in-flight requests by a limit that adapts to the endpoint: it grows by one per round trip while
+    the latencies stay close to the fastest observed one, shrinks slightly on slow responses,
+    and halves on overload responses (429, 503). Not thread-safe, it must be used from a single event loop.
+    """
+
+    def __init__(self, max_limit: int) -> None:
+        self.__max_limit = max(max_limit, 1)
+        self.__limit = float(min(INITIAL_CONCURRENCY_LIMIT, self.__max_limit))
+        self.__in_flight_count = 0
+        self.__min_latency: float | None = None
+        self.__condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(int(self.__limit), 1)
+
+    async def acquire(self) -> None:
+        async with self.__condition:
+            await self.__condition.wait_for(lambda: self.__in_flight_count < self.limit)
+            self.__in_flight_count += 1
+
+    async def release(self, latency: float | None, is_overloaded: bool) -> None:
+        """
+        Release a slot, adapting the limit to the outcome: the latency of a successful request, or an overload.
+        """
+        async with self.__condition:
+            self.__in_flight_count -= 1
+            if is_overloaded:
+                self.__limit = max(self.__limit * OVERLOAD_BACKOFF_FACTOR, 1.0)
+            elif latency is not None:
+                self.__adapt_to_latency(latency)
+            self.__condition.notify_all()
+
+    def __adapt_to_latency(self, latency: float) -> None:
+        self.__min_latency = latency if self.__min_latency is None else min(self.__min_latency, latency)
+        if latency > self.__min_latency * LATENCY_TOLERANCE:
+            self.__limit = max(self.__limit * LATENCY_BACKOFF_FACTOR, 1.0)
+        else:
+            self.__limit = min(self.__limit + 1 / self.__limit, float(self.__max_limit))
+
+
+class HuggingFaceAsyncClient:
+    """
+    Runs the feature extraction requests of a batch concurrently on a shared event loop, reusing the connections
+    of one async inference client. The in-flight requests are bounded by an adaptive concurrency limit, failed
+    requests are retried with jittered exponential backoff, honoring the Retry-After header of the endpoint.
+    """
+
+    def __init__(
+        self, client: AsyncInferenceClient, max_concurrency: int, max_retries: int, retry_base_delay_ms: int
+    ) -> None:
+        self.__client = client
+        self.__max_concurrency = max_concurrency
+        self.__limiter = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.__limiter_pid = os.getpid()
+        self.__max_retries = max_retries
+        self.__retry_base_delay = retry_base_delay_ms / 1000
+
+    def feature_extraction(self, chunks: Sequence[Sequence[str]]) -> list[NPArray]:
+        # the limiter is bound to the loop of the process it was used in, a forked child runs a loop of its own
+        if self.__limiter_pid != os.getpid():
+            self.__limiter = AdaptiveConcurrencyLimiter(self.__max_concurrency)
+            self.__limiter_pid = os.getpid()
+        return EventLoopThread().run(self.__extract_all(chunks))
+
+    async def __extract_all(self, chunks: Sequence[Sequence[str]]) -> list[NPArray]:
+        return list(await asyncio.gather(*(self.__extract(chunk) for chunk in chunks)))
+
+    async def __extract(self, texts: Sequence[str]) -> NPArray:
+        attempt = 0
+        while True:
+            await self.__limiter.acquire()
+            start = perf_counter()
+            try:
+                embeddings = await self.__client.feature_extraction(text=list(texts))  # type: ignore[arg-type]
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                status_code = self.__get_status_code(e)
+                await self.__limiter.release(None, status_code in OVERLOAD_STATUS_CODES)
+                if attempt >= self.__max_retries or not self.__is_retryable(e, status_code):
+                    raise
+                attempt += 1
+                delay = self.__calculate_retry_delay(e, attempt)
+                logger.warning(
+                    "retrying hugging face request",
+                    attempt=attempt,
+                    status_code=status_code,
+                    delay_ms=int(delay * 1000),
+                    error_type=type(e).__name__,
+                    error_details=str(e),
+                )
+                await asyncio.sleep(delay)
+                continue
+            await self.__limiter.release(perf_counter() - start, False)
+            return embeddings
+
+    def __is_retryable(self, error: Exception, status_code: int | None) -> bool:
+        if status_code is not None:
+            return status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (TimeoutError, OSError))
+
+    def __calculate_retry_delay(self, error: Exception, attempt: int) -> float:
+        if (retry_after := self.__get_retry_after(error)) is not None:
+            return retry_after
+        return random.uniform(0, self.__retry_base_delay * 2 ** (attempt - 1))  # nosec B311 # jitter only
+
+    def __get_status_code(self, error: Exception) -> int | None:
+        # aiohttp errors carry the status, requests and httpx ones their response
+        status_code = getattr(error, "status", None) or getattr(getattr(error, "response", None), "status_code", None)
+        return status_code if isinstance(status_code, int) else None
+
+    def __get_retry_after(self, error: Exception) -> float | None:
+        headers: Mapping[str, Any] | None = getattr(error, "headers", None) or getattr(
+            getattr(error, "response", None), "headers", None
+        )
+        try:
+            return float(headers[RETRY_AFTER_HEADER]) if headers and RETRY_AFTER_HEADER in headers else None
+        except (TypeError, ValueError):
+            return None
@@ -19,19 +19,21 @@ from pathlib import Path
 import numpy as np
 import structlog
 from beartype.typing import Any, Sequence, cast
-from huggingface_hub import HfApi, InferenceClient
+from huggingface_hub import AsyncInferenceClient, HfApi, InferenceClient
 from huggingface_hub.inference._providers import PROVIDER_T
 from PIL.Image import Image
 from requests import HTTPError
 from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
-from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.data_types import NPArray, Vector, VectorBatch
 from superlinked.framework.common.settings import Settings
+from superlinked.framework.common.space.embedding.hugging_face_async_client import (
+    HuggingFaceAsyncClient,
+)
 from superlinked.framework.common.space.embedding.model_manager import ModelManager
 from superlinked.framework.common.util.collection_util import CollectionUtil
 from superlinked.framework.common.util.execution_timer import time_execution
-from superlinked.framework.online.dag.concurrent_executor import ConcurrentExecutor
 
 logger = structlog.getLogger(__name__)
 
@@ -50,6 +52,7 @@ class HuggingFaceManager(ModelManager):
         self._embedding_length: int | None = None
         self._is_inference_endpoint = model_name.startswith(HTTP_PREFIXES)
         self._client = self._init_inference_client(model_name)
+        self._async_client = self._init_async_client(model_name)
         self._max_batch_size = self._retrieve_max_batch_size()
 
     def _retrieve_max_batch_size(self) -> int:
@@ -66,20 +69,20 @@ class HuggingFaceManager(ModelManager):
     def embed_text(self, inputs: Sequence[str], context: ExecutionContext) -> list[Vector]:
         if not inputs:
             return []
-        return [Vector(embedding) for embedding in self._embed(inputs, context)]
+        return VectorBatch(self._embed(inputs, context)).to_vectors()
+
+    @override
+    def _embed_batch(self, inputs: Sequence[str | Image], context: ExecutionContext) -> NPArray:
+        # the model runs remotely, local worker processes would not speed it up
+        return self._embed(inputs, context)
 
     @override
     @time_execution
-    def _embed(self, inputs: Sequence[str | Image], context: ExecutionContext) -> list[list[float]] | list[np.ndarray]:
+    def _embed(self, inputs: Sequence[str | Image], context: ExecutionContext) -> NPArray:
         if not inputs:
-            return []
+            return np.empty((0, 0))
         chunked_inputs = CollectionUtil.chunk_list(data=inputs, chunk_size=self._max_batch_size)
-        chunked_results = ConcurrentExecutor().execute(
-            func=lambda input_: self._client.feature_extraction(text=input_).tolist(),
-            args_list=[(input_,) for input_ in chunked_inputs],
-            condition=not Settings().SUPERLINKED_DISABLE_CONCURRENT_HUGGINGFACE_EMBEDDING,
-        )
-        return cast(list[list[float]], [item for sublist in chunked_results for item in sublist])
+        return np.concatenate(self._async_client.feature_extraction(cast(list[list[str]], list(chunked_inputs))))
 
     @classmethod
     @lru_cache(maxsize=32)
@@ -115,6 +118,25 @@ class HuggingFaceManager(ModelManager):
             return InferenceClient(base_url=model_name, token=token, provider=PROVIDER)
         return InferenceClient(model=model_name, token=token, provider=PROVIDER)
 
+    def _init_async_client(self, model_name: str) -> HuggingFaceAsyncClient:
+        settings = Settings()
+        token = settings.HUGGING_FACE_API_TOKEN
+        if self._is_inference_endpoint:
+            client = AsyncInferenceClient(base_url=model_name, token=token, provider=PROVIDER)
+        else:
+            client = AsyncInferenceClient(model=model_name, token=token, provider=PROVIDER)
+        max_concurrency = (
+            1
+            if settings.SUPERLINKED_DISABLE_CONCURRENT_HUGGINGFACE_EMBEDDING
+            else settings.SUPERLINKED_HUGGINGFACE_MAX_CONCURRENT_REQUESTS
+        )
+        return HuggingFaceAsyncClient(
+            client,
+            max_concurrency,
+            settings.SUPERLINKED_HUGGINGFACE_MAX_RETRIES,
+            settings.SUPERLINKED_HUGGINGFACE_RETRY_BASE_DELAY_MS,
+        )
+
     @classmethod
     def __calculate_embedding_dim_from_sample_embedding(cls, client: InferenceClient) -> int:
         return client.feature_extraction("a").shape[-1]
@@ -15,13 +15,15 @@
 from pathlib import Path
 
 import structlog
-from beartype.typing import Sequence
+from beartype.typing import Sequence, cast
+from PIL.Image import Image
 from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
 from superlinked.framework.common.data_types import Vector
 from superlinked.framework.common.interface.weighted import Weighted
 from superlinked.framework.common.schema.image_data import ImageData
+from superlinked.framework.common.settings import Settings
 from superlinked.framework.common.space.aggregation.aggregation import VectorAggregation
 from superlinked.framework.common.space.config.aggregation.aggregation_config import (
     VectorAggregationConfig,
@@ -31,6 +33,7 @@ from superlinked.framework.common.space.config.embedding.image_embedding_config
     ModelHandler,
 )
 from superlinked.framework.common.space.embedding.embedding import Embedding
+from superlinked.framework.common.space.embedding.embedding_cache import EmbeddingCache
 from superlinked.framework.common.space.embedding.model_manager import ModelManager
 from superlinked.framework.common.space.embedding.open_clip_manager import (
     OpenClipManager,
@@ -41,6 +44,7 @@ from superlinked.framework.common.space.embedding.sentence_transformer_manager i
 
 logger = structlog.getLogger()
 
+IMAGE_CACHE_KEY_PREFIX = "image:sha256:"
 
 MANAGER_BY_HANDLER = {
     ModelHandler.SENTENCE_TRANSFORMERS: SentenceTransformerManager,
@@ -57,11 +61,17 @@ class ImageEmbedding(Embedding[ImageData, ImageEmbeddingConfig]):
         self.manager = ImageEmbedding.init_manager(
             self._config.model_handler, self._config.model_name, self._config.model_cache_dir
         )
+        self._cache = EmbeddingCache(
+            Settings().SUPERLINKED_IMAGE_EMBEDDING_CACHE_SIZE_BYTES, self._config.model_name, is_size_in_bytes=True
+        )
 
     @override
     def embed_multiple(self, inputs: Sequence[ImageData], context: ExecutionContext) -> list[Vector]:
-        images, descriptions = zip(*((input_.image, input_.description) for input_ in inputs))
-        embeddings = self.manager.embed(images + descriptions, context)
+        images, descriptions, image_hashes = zip(
+            *((input_.image, input_.description, input_.image_hash) for input_ in inputs)
+        )
+        cache_keys = [self._calculate_image_cache_key(image_hash) for image_hash in image_hashes] + list(descriptions)
+        embeddings = self._embed_with_cache(images + descriptions, cache_keys, context)
         if all(embedding is None for embedding in embeddings):
             return [Vector.init_zero_vector(self._config.length)] * len(inputs)
         aggregation = VectorAggregation(VectorAggregationConfig(Vector))
@@ -74,6 +84,33 @@ class ImageEmbedding(Embedding[ImageData, ImageEmbeddingConfig]):
         ]
         return combined_embeddings
 
+    def _embed_with_cache(
+        self, inputs: Sequence[Image | str | None], cache_keys: Sequence[str | None], context: ExecutionContext
+    ) -> list[Vector | None]:
+        """
+        Embed the inputs, caching the ones with a cache key. Images without a hash are embedded uncached,
+        as identifying them would take decoding their pixels.
+        """
+        if not self._cache.is_enabled:
+            return self.manager.embed(inputs, context)
+        embeddings: list[Vector | None] = [None] * len(inputs)
+        cached_indices = [i for i, input_ in enumerate(inputs) if input_ is not None and cache_keys[i] is not None]
+        cached_vectors = self._cache.get_or_embed(
+            [cast(str, cache_keys[i]) for i in cached_indices],
+            [inputs[i] for i in cached_indices],
+            lambda inputs_to_embed: cast(list[Vector], self.manager.embed(inputs_to_embed, context)),
+            context,
+        )
+        for i, vector in zip(cached_indices, cached_vectors):
+            embeddings[i] = vector
+        if uncached_indices := [i for i, input_ in enumerate(inputs) if input_ is not None and cache_keys[i] is None]:
+            for i, vector in zip(uncached_indices, self.manager.embed([inputs[i] for i in uncached_indices], context)):
+                embeddings[i] = vector
+        return embeddings
+
+    def _calculate_image_cache_key(self, image_hash: str | None) -> str | None:
+        return None if image_hash is None else f"{IMAGE_CACHE_KEY_PREFIX}{image_hash}"
+
     @override
     def embed(self, input_: ImageData, context: ExecutionContext) -> Vector:
         return self.embed_multiple([input_], context)[0]
@@ -15,13 +15,15 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 
-import numpy as np
 from beartype.typing import Sequence
 from PIL.Image import Image
 
 from superlinked.framework.common.dag.context import ExecutionContext
-from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.data_types import NPArray, Vector, VectorBatch
 from superlinked.framework.common.settings import Settings
+from superlinked.framework.common.space.embedding.embedding_worker_pool import (
+    EmbeddingWorkerPool,
+)
 
 SENTENCE_TRANSFORMERS_ORG_NAME = "sentence-transformers"
 DEFAULT_MODEL_CACHE_DIR = (Path.home() / ".cache" / SENTENCE_TRANSFORMERS_ORG_NAME).absolute().as_posix()
@@ -36,17 +38,23 @@ class ModelManager(ABC):
         inputs_without_nones = [input_ for input_ in inputs if input_ is not None]
         if not inputs_without_nones:
             return [None] * len(inputs)
-        none_indices = [i for i, input_ in enumerate(inputs) if input_ is None]
-        embeddings = self._embed(inputs_without_nones, context)
-        result: list[Vector | None] = [Vector(embedding) for embedding in embeddings]
-        for index in none_indices:
-            result.insert(index, None)
-        return result
+        vectors = iter(VectorBatch(self._embed_batch(inputs_without_nones, context)).to_vectors())
+        return [None if input_ is None else next(vectors) for input_ in inputs]
+
+    def _embed_batch(self, inputs: Sequence[str | Image], context: ExecutionContext) -> NPArray:
+        """
+        Embeds the inputs in the embedding worker pool if the batch is large enough to be sharded across it.
+        """
+        worker_pool = EmbeddingWorkerPool()
+        if worker_pool.should_shard(len(inputs)):
+            return worker_pool.embed(self._embed, inputs, context)
+        return self._embed(inputs, context)
 
     @abstractmethod
-    def _embed(
-        self, inputs: Sequence[str | Image], context: ExecutionContext
-    ) -> list[list[float]] | list[np.ndarray]: ...
+    def _embed(self, inputs: Sequence[str | Image], context: ExecutionContext) -> NPArray:
+        """
+        Returns the embeddings of the inputs as the rows of a 2D array.
+        """
 
     @abstractmethod
     def calculate_length(self) -> int: ...
@@ -0,0 +1,84 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import structlog
+from beartype.typing import Any, Sequence
+
+from superlinked.framework.common.dag.context import ExecutionContext
+from superlinked.framework.common.space.config.embedding.embedding_config import (
+    EmbeddingConfig,
+)
+from superlinked.framework.common.space.config.embedding.image_embedding_config import (
+    ImageEmbeddingConfig,
+)
+from superlinked.framework.common.space.config.embedding.text_similarity_embedding_config import (
+    TextSimilarityEmbeddingConfig,
+)
+from superlinked.framework.common.space.embedding.image_embedding import ImageEmbedding
+from superlinked.framework.common.space.embedding.model_manager import ModelManager
+
+logger = structlog.getLogger()
+
+WARM_UP_INPUT = "warm-up"
+
+
+class ModelPreloader:
+    """
+    Loads the models of the embedding configs in parallel, embedding a warm-up input with each of them,
+    so the first requests do not pay for loading the models and initializing their runtimes.
+    Embedding configs without a model are skipped.
+    """
+
+    @classmethod
+    def preload(
+        cls, embedding_configs: Sequence[EmbeddingConfig[Any]], context: ExecutionContext
+    ) -> dict[str, float]:
+        """
+        Returns the load times, including the warm-up, in milliseconds by model.
+        """
+        managers_by_model = cls._create_managers_by_model(embedding_configs)
+        if not managers_by_model:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(managers_by_model)) as executor:
+            load_times = executor.map(lambda manager: cls._warm_up(manager, context), managers_by_model.values())
+            load_time_ms_by_model = dict(zip(managers_by_model.keys(), load_times))
+        for model, load_time_ms in load_time_ms_by_model.items():
+            logger.info("preloaded model", model=model, load_time_ms=load_time_ms)
+        return load_time_ms_by_model
+
+    @classmethod
+    def _create_managers_by_model(cls, embedding_configs: Sequence[EmbeddingConfig[Any]]) -> dict[str, ModelManager]:
+        managers_by_model: dict[str, ModelManager] = {}
+        for config in embedding_configs:
+            if isinstance(config, TextSimilarityEmbeddingConfig):
+                model = f"{config.text_model_handler.value}:{config.model_name}"
+                if model not in managers_by_model:
+                    managers_by_model[model] = config.text_model_handler.create_manager(
+                        config.model_name, config.model_cache_dir, config.batch_size, config.token_budget
+                    )
+            elif isinstance(config, ImageEmbeddingConfig):
+                model = f"{config.model_handler.value}:{config.model_name}"
+                if model not in managers_by_model:
+                    managers_by_model[model] = ImageEmbedding.init_manager(
+                        config.model_handler, config.model_name, config.model_cache_dir
+                    )
+        return managers_by_model
+
+    @classmethod
+    def _warm_up(cls, manager: ModelManager, context: ExecutionContext) -> float:
+        start = perf_counter()
+        manager.embed([WARM_UP_INPUT], context)
+        return (perf_counter() - start) * 1000
@@ -15,11 +15,11 @@
 import math
 
 import numpy as np
-from beartype.typing import cast
+from beartype.typing import Sequence, cast
 from typing_extensions import TypeVar, override
 
 from superlinked.framework.common.dag.context import ExecutionContext
-from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.data_types import NPArray, Vector, VectorBatch
 from superlinked.framework.common.space.config.embedding.number_embedding_config import (
     LogarithmicScale,
     Mode,
@@ -35,6 +35,9 @@ class NumberEmbedding(InvertibleEmbedding[NumberT, NumberEmbeddingConfig]):
         super().__init__(embedding_config)
         self._circle_size_in_rad = math.pi / 2
         self._value_when_out_of_bounds = [0.0, 0.0, self._config.negative_filter]
+        self._negative_filter_mask = Vector.create_negative_filter_mask(
+            self.length, self._config.negative_filter_indices
+        )
 
     @property
     @override
@@ -48,58 +51,76 @@ class NumberEmbedding(InvertibleEmbedding[NumberT, NumberEmbeddingConfig]):
 
     @override
     def embed(self, input_: float, context: ExecutionContext) -> Vector:
-        if (
-            input_ < self._config.min_value
-            and self._config.mode
-            in {
-                Mode.MAXIMUM,
-                Mode.SIMILAR,
-            }
-        ) or (
-            input_ > self._config.max_value
-            and self._config.mode
-            in {
-                Mode.MINIMUM,
-                Mode.SIMILAR,
-            }
-        ):
-            return Vector(list(self._value_when_out_of_bounds), {2})
-        transformed_input = self._transform_to_log_if_logarithmic(input_)
+        return self.embed_multiple([input_], context)[0]
+
+    @override
+    def embed_multiple(self, inputs: Sequence[float], context: ExecutionContext) -> list[Vector]:
+        if not inputs:
+            return []
+        input_array = np.fromiter(inputs, dtype=np.float64, count=len(inputs))
+        out_of_bounds = np.zeros(len(inputs), dtype=np.bool_)
+        if self._config.mode in {Mode.MAXIMUM, Mode.SIMILAR}:
+            out_of_bounds |= input_array < self._config.min_value
+        if self._config.mode in {Mode.MINIMUM, Mode.SIMILAR}:
+            out_of_bounds |= input_array > self._config.max_value
+        # the log transformation is monotonic, so constraining before it is the same as after it
+        constrained_inputs = np.clip(input_array, self._config.min_value, self._config.max_value)
+        transformed_inputs = self._transform_array_to_log_if_logarithmic(constrained_inputs)
         transformed_min = self._transform_to_log_if_logarithmic(self._config.min_value)
         transformed_max = self._transform_to_log_if_logarithmic(self._config.max_value)
-        constrained_input: float = min(max(transformed_min, transformed_input), transformed_max)
-        normalized_input = (constrained_input - transformed_min) / (transformed_max - transformed_min)
-        angle_in_radians = normalized_input * self._circle_size_in_rad
-        vector_input = np.array([math.sin(angle_in_radians), math.cos(angle_in_radians)])
-        return Vector(np.append(vector_input, [0.0]), {2})
+        normalized_inputs = (transformed_inputs - transformed_min) / (transformed_max - transformed_min)
+        angles_in_radians = normalized_inputs * self._circle_size_in_rad
+        values = np.column_stack([np.sin(angles_in_radians), np.cos(angles_in_radians), np.zeros(len(inputs))])
+        values[out_of_bounds] = self._value_when_out_of_bounds
+        return VectorBatch(values, self._negative_filter_mask).to_vectors()
 
     @override
     def inverse_embed(self, vector: Vector, context: ExecutionContext) -> NumberT:
+        return self.inverse_embed_multiple([vector], context)[0]
+
+    @override
+    def inverse_embed_multiple(self, vectors: Sequence[Vector], context: ExecutionContext) -> list[NumberT]:
         """
         This function might seem complex,
         but it essentially performs the inverse operation of the embed function.
         """
-        if len(vector.value) != self.length:
-            raise ValueError(f"Mismatching length {len(vector.value)} of the vector to inverse embed")
-        if list(vector.value) == self._value_when_out_of_bounds:
-            out_of_bounds_bias: float = (self._config.max_value - self._config.min_value) / 1000.0
-            if self._config.mode == Mode.MAXIMUM:
-                return cast(NumberT, self._config.min_value - out_of_bounds_bias)
-            # INFO: for similar it doesn't matter, which direction is it out of bounds
-            return cast(NumberT, self._config.max_value + out_of_bounds_bias)
-        angle_in_radians = math.atan2(vector.value[0], vector.value[1])
-        transformed_number = angle_in_radians / self._circle_size_in_rad
+        if not vectors:
+            return []
+        if mismatching_vector := next((vector for vector in vectors if len(vector.value) != self.length), None):
+            raise ValueError(f"Mismatching length {len(mismatching_vector.value)} of the vector to inverse embed")
+        values = VectorBatch.from_vectors(vectors).value
+        angles_in_radians = np.arctan2(values[:, 0], values[:, 1])
+        transformed_numbers = angles_in_radians / self._circle_size_in_rad
         transformed_max = self._transform_to_log_if_logarithmic(self._config.max_value)
         transformed_min = self._transform_to_log_if_logarithmic(self._config.min_value)
-        transformed_input_ = transformed_number * (transformed_max - transformed_min) + transformed_min
-        input_ = self._transform_from_log_if_logarithmic(transformed_input_)
-        return cast(NumberT, input_)
+        transformed_inputs = transformed_numbers * (transformed_max - transformed_min) + transformed_min
+        inputs = [self._transform_from_log_if_logarithmic(input_) for input_ in transformed_inputs.tolist()]
+        out_of_bounds = (values == self._value_when_out_of_bounds).all(axis=1)
+        if out_of_bounds.any():
+            out_of_bounds_value = self._calculate_out_of_bounds_value()
+            inputs = [
+                out_of_bounds_value if is_out_of_bounds else input_
+                for input_, is_out_of_bounds in zip(inputs, out_of_bounds.tolist())
+            ]
+        return cast(list[NumberT], inputs)
 
     @property
     @override
     def needs_inversion_before_aggregation(self) -> bool:
         return True
 
+    def _calculate_out_of_bounds_value(self) -> float:
+        out_of_bounds_bias: float = (self._config.max_value - self._config.min_value) / 1000.0
+        if self._config.mode == Mode.MAXIMUM:
+            return self._config.min_value - out_of_bounds_bias
+        # INFO: for similar it doesn't matter, which direction is it out of bounds
+        return self._config.max_value + out_of_bounds_bias
+
+    def _transform_array_to_log_if_logarithmic(self, values: NPArray) -> NPArray:
+        if isinstance(self._config.scale, LogarithmicScale):
+            return np.log(1 + values) / math.log(self._config.scale.base)
+        return values
+
     def _transform_to_log_if_logarithmic(self, value: float) -> float:
         return (
             math.log(1 + value, self._config.scale.base) if isinstance(self._config.scale, LogarithmicScale) else value
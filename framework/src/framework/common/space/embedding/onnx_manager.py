@@ -0,0 +1,47 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from pathlib import Path
+
+from typing_extensions import override
+
+from superlinked.framework.common.space.embedding.onnx_model_cache import (
+    OnnxModelCache,
+)
+from superlinked.framework.common.space.embedding.sentence_transformer import (
+    SentenceTransformer,
+)
+from superlinked.framework.common.space.embedding.sentence_transformer_manager import (
+    SentenceTransformerManager,
+)
+
+
+class OnnxManager(SentenceTransformerManager):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        model_name: str,
+        model_cache_dir: Path | None = None,
+        batch_size: int | None = None,
+        token_budget: int | None = None,
+        is_quantized: bool = False,
+    ) -> None:
+        """
+        Runs the sentence-transformers model with ONNX Runtime on CPU, int8 dynamic-quantized if `is_quantized`.
+        The quantization targets the instruction set set in `SUPERLINKED_ONNX_QUANTIZATION_CONFIG`.
+        """
+        super().__init__(model_name, model_cache_dir, batch_size, token_budget)
+        self._is_quantized = is_quantized
+
+    @override
+    def _get_embedding_model(self, number_of_inputs: int) -> SentenceTransformer:
+        return OnnxModelCache.initialize_model(self._model_name, self._model_cache_dir, self._is_quantized)
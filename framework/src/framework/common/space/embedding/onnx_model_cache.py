@@ -0,0 +1,99 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from functools import lru_cache
+from pathlib import Path
+
+from beartype.typing import Any
+from filelock import FileLock
+from huggingface_hub.file_download import repo_folder_name
+from sentence_transformers import export_dynamic_quantized_onnx_model
+
+from superlinked.framework.common.settings import Settings
+from superlinked.framework.common.space.embedding.model_manager import (
+    DEFAULT_MODEL_CACHE_DIR,
+)
+from superlinked.framework.common.space.embedding.sentence_transformer import (
+    SentenceTransformer,
+)
+from superlinked.framework.common.util.execution_timer import time_execution
+from superlinked.framework.common.util.gpu_embedding_util import CPU_DEVICE_TYPE
+
+ONNX_BACKEND = "onnx"
+ONNX_MODEL_FOLDER = "onnx"
+EXPORTED_MODEL_MARKER_FILE = "modules.json"
+QUANTIZED_FILE_SUFFIX = "qint8_{quantization_config}"
+QUANTIZED_MODEL_FILE_PATH = "onnx/model_{file_suffix}.onnx"
+
+
+class OnnxModelCache:
+    """
+    Loads sentence-transformers models with the ONNX Runtime backend on CPU.
+    Models are exported to ONNX (and int8 dynamic-quantized if requested) once, into the model cache directory,
+    and loaded from there afterwards. Exports are guarded by a file lock as several processes may share the cache.
+    """
+
+    @classmethod
+    def initialize_model(cls, model_name: str, model_cache_dir: Path | None, is_quantized: bool) -> SentenceTransformer:
+        # the cache directory is resolved before the lru_cache, so the default one is a single cache entry
+        resolved_model_cache_dir = model_cache_dir or Path(Settings().MODEL_CACHE_DIR or DEFAULT_MODEL_CACHE_DIR)
+        return cls._initialize_model(model_name, resolved_model_cache_dir, is_quantized)
+
+    @classmethod
+    @lru_cache(maxsize=Settings().SUPERLINKED_MODEL_CACHE_SIZE)
+    @time_execution
+    def _initialize_model(cls, model_name: str, model_cache_dir: Path, is_quantized: bool) -> SentenceTransformer:
+        model_dir = cls._get_model_dir(model_name, model_cache_dir)
+        model_dir.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(f"{model_dir}.lock"):
+            if not (model_dir / EXPORTED_MODEL_MARKER_FILE).exists():
+                cls._export_model(model_name, model_cache_dir, model_dir)
+            if not is_quantized:
+                return cls._load_model(model_dir, {})
+            quantization_config = Settings().SUPERLINKED_ONNX_QUANTIZATION_CONFIG
+            file_suffix = QUANTIZED_FILE_SUFFIX.format(quantization_config=quantization_config)
+            file_path = QUANTIZED_MODEL_FILE_PATH.format(file_suffix=file_suffix)
+            if not (model_dir / file_path).exists():
+                export_dynamic_quantized_onnx_model(
+                    cls._load_model(model_dir, {}),
+                    quantization_config,
+                    str(model_dir),
+                    file_suffix=file_suffix,
+                )
+        return cls._load_model(model_dir, {"file_name": file_path})
+
+    @classmethod
+    def _export_model(cls, model_name: str, model_cache_dir: Path, model_dir: Path) -> None:
+        model = SentenceTransformer(
+            model_name_or_path=model_name,
+            trust_remote_code=True,
+            device=CPU_DEVICE_TYPE,
+            cache_folder=str(model_cache_dir),
+            backend=ONNX_BACKEND,
+        )
+        model.save_pretrained(str(model_dir))
+
+    @classmethod
+    def _load_model(cls, model_dir: Path, model_kwargs: dict[str, Any]) -> SentenceTransformer:
+        return SentenceTransformer(
+            model_name_or_path=str(model_dir),
+            trust_remote_code=True,
+            device=CPU_DEVICE_TYPE,
+            local_files_only=True,
+            backend=ONNX_BACKEND,
+            model_kwargs=model_kwargs,
+        )
+
+    @classmethod
+    def _get_model_dir(cls, model_name: str, model_cache_dir: Path) -> Path:
+        return model_cache_dir / ONNX_MODEL_FOLDER / repo_folder_name(repo_id=model_name, repo_type="model")
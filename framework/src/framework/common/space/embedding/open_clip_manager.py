@@ -13,7 +13,6 @@
 # limitations under the License.
 
 
-import numpy as np
 import structlog
 import torch
 from beartype.typing import Any, Sequence
@@ -23,12 +22,15 @@ from torchvision.transforms.transforms import Compose  # type:ignore[import-unty
 from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
+from superlinked.framework.common.data_types import NPArray
+from superlinked.framework.common.settings import Settings
 from superlinked.framework.common.space.embedding.model_manager import ModelManager
 from superlinked.framework.common.space.embedding.open_clip_model_cache import (
     OpenClipModelCache,
 )
 from superlinked.framework.common.util.execution_timer import time_execution
 from superlinked.framework.common.util.gpu_embedding_util import GpuEmbeddingUtil
+from superlinked.framework.common.util.image_pipeline import ImagePipeline
 
 logger = structlog.getLogger(__name__)
 
@@ -41,7 +43,7 @@ class OpenClipManager(ModelManager):
 
     @override
     @time_execution
-    def _embed(self, inputs: Sequence[str | Image], context: ExecutionContext) -> list[list[float]] | list[np.ndarray]:
+    def _embed(self, inputs: Sequence[str | Image], context: ExecutionContext) -> NPArray:
         embedding_model, preprocess_val = self._get_embedding_model(len(inputs))
         text_inputs, image_inputs = self._categorize_inputs(inputs)
         self._validate_inputs(inputs)
@@ -49,7 +51,7 @@ class OpenClipManager(ModelManager):
             text_encodings = self.encode_texts(text_inputs, embedding_model)
             image_encodings = self.encode_images(image_inputs, embedding_model, preprocess_val)
         encodings = self._combine_encodings(inputs, text_encodings, image_encodings)
-        return [self._normalize_encoding(encoding).tolist() for encoding in encodings]
+        return self._normalize_encoding(torch.stack(encodings)).cpu().numpy()
 
     def _get_embedding_model(self, number_of_inputs: int) -> tuple[CLIP, Compose]:
         device_type = GpuEmbeddingUtil.get_device_type(number_of_inputs)
@@ -96,9 +98,21 @@ class OpenClipManager(ModelManager):
     def encode_images(self, images: list[Any], embedding_model: CLIP, preprocess_val: Compose) -> torch.Tensor:
         if not images:
             return torch.Tensor()
-        combined_images_tensor = torch.stack([preprocess_val(image) for image in images])
-        images_to_process = self._move_tensor_to_model_device(embedding_model, combined_images_tensor)
-        if not GpuEmbeddingUtil.should_use_full_precision_for_input(len(images)):
+        # the images of the next batches are decoded and preprocessed while the model encodes the current one
+        batch_size = Settings().SUPERLINKED_IMAGE_PIPELINE_BATCH_SIZE
+        is_full_precision = GpuEmbeddingUtil.should_use_full_precision_for_input(len(images))
+        return torch.cat(
+            [
+                self._encode_image_batch(torch.stack(preprocessed_images), embedding_model, is_full_precision)
+                for preprocessed_images in ImagePipeline().map_batches(preprocess_val, images, batch_size)
+            ]
+        )
+
+    def _encode_image_batch(
+        self, images_tensor: torch.Tensor, embedding_model: CLIP, is_full_precision: bool
+    ) -> torch.Tensor:
+        images_to_process = self._move_tensor_to_model_device(embedding_model, images_tensor)
+        if not is_full_precision:
             images_to_process = images_to_process.half()
         return embedding_model.encode_image(images_to_process)
 
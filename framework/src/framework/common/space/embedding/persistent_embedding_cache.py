@@ -0,0 +1,111 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import structlog
+from beartype.typing import Sequence
+
+from superlinked.framework.common.data_types import NPArray, Vector
+
+logger = structlog.getLogger()
+
+STORED_VECTOR_DTYPE = np.float32
+SQLITE_BUSY_TIMEOUT_SECONDS = 30.0
+MAX_KEYS_PER_QUERY = 500
+CREATE_TABLE_STATEMENT = (
+    "CREATE TABLE IF NOT EXISTS embeddings ("
+    "model_name TEXT NOT NULL, prompt_name TEXT NOT NULL, key_hash BLOB NOT NULL, vector BLOB NOT NULL, "
+    "PRIMARY KEY (model_name, prompt_name, key_hash)) WITHOUT ROWID"
+)
+SELECT_STATEMENT = (
+    "SELECT key_hash, vector FROM embeddings WHERE model_name = ? AND prompt_name = ? AND key_hash IN ({placeholders})"
+)
+UPSERT_STATEMENT = "INSERT OR REPLACE INTO embeddings (model_name, prompt_name, key_hash, vector) VALUES (?, ?, ?, ?)"
+
+
+class PersistentEmbeddingCache:
+    """
+    Embedding cache in a local sqlite database, kept across restarts and shared by every process using the same file.
+    Vectors are stored as float32, keyed by the model name, the prompt name and the SHA-256 hash of the input key.
+    The database is used in WAL mode, so readers do not block each other or the writer.
+    Database errors are logged and handled as cache misses, the cache never fails an embedding.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__path = path
+        self.__local = threading.local()
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_path(cls, path: str) -> PersistentEmbeddingCache:
+        return cls(path)
+
+    def get_many(self, model_name: str, prompt_name: str, keys: Sequence[str]) -> list[NPArray | None]:
+        key_hashes = [self.__hash_key(key) for key in keys]
+        vector_by_key_hash: dict[bytes, NPArray] = {}
+        try:
+            connection = self.__get_connection()
+            for start in range(0, len(key_hashes), MAX_KEYS_PER_QUERY):
+                chunk = key_hashes[start : start + MAX_KEYS_PER_QUERY]
+                rows = connection.execute(
+                    SELECT_STATEMENT.format(placeholders=", ".join("?" * len(chunk))),
+                    (model_name, prompt_name, *chunk),
+                )
+                vector_by_key_hash.update(
+                    (key_hash, np.frombuffer(vector, dtype=STORED_VECTOR_DTYPE)) for key_hash, vector in rows
+                )
+        except (sqlite3.Error, OSError) as e:
+            self.__log_error("failed to read embedding cache", e)
+        return [vector_by_key_hash.get(key_hash) for key_hash in key_hashes]
+
+    def put_many(self, model_name: str, prompt_name: str, keys: Sequence[str], vectors: Sequence[Vector]) -> None:
+        rows = [
+            (model_name, prompt_name, self.__hash_key(key), vector.value.astype(STORED_VECTOR_DTYPE).tobytes())
+            for key, vector in zip(keys, vectors)
+        ]
+        try:
+            with self.__get_connection() as connection:
+                connection.executemany(UPSERT_STATEMENT, rows)
+        except (sqlite3.Error, OSError) as e:
+            self.__log_error("failed to write embedding cache", e)
+
+    def __get_connection(self) -> sqlite3.Connection:
+        # sqlite connections cannot be shared between threads, nor inherited by forked processes
+        if getattr(self.__local, "pid", None) != os.getpid():
+            self.__local.connection = self.__connect()
+            self.__local.pid = os.getpid()
+        return self.__local.connection
+
+    def __connect(self) -> sqlite3.Connection:
+        Path(self.__path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.__path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.execute(CREATE_TABLE_STATEMENT)
+        return connection
+
+    def __hash_key(self, key: str) -> bytes:
+        return hashlib.sha256(key.encode()).digest()
+
+    def __log_error(self, message: str, error: Exception) -> None:
+        logger.warning(message, path=self.__path, error_type=type(error).__name__, error_details=str(error))
@@ -14,7 +14,6 @@
 
 import math
 from datetime import datetime, timedelta
-from functools import reduce
 
 import numpy as np
 from beartype.typing import Sequence
@@ -22,7 +21,7 @@ from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
 from superlinked.framework.common.dag.period_time import PeriodTime
-from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.data_types import NPArray, Vector, VectorBatch
 from superlinked.framework.common.space.config.embedding.recency_embedding_config import (
     RecencyEmbeddingConfig,
 )
@@ -42,6 +41,8 @@ class RecencyEmbedding(InvertibleEmbedding[int, RecencyEmbeddingConfig]):
             self._config.period_time_list, key=lambda x: x.period_time.total_seconds()
         )
         self._max_period_time = self._period_time_list[-1]
+        # the z component of the vectors of the max period time is the negative filter
+        self._negative_filter_mask = self.__create_negative_filter_mask()
 
     @property
     @override
@@ -54,87 +55,67 @@ class RecencyEmbedding(InvertibleEmbedding[int, RecencyEmbeddingConfig]):
 
     @override
     def embed(self, input_: int, context: ExecutionContext) -> Vector:
-        return reduce(
-            lambda a, b: a.concatenate(b),
-            (
-                self.calc_recency_vector_for_period_time(
-                    input_,
-                    period_time_param,
-                    context,
-                )
-                for period_time_param in self._period_time_list
-            ),
-        )
+        return self.embed_multiple([input_], context)[0]
+
+    @override
+    def embed_multiple(self, inputs: Sequence[int], context: ExecutionContext) -> list[Vector]:
+        if not inputs:
+            return []
+        now = context.now()
+        time_period_end = self._calculate_time_period_end(now)
+        created_ats = np.fromiter(inputs, dtype=np.int64, count=len(inputs))
+        columns: list[NPArray] = []
+        for period_time in self._period_time_list:
+            time_period_start = self._calculate_time_period_start(period_time, now)
+            out_of_time_scope = (created_ats < time_period_start) | (created_ats > time_period_end)
+            angles = (created_ats - time_period_start) / (time_period_end - time_period_start) * math.pi / 2
+            columns.append(np.where(out_of_time_scope, 0.0, np.cos(angles) * period_time.weight))
+            columns.append(np.where(out_of_time_scope, 0.0, np.sin(angles) * period_time.weight))
+            if period_time.period_time == self.max_period_time.period_time:
+                columns.append(self._calculate_z_values(out_of_time_scope, context))
+        return VectorBatch(np.column_stack(columns), self._negative_filter_mask).to_vectors()
 
     @override
     def inverse_embed(self, vector: Vector, context: ExecutionContext) -> int:
+        return self.inverse_embed_multiple([vector], context)[0]
+
+    @override
+    def inverse_embed_multiple(self, vectors: Sequence[Vector], context: ExecutionContext) -> list[int]:
         """
         This function might seem complex,
         but it essentially performs the inverse operation of the embed function.
         """
-        x_value, y_value = (
-            vector.value[MAX_PERIOD_TIME_X_COORDINATE],
-            vector.value[MAX_PERIOD_TIME_Y_COORDINATE],
-        )
+        if not vectors:
+            return []
+        values = VectorBatch.from_vectors(vectors).value
+        x_values, y_values = values[:, MAX_PERIOD_TIME_X_COORDINATE], values[:, MAX_PERIOD_TIME_Y_COORDINATE]
         time_period_start = self._calculate_time_period_start(self.max_period_time, context.now())
-        time_period_end: int = self._calculate_time_period_end(context.now())
-        if (x_value == 0) and (y_value == 0):
-            created_at = time_period_start - 1
-            return created_at
-
-        normalized_time_elapsed = math.atan2(y_value, x_value) * 2 / math.pi
-        time_elapsed = round(normalized_time_elapsed * (time_period_end - time_period_start))
-        return time_elapsed + time_period_start
+        time_period_end = self._calculate_time_period_end(context.now())
+        normalized_times_elapsed = np.arctan2(y_values, x_values) * 2 / math.pi
+        created_ats = np.round(normalized_times_elapsed * (time_period_end - time_period_start)) + time_period_start
+        # vectors out of the time scope were created before it
+        created_ats[(x_values == 0) & (y_values == 0)] = time_period_start - 1
+        return created_ats.astype(np.int64).tolist()
 
     @property
     @override
     def needs_inversion_before_aggregation(self) -> bool:
         return True
 
-    def calc_recency_vector_for_period_time(
-        self,
-        created_at: int,
-        period_time: PeriodTime,
-        context: ExecutionContext,
-    ) -> Vector:
-        time_period_start: int = self._calculate_time_period_start(period_time, context.now())
-        time_period_end: int = self._calculate_time_period_end(context.now())
-        out_of_time_scope = not time_period_start <= created_at <= time_period_end
-        z_value = self.calculate_z_value(period_time, context, out_of_time_scope)
-        if out_of_time_scope:
-            x_value = y_value = 0.0
-        else:
-            time_elapsed: int = created_at - time_period_start
-            normalized_time_elapsed = time_elapsed / (time_period_end - time_period_start)
-            x_value = math.cos(normalized_time_elapsed * math.pi / 2) * period_time.weight
-            y_value = math.sin(normalized_time_elapsed * math.pi / 2) * period_time.weight
-
-        return self._build_vector(x_value, y_value, z_value)
-
-    def calculate_z_value(
-        self,
-        period_time: PeriodTime,
-        context: ExecutionContext,
-        out_of_time_scope: bool,
-    ) -> float | None:
-        if period_time.period_time == self.max_period_time.period_time:
-            if context.is_query_context:
-                z_value = 1.0
-            elif out_of_time_scope:
-                z_value = self._config.negative_filter
-            else:
-                z_value = 0.0
-        else:
-            z_value = None
-        return z_value
-
-    def _build_vector(self, x_value: float, y_value: float, z_value: float | None) -> Vector:
-        vector_input = np.array([x_value, y_value])
-        negative_filter_indices = set()
-        if z_value is not None:
-            vector_input = np.append(vector_input, np.array([z_value]))
-            negative_filter_indices.add(2)
-        return Vector(vector_input, negative_filter_indices)
+    def _calculate_z_values(self, out_of_time_scope: NPArray, context: ExecutionContext) -> NPArray:
+        if context.is_query_context:
+            return np.ones(len(out_of_time_scope))
+        return np.where(out_of_time_scope, self._config.negative_filter, 0.0)
+
+    def __create_negative_filter_mask(self) -> NPArray:
+        negative_filter_indices = []
+        dimension = 0
+        for period_time in self._period_time_list:
+            dimension += 2
+            if period_time.period_time == self.max_period_time.period_time:
+                negative_filter_indices.append(dimension)
+                dimension += 1
+        return Vector.create_negative_filter_mask(dimension, negative_filter_indices)
 
     def _calculate_time_period_start(self, period_time: PeriodTime, now_ts: int) -> int:
         expiry_date = self.__get_expiry_date(now_ts)
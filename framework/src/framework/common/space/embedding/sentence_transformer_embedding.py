@@ -19,10 +19,14 @@ from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
 from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.settings import Settings
 from superlinked.framework.common.space.config.embedding.text_similarity_embedding_config import (
     TextSimilarityEmbeddingConfig,
 )
 from superlinked.framework.common.space.embedding.embedding import Embedding
+from superlinked.framework.common.space.embedding.embedding_batch_scheduler import (
+    EmbeddingBatchScheduler,
+)
 from superlinked.framework.common.space.embedding.embedding_cache import EmbeddingCache
 
 logger = structlog.getLogger()
@@ -35,17 +39,35 @@ class SentenceTransformerEmbedding(Embedding[str, TextSimilarityEmbeddingConfig]
     ) -> None:
         super().__init__(embedding_config)
         self.manager = embedding_config.text_model_handler.create_manager(
-            embedding_config.model_name, embedding_config.model_cache_dir
+            embedding_config.model_name,
+            embedding_config.model_cache_dir,
+            embedding_config.batch_size,
+            embedding_config.token_budget,
+        )
+        self._cache = EmbeddingCache(
+            self._config.cache_size,
+            embedding_config.text_model_handler.get_cache_model_key(embedding_config.model_name),
         )
-        self._cache = EmbeddingCache(self._config.cache_size)
+        self._query_batch_scheduler = self.__init_query_batch_scheduler()
 
     @override
     def embed_multiple(self, inputs: Sequence[str], context: ExecutionContext) -> list[Vector]:
-        cache_info = self._cache.calculate_cache_info(inputs)
-        new_vectors = self.manager.embed_text(cache_info.inputs_to_embed, context)
-        self._cache.update(cache_info.inputs_to_embed, new_vectors)
-        combined_vectors = cache_info.combine_vectors(new_vectors)
-        return combined_vectors
+        return self._cache.get_or_embed(inputs, inputs, lambda texts: self._embed_text(texts, context), context)
+
+    def _embed_text(self, inputs: Sequence[str], context: ExecutionContext) -> list[Vector]:
+        if self._query_batch_scheduler is not None and context.is_query_context:
+            return self._query_batch_scheduler.embed(inputs, context)
+        return self.manager.embed_text(inputs, context)
+
+    def __init_query_batch_scheduler(self) -> EmbeddingBatchScheduler | None:
+        settings = Settings()
+        if settings.SUPERLINKED_QUERY_EMBEDDING_BATCH_WINDOW_MS <= 0:
+            return None
+        return EmbeddingBatchScheduler(
+            self.manager.embed_text,
+            settings.SUPERLINKED_QUERY_EMBEDDING_BATCH_WINDOW_MS,
+            settings.SUPERLINKED_QUERY_EMBEDDING_MAX_BATCH_SIZE,
+        )
 
     @override
     def embed(self, input_: str, context: ExecutionContext) -> Vector:
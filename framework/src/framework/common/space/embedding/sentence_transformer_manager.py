@@ -13,15 +13,19 @@
 # limitations under the License.
 
 
+from pathlib import Path
+
 import numpy as np
 import structlog
-from beartype.typing import Sequence
+import torch
+from beartype.typing import Any, Sequence, cast
 from numpy import ndarray
 from PIL.Image import Image
+from sentence_transformers.util import batch_to_device
 from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
-from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.data_types import NPArray, Vector, VectorBatch
 from superlinked.framework.common.space.embedding.model_manager import ModelManager
 from superlinked.framework.common.space.embedding.sentence_transformer import (
     SentenceTransformer,
@@ -37,28 +41,122 @@ logger = structlog.getLogger()
 
 SENTENCE_TRANSFORMER_PROMPT_NAME_KWARG_KEY = "prompt_name"
 QUERY_PROMPT_NAME = "query"
+DEFAULT_ENCODE_BATCH_SIZE = 32
+INPUT_IDS_KEY = "input_ids"
+ATTENTION_MASK_KEY = "attention_mask"
+PROMPT_LENGTH_KEY = "prompt_length"
+SENTENCE_EMBEDDING_KEY = "sentence_embedding"
 
 
 class SentenceTransformerManager(ModelManager):
+    def __init__(
+        self,
+        model_name: str,
+        model_cache_dir: Path | None = None,
+        batch_size: int | None = None,
+        token_budget: int | None = None,
+    ) -> None:
+        """
+        Texts are encoded in batches of at most `batch_size` inputs. If a `token_budget` is given, texts are
+        grouped by their tokenized length into batches of at most that many (padded) tokens, to avoid padding
+        short texts to the length of long ones.
+        """
+        super().__init__(model_name, model_cache_dir)
+        self._batch_size = batch_size or DEFAULT_ENCODE_BATCH_SIZE
+        self._token_budget = token_budget
+
     @override
     @time_execution
-    def _embed(self, inputs: Sequence[str | Image], context: ExecutionContext) -> list[list[float]] | list[np.ndarray]:
+    def _embed(self, inputs: Sequence[str | Image], context: ExecutionContext) -> NPArray:
         model = self._get_embedding_model(len(inputs))
         prompt_name = self._calculate_prompt_name(model, context)
-        embeddings = self._encode(inputs, model, prompt_name)
-        return embeddings.tolist()
+        return self._encode(inputs, model, prompt_name)
 
     @time_execution
     def _encode(self, inputs: Sequence[str | Image], model: SentenceTransformer, prompt_name: str | None) -> ndarray:
+        if self._token_budget is not None and all(isinstance(input_, str) for input_ in inputs):
+            return self._encode_by_token_budget(cast(Sequence[str], inputs), model, prompt_name, self._token_budget)
         return model.encode(
             list(inputs),  # type: ignore[arg-type] # it also accepts Image
             prompt_name=prompt_name,
+            batch_size=self._batch_size,
         )
 
+    def _encode_by_token_budget(
+        self, texts: Sequence[str], model: SentenceTransformer, prompt_name: str | None, token_budget: int
+    ) -> ndarray:
+        """
+        The texts are tokenized once, and the batches are sliced from the tokenized features
+        instead of being tokenized again by `encode`.
+        """
+        prompt = model.prompts.get(prompt_name, "") if prompt_name else ""
+        features = model.tokenize([prompt + text for text in texts])
+        token_counts = features[ATTENTION_MASK_KEY].sum(dim=1).numpy()
+        extra_features = self._calculate_prompt_features(model, prompt)
+        order = np.argsort(token_counts, kind="stable")
+        embeddings: ndarray | None = None
+        for batch_indices in self._split_by_token_budget(order, token_counts, token_budget):
+            batch_features = self._slice_features(
+                features, batch_indices, int(token_counts[batch_indices].max()), model.tokenizer.padding_side
+            )
+            batch_embeddings = self._forward(model, batch_features | extra_features)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=batch_embeddings.dtype)
+            embeddings[batch_indices] = batch_embeddings
+        return cast(ndarray, embeddings)
+
+    def _calculate_prompt_features(self, model: SentenceTransformer, prompt: str) -> dict[str, Any]:
+        # the same as `encode` adds, so pooling can exclude the prompt tokens if the model is configured so
+        if not prompt:
+            return {}
+        tokenized_prompt = model.tokenize([prompt])
+        if INPUT_IDS_KEY not in tokenized_prompt:
+            return {}
+        return {PROMPT_LENGTH_KEY: tokenized_prompt[INPUT_IDS_KEY].shape[-1] - 1}
+
+    def _slice_features(
+        self, features: dict[str, Any], indices: ndarray, token_count: int, padding_side: str
+    ) -> dict[str, Any]:
+        """
+        Select the rows of the batch, cutting the padding beyond its longest text like `encode` would pad it.
+        """
+        tensor_indices = torch.from_numpy(indices)
+        columns = slice(-token_count, None) if padding_side == "left" else slice(None, token_count)
+        return {
+            key: (value[tensor_indices][:, columns] if value.dim() == 2 else value[tensor_indices])
+            if isinstance(value, torch.Tensor)
+            else value
+            for key, value in features.items()
+        }
+
+    def _forward(self, model: SentenceTransformer, features: dict[str, Any]) -> ndarray:
+        with torch.inference_mode():
+            embeddings = model.forward(batch_to_device(features, model.device))[SENTENCE_EMBEDDING_KEY].detach().cpu()
+        if embeddings.dtype == torch.bfloat16:
+            embeddings = embeddings.float()
+        return embeddings.numpy()
+
+    def _split_by_token_budget(self, order: ndarray, token_counts: ndarray, token_budget: int) -> list[ndarray]:
+        """
+        Split the indices ordered by token count into batches whose padded size fits the budget;
+        a text longer than the budget gets a batch on its own.
+        """
+        batches: list[ndarray] = []
+        start = 0
+        for end, index in enumerate(order, start=1):
+            # the ascending order makes the current text the longest, so it sets the padded length of the batch
+            if end - start > self._batch_size or (end - start) * token_counts[index] > token_budget:
+                if end - 1 > start:
+                    batches.append(order[start : end - 1])
+                    start = end - 1
+        if start < len(order):
+            batches.append(order[start:])
+        return batches
+
     def embed_text(self, inputs: Sequence[str], context: ExecutionContext) -> list[Vector]:
         if not inputs:
             return []
-        return [Vector(embedding) for embedding in self._embed(inputs, context)]
+        return VectorBatch(self._embed_batch(inputs, context)).to_vectors()
 
     @override
     def calculate_length(self) -> int:
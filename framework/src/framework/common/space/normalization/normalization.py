@@ -22,8 +22,9 @@ from beartype.typing import Any, Generic, Sequence, TypeVar
 from scipy import linalg
 from typing_extensions import override
 
+from superlinked.framework.common.const import constants
 from superlinked.framework.common.dag.context import ExecutionContext
-from superlinked.framework.common.data_types import NPArray, Vector
+from superlinked.framework.common.data_types import NPArray, Vector, VectorBatch
 from superlinked.framework.common.space.config.normalization.normalization_config import (
     CategoricalNormConfig,
     ConstantNormConfig,
@@ -50,16 +51,30 @@ class Normalization(Generic[NormalizationConfigT], ABC):
         )
 
     def normalize_multiple(self, vectors: Sequence[Vector], context: ExecutionContext) -> list[Vector]:
-        return [self.normalize(vector, context) for vector in vectors]
+        if not VectorBatch.can_batch(vectors):
+            return [self.normalize(vector, context) for vector in vectors]
+        return self.normalize_batch(VectorBatch.from_vectors(vectors), context).to_vectors()
+
+    def normalize_batch(self, batch: VectorBatch, context: ExecutionContext | None = None) -> VectorBatch:
+        return batch.normalize(self.norm_batch(batch, context.is_query_context if context is not None else False))
 
     @abstractmethod
     def norm(self, value: NPArray, is_query: bool = False) -> float: ...
 
+    def norm_batch(self, batch: VectorBatch, is_query: bool = False) -> NPArray:
+        """Returns the norms of the vectors of the batch, ignoring their negative filters"""
+        return np.array([self.norm(vector.without_negative_filter.value, is_query) for vector in batch.to_vectors()])
+
     def denormalize(self, vector: Vector) -> Vector:
         return vector.denormalize()
 
     def denormalize_multiple(self, vectors: Sequence[Vector]) -> list[Vector]:
-        return [self.denormalize(vector) for vector in vectors]
+        if not VectorBatch.can_batch(vectors):
+            return [self.denormalize(vector) for vector in vectors]
+        return self.denormalize_batch(VectorBatch.from_vectors(vectors)).to_vectors()
+
+    def denormalize_batch(self, batch: VectorBatch) -> VectorBatch:
+        return batch.denormalize()
 
     @override
     def __eq__(self, other: Any) -> bool:
@@ -82,6 +97,10 @@ class L1Norm(Normalization[L1NormConfig]):
         """Returns the L1 norm (sum of absolute values) of the input array"""
         return np.sum(np.abs(value))
 
+    @override
+    def norm_batch(self, batch: VectorBatch, is_query: bool = False) -> NPArray:
+        return np.sum(np.abs(batch.replace_negative_filters(0.0).value), axis=1)
+
 
 class L2Norm(Normalization[L2NormConfig]):
     def __init__(self, config: L2NormConfig | None = None) -> None:
@@ -92,6 +111,10 @@ class L2Norm(Normalization[L2NormConfig]):
         """Must be called with value that has no negative filter"""
         return linalg.norm(value)
 
+    @override
+    def norm_batch(self, batch: VectorBatch, is_query: bool = False) -> NPArray:
+        return np.linalg.norm(batch.replace_negative_filters(0.0).value, axis=1)
+
 
 class ConstantNorm(Normalization[ConstantNormConfig]):
     def __init__(self, config: ConstantNormConfig) -> None:
@@ -106,10 +129,18 @@ class ConstantNorm(Normalization[ConstantNormConfig]):
     def norm(self, value: NPArray, is_query: bool = False) -> float:
         return self._config.length
 
+    @override
+    def norm_batch(self, batch: VectorBatch, is_query: bool = False) -> NPArray:
+        return np.full(batch.size, self._config.length)
+
     @override
     def denormalize(self, vector: Vector) -> Vector:
         return vector.normalize(1 / self._config.length)
 
+    @override
+    def denormalize_batch(self, batch: VectorBatch) -> VectorBatch:
+        return batch.normalize(np.full(batch.size, 1 / self._config.length))
+
     @override
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, type(self)) and self._config.length == other._config.length
@@ -123,6 +154,10 @@ class NoNorm(Normalization[NoNormConfig]):
     def norm(self, value: NPArray, is_query: bool = False) -> float:
         return 1.0
 
+    @override
+    def norm_batch(self, batch: VectorBatch, is_query: bool = False) -> NPArray:
+        return np.ones(batch.size)
+
 
 class CategoricalNorm(Normalization[CategoricalNormConfig]):
     def __init__(self, config: CategoricalNormConfig) -> None:
@@ -139,3 +174,13 @@ class CategoricalNorm(Normalization[CategoricalNormConfig]):
             else 1.0 / sqrt_len_config_categories
         )
         return vector_values_max / expected_max
+
+    @override
+    def norm_batch(self, batch: VectorBatch, is_query: bool = False) -> NPArray:
+        value = batch.replace_negative_filters(constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE).value
+        vector_values_max = np.max(value, axis=1, initial=0.0)
+        sqrt_len_config_categories = math.sqrt(self._config.categories_count)
+        if not is_query:
+            return vector_values_max / (1.0 / sqrt_len_config_categories)
+        len_implied_categories = np.count_nonzero(value > constants.DEFAULT_NOT_AFFECTING_EMBEDDING_VALUE, axis=1)
+        return vector_values_max / (sqrt_len_config_categories / np.maximum(len_implied_categories, 1))
@@ -44,6 +44,17 @@ class Search(ABC, Generic[SearchParamsT, QuertT, KNNReturnT]):
         query = self.build_query(search_params)
         return self.knn_search(index_config, query)
 
+    def knn_search_batch_with_checks(
+        self,
+        index_config: IndexConfig,
+        search_params_list: Sequence[SearchParamsT],
+    ) -> Sequence[KNNReturnT]:
+        for search_params in search_params_list:
+            self.check_vector_field(index_config, search_params.vector_field)
+            self.check_filters(index_config, search_params.filters)
+        queries = [self.build_query(search_params) for search_params in search_params_list]
+        return self.knn_search_batch(index_config, queries)
+
     @abstractmethod
     def build_query(self, search_params: SearchParamsT) -> QuertT:
         pass
@@ -52,6 +63,12 @@ class Search(ABC, Generic[SearchParamsT, QuertT, KNNReturnT]):
     def knn_search(self, index_config: IndexConfig, query: QuertT) -> KNNReturnT:
         pass
 
+    def knn_search_batch(self, index_config: IndexConfig, queries: Sequence[QuertT]) -> Sequence[KNNReturnT]:
+        """
+        Run the queries one by one. Override in subclasses if the VDB has a native batch search.
+        """
+        return [self.knn_search(index_config, query) for query in queries]
+
     @staticmethod
     def check_vector_field(index_config: IndexConfig, vector_field: VectorFieldData) -> None:
         if vector_field.value is None:
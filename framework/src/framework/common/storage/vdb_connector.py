@@ -130,20 +130,42 @@ class VDBConnector(ABC):
         vdb_knn_search_params: VDBKNNSearchParams,
         **params: Any,
     ) -> Sequence[ResultEntityData]:
+        search_params = self._apply_default_search_limit(vdb_knn_search_params)
+        return self._knn_search(index_name, schema_name, search_params, **params)
+
+    @time_execution
+    def knn_search_batch(
+        self,
+        index_name: str,
+        schema_name: str,
+        vdb_knn_search_params_list: Sequence[VDBKNNSearchParams],
+        **params: Any,
+    ) -> Sequence[Sequence[ResultEntityData]]:
+        """
+        Run several kNN searches on the same index at once, returning the results in the order of the params.
+        Each params carries its own vector, limit and filters; queries sharing filters should share
+        the same filter sequence, so that connectors can evaluate it only once.
+        """
+        search_params_list = [
+            self._apply_default_search_limit(vdb_knn_search_params)
+            for vdb_knn_search_params in vdb_knn_search_params_list
+        ]
+        return self._knn_search_batch(index_name, schema_name, search_params_list, **params)
+
+    def _apply_default_search_limit(self, vdb_knn_search_params: VDBKNNSearchParams) -> VDBKNNSearchParams:
         # If the limit is set to the default, assign it a database-specific default value
         limit = (
             self._default_search_limit
             if vdb_knn_search_params.limit == constants.DEFAULT_LIMIT
             else vdb_knn_search_params.limit
         )
-        search_params = VDBKNNSearchParams(
+        return VDBKNNSearchParams(
             vector_field=vdb_knn_search_params.vector_field,
             limit=limit,
             fields_to_return=vdb_knn_search_params.fields_to_return,
             filters=vdb_knn_search_params.filters,
             radius=vdb_knn_search_params.radius,
         )
-        return self._knn_search(index_name, schema_name, search_params, **params)
 
     @abstractmethod
     def _knn_search(
@@ -155,5 +177,20 @@ class VDBConnector(ABC):
     ) -> Sequence[ResultEntityData]:
         pass
 
+    def _knn_search_batch(
+        self,
+        index_name: str,
+        schema_name: str,
+        vdb_knn_search_params_list: Sequence[VDBKNNSearchParams],
+        **params: Any,
+    ) -> Sequence[Sequence[ResultEntityData]]:
+        """
+        Run the searches one by one. Override in subclasses if the VDB supports batched search.
+        """
+        return [
+            self._knn_search(index_name, schema_name, vdb_knn_search_params, **params)
+            for vdb_knn_search_params in vdb_knn_search_params_list
+        ]
+
     def _get_index_config(self, index_name: str) -> IndexConfig:
         return self.search_index_manager.get_index_config(index_name)
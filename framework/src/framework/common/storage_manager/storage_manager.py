@@ -115,6 +115,71 @@ class StorageManager:
     ) -> Sequence[SearchResultItem]:
         self._validate_knn_search_input(schema, knn_search_params.schema_fields_to_return)
         index_name = self._storage_naming.get_index_name_from_node_id(index_node.node_id)
+        vdb_knn_search_params, schema_field_by_field_name = self._compile_vdb_knn_search_params(
+            index_node,
+            knn_search_params,
+            self._compose_filter_field_data(schema, knn_search_params.filters),
+            should_return_index_vector,
+        )
+        search_result: Sequence[ResultEntityData] = self._vdb_connector.knn_search(
+            index_name,
+            schema._schema_name,
+            vdb_knn_search_params,
+            **params,
+        )
+        return self._map_vdb_result_to_search_result_items(
+            search_result, schema_field_by_field_name, index_node.node_id
+        )
+
+    @time_execution
+    def knn_search_batch(
+        self,
+        index_node: IndexNode,
+        schema: IdSchemaObject,
+        knn_search_params_list: Sequence[KNNSearchParams],
+        should_return_index_vector: bool = False,
+        **params: Any,
+    ) -> Sequence[Sequence[SearchResultItem]]:
+        """
+        Run several kNN searches on the same index in one VDB call, returning the results in the order of the params.
+        Params sharing the same filter sequence get the same composed filters, so the VDB can resolve them once.
+        """
+        index_name = self._storage_naming.get_index_name_from_node_id(index_node.node_id)
+        filter_field_data_by_filters_id: dict[int, Sequence[ComparisonOperation[Field]]] = {}
+        compiled_search_params: list[tuple[VDBKNNSearchParams, dict[str, SchemaField]]] = []
+        for knn_search_params in knn_search_params_list:
+            self._validate_knn_search_input(schema, knn_search_params.schema_fields_to_return)
+            filters_id = id(knn_search_params.filters)
+            if filters_id not in filter_field_data_by_filters_id:
+                filter_field_data_by_filters_id[filters_id] = self._compose_filter_field_data(
+                    schema, knn_search_params.filters
+                )
+            compiled_search_params.append(
+                self._compile_vdb_knn_search_params(
+                    index_node,
+                    knn_search_params,
+                    filter_field_data_by_filters_id[filters_id],
+                    should_return_index_vector,
+                )
+            )
+        search_results: Sequence[Sequence[ResultEntityData]] = self._vdb_connector.knn_search_batch(
+            index_name,
+            schema._schema_name,
+            [vdb_knn_search_params for vdb_knn_search_params, _ in compiled_search_params],
+            **params,
+        )
+        return [
+            self._map_vdb_result_to_search_result_items(search_result, schema_field_by_field_name, index_node.node_id)
+            for search_result, (_, schema_field_by_field_name) in zip(search_results, compiled_search_params)
+        ]
+
+    def _compile_vdb_knn_search_params(
+        self,
+        index_node: IndexNode,
+        knn_search_params: KNNSearchParams,
+        filter_field_data: Sequence[ComparisonOperation[Field]],
+        should_return_index_vector: bool,
+    ) -> tuple[VDBKNNSearchParams, dict[str, SchemaField]]:
         vector_field = cast(
             VectorFieldData,
             self._entity_builder.compose_field_data(index_node.node_id, knn_search_params.vector),
@@ -123,22 +188,24 @@ class StorageManager:
         fields_to_return = list(schema_fields_by_fields.keys()) + list(self._entity_builder._admin_fields.header_fields)
         if should_return_index_vector:
             fields_to_return.append(self._entity_builder.compose_field(index_node.node_id, Vector))
-        search_result: Sequence[ResultEntityData] = self._vdb_connector.knn_search(
-            index_name,
-            schema._schema_name,
-            VDBKNNSearchParams(
-                vector_field,
-                knn_search_params.limit,
-                fields_to_return,
-                self._compose_filter_field_data(schema, knn_search_params.filters),
-                knn_search_params.radius,
-            ),
-            **params,
+        vdb_knn_search_params = VDBKNNSearchParams(
+            vector_field,
+            knn_search_params.limit,
+            fields_to_return,
+            filter_field_data,
+            knn_search_params.radius,
         )
-        schema_field_by_field_name = self._create_schema_field_by_field_name(schema_fields_by_fields)
+        return vdb_knn_search_params, self._create_schema_field_by_field_name(schema_fields_by_fields)
+
+    def _map_vdb_result_to_search_result_items(
+        self,
+        search_result: Sequence[ResultEntityData],
+        schema_field_by_field_name: Mapping[str, SchemaField],
+        index_node_id: str,
+    ) -> list[SearchResultItem]:
         return [
             self._map_vdb_result_item_to_search_result_item(
-                result_entity_data, schema_field_by_field_name, index_node.node_id
+                result_entity_data, schema_field_by_field_name, index_node_id
             )
             for result_entity_data in search_result
         ]
@@ -0,0 +1,56 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import os
+import threading
+
+from beartype.typing import Any, Coroutine, TypeVar
+
+from superlinked.framework.common.util.singleton_decorator import singleton
+
+ResultT = TypeVar("ResultT")
+
+
+@singleton
+class EventLoopThread:
+    """
+    Event loop running in a daemon thread, so synchronous code can run coroutines
+    regardless of whether the calling thread has a running event loop of its own.
+    Forked processes do not inherit the thread, so a child process starts a loop of its own on first use.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__pid = os.getpid()
+        self.__loop = self.__start_loop()
+
+    def run(self, coroutine: Coroutine[Any, Any, ResultT]) -> ResultT:
+        """
+        Run the coroutine on the loop, blocking until it completes. Must not be called from the loop itself.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__get_loop()).result()
+
+    def __get_loop(self) -> asyncio.AbstractEventLoop:
+        if self.__pid != os.getpid():
+            with self.__lock:
+                if self.__pid != os.getpid():
+                    # the inherited loop belongs to the thread of the parent, it is never run here
+                    self.__loop = self.__start_loop()
+                    self.__pid = os.getpid()
+        return self.__loop
+
+    def __start_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="superlinked-event-loop", daemon=True).start()
+        return loop
@@ -0,0 +1,72 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from beartype.typing import Callable, Iterable, Iterator, TypeVar
+
+from superlinked.framework.common.settings import Settings
+from superlinked.framework.common.util.singleton_decorator import singleton
+
+InputT = TypeVar("InputT")
+ResultT = TypeVar("ResultT")
+
+
+@singleton
+class ImagePipeline:
+    """
+    Loads, decodes and preprocesses images on a thread pool, as PIL and torchvision release the GIL for the heavy
+    lifting. Results are yielded in order while the pool keeps working ahead, so the consumer (e.g. model inference
+    on a batch) overlaps with the preparation of the next images. At most
+    `SUPERLINKED_IMAGE_PIPELINE_MAX_IN_FLIGHT_IMAGES` results are pending or not yet consumed,
+    capping the memory held by decoded images.
+    """
+
+    def __init__(self) -> None:
+        settings = Settings()
+        self.__executor = ThreadPoolExecutor(
+            max_workers=settings.SUPERLINKED_IMAGE_PIPELINE_WORKER_COUNT or os.cpu_count() or 1,
+            thread_name_prefix="superlinked-image-pipeline",
+        )
+        self.__max_in_flight = max(settings.SUPERLINKED_IMAGE_PIPELINE_MAX_IN_FLIGHT_IMAGES, 1)
+
+    def map(self, function: Callable[[InputT], ResultT], items: Iterable[InputT]) -> Iterator[ResultT]:
+        pending: deque[Future[ResultT]] = deque()
+        try:
+            for item in items:
+                if len(pending) >= self.__max_in_flight:
+                    yield pending.popleft().result()
+                pending.append(self.__executor.submit(function, item))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def map_batches(
+        self, function: Callable[[InputT], ResultT], items: Iterable[InputT], batch_size: int
+    ) -> Iterator[list[ResultT]]:
+        """
+        Like `map`, yielding the results in batches of `batch_size`. The pool works ahead on the next batches
+        while the current one is consumed, up to the in-flight bound.
+        """
+        batch: list[ResultT] = []
+        for result in self.map(function, items):
+            batch.append(result)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import base64
+import hashlib
 import io
 import os
 
@@ -25,6 +26,14 @@ class ImageUtil:
     def open_image(data: bytes) -> PIL.Image.Image:
         return PIL.Image.open(io.BytesIO(base64.b64decode(data)))
 
+    @staticmethod
+    def open_image_with_hash(data: bytes) -> tuple[PIL.Image.Image, str]:
+        """
+        Open the base64 encoded image lazily, along with the sha256 of its encoded bytes.
+        """
+        image_bytes = base64.b64decode(data)
+        return PIL.Image.open(io.BytesIO(image_bytes)), hashlib.sha256(image_bytes).hexdigest()
+
     @staticmethod
     def open_local_image_file(dir_path: str, file_name: str) -> PIL.Image.Image:
         return PIL.Image.open(os.path.join(dir_path, file_name))
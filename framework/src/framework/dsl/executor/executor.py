@@ -19,6 +19,9 @@ from beartype.typing import Generic, Sequence
 from typing_extensions import Annotated
 
 from superlinked.framework.common.dag.context import ExecutionContext
+from superlinked.framework.common.space.embedding.model_preloader import (
+    ModelPreloader,
+)
 from superlinked.framework.common.util.generic_class_util import GenericClassUtil
 from superlinked.framework.common.util.type_validator import TypeValidator
 from superlinked.framework.dsl.app.app import App
@@ -66,6 +69,12 @@ class Executor(ABC, Generic[SourceT]):
             App: An instance of App.
         """
 
+    def _preload_models(self) -> None:
+        embedding_configs = [
+            space.transformation_config.embedding_config for index in self._indices for space in index._spaces
+        ]
+        ModelPreloader.preload(embedding_configs, self._context)
+
     def _prohibit_bytes_input(self) -> None:
         for source in self._sources:
             source.parser.set_allow_bytes_input(False)
@@ -73,12 +73,17 @@ class InMemoryExecutor(InteractiveExecutor[InMemorySource]):
         """
         super().__init__(sources, indices, InMemoryVectorDatabase(), context_data)
 
-    def run(self) -> InMemoryApp:
+    def run(self, preload_models: bool = False) -> InMemoryApp:
         """
         Run the InMemoryExecutor. It returns an app that can accept queries.
+        Args:
+            preload_models (bool): Load the embedding models of the indices in parallel and warm them up
+                before returning, so the first queries are not slowed down by loading them. Defaults to False.
         Returns:
             InMemoryApp: An instance of InMemoryApp.
         """
+        if preload_models:
+            self._preload_models()
         app = InMemoryApp(self._sources, self._indices, self._vector_database, self._context)
         self._logger.info("started in-memory app")
         return app
@@ -78,13 +78,19 @@ class RestExecutor(Executor[RestSource | DataLoaderSource]):
         self._queue = QueueFactory.create_queue(dict[str, Any])
         self._blob_handler = BlobHandlerFactory.create_blob_handler(blob_handler_config)
 
-    def run(self) -> RestApp:
+    def run(self, preload_models: bool = False) -> RestApp:
         """
         Run the RestExecutor. It returns an app that will create rest endpoints.
 
+        Args:
+            preload_models (bool): Load the embedding models of the indices in parallel and warm them up
+                before returning, so the first requests are not slowed down by loading them. Defaults to False.
+
         Returns:
             RestApp: An instance of RestApp.
         """
+        if preload_models:
+            self._preload_models()
         return RestApp(
             self._sources,
             self._indices,
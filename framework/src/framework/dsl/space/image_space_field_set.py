@@ -40,9 +40,10 @@ class ImageSpaceFieldSet(SpaceFieldSet[ImageData]):
             raise ValueError(f"Invalid type of input for {type(self).__name__}: {type(value)}")
         loaded_image = blob_loader.load(value)
         opened_image: PIL.Image.Image | None = None
+        image_hash: str | None = None
         if loaded_image.data:
-            opened_image = ImageUtil.open_image(loaded_image.data)
-        return ImageData(image=opened_image, description=None)
+            opened_image, image_hash = ImageUtil.open_image_with_hash(loaded_image.data)
+        return ImageData(image=opened_image, description=None, image_hash=image_hash)
 
 
 @dataclass
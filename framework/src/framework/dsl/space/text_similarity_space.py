@@ -54,13 +54,15 @@ class TextSimilaritySpace(Space[Vector, str], HasSpaceFieldSet):
     finetuned pooling to encode longer text sequences most efficiently.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         text: TextInput | None | Sequence[TextInput | None],
         model: str,
         cache_size: int = DEFAULT_CACHE_SIZE,
         model_cache_dir: Path | None = None,
         model_handler: TextModelHandler = TextModelHandler.SENTENCE_TRANSFORMERS,
+        batch_size: int | None = None,
+        token_budget: int | None = None,
     ) -> None:
         """
         Initialize the TextSimilaritySpace.
@@ -74,14 +76,20 @@ class TextSimilaritySpace(Space[Vector, str], HasSpaceFieldSet):
             model_cache_dir (Path | None, optional): Directory to cache downloaded models.
                 If None, uses the default cache directory. Defaults to None.
             model_handler (TextModelHandler, optional): The handler for the model,
-                defaults to ModelHandler.SENTENCE_TRANSFORMERS.
+                defaults to ModelHandler.SENTENCE_TRANSFORMERS. ONNX and ONNX_INT8 run sentence-transformers models
+                with ONNX Runtime on CPU, the latter int8 dynamic-quantized.
+            batch_size (int | None, optional): The maximum number of texts encoded together by
+                sentence-transformers models. Defaults to None, which means effectively using 32.
+            token_budget (int | None, optional): The maximum number of (padded) tokens encoded together by
+                sentence-transformers models. If set, texts are batched by their tokenized length, so short texts
+                are not padded to the length of long ones. Defaults to None, which means no token budget.
         """
         unchecked_texts: list[ChunkingNode | String] = self._fields_to_non_none_sequence(text)
         text_fields = [self._get_root(unchecked_text) for unchecked_text in unchecked_texts]
         super().__init__(text_fields, String)
         self.text = SpaceFieldSet[str](self, set(text_fields))
         self._transformation_config = self._init_transformation_config(
-            model, model_cache_dir, cache_size, model_handler
+            model, model_cache_dir, cache_size, model_handler, batch_size, token_budget
         )
         self._schema_node_map: dict[SchemaObject, EmbeddingNode[Vector, str]] = {
             self._get_root(unchecked_text).schema_obj: self._generate_embedding_node(
@@ -145,11 +153,19 @@ class TextSimilaritySpace(Space[Vector, str], HasSpaceFieldSet):
     def _allow_empty_fields(self) -> bool:
         return False
 
-    def _init_transformation_config(
-        self, model: str, model_cache_dir: Path | None, cache_size: int, model_handler: TextModelHandler
+    def _init_transformation_config(  # pylint: disable=too-many-arguments
+        self,
+        model: str,
+        model_cache_dir: Path | None,
+        cache_size: int,
+        model_handler: TextModelHandler,
+        batch_size: int | None,
+        token_budget: int | None,
     ) -> TransformationConfig[Vector, str]:
         length = model_handler.create_manager(model, model_cache_dir).calculate_length()
-        embedding_config = TextSimilarityEmbeddingConfig(str, model, model_cache_dir, cache_size, length, model_handler)
+        embedding_config = TextSimilarityEmbeddingConfig(
+            str, model, model_cache_dir, cache_size, length, model_handler, batch_size, token_budget
+        )
         aggregation_config = VectorAggregationConfig(Vector)
         normalization_config = L2NormConfig()
         return TransformationConfig(normalization_config, aggregation_config, embedding_config)
@@ -12,9 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from superlinked.framework.common.storage.search_index.search_algorithm import (
+    SearchAlgorithm,
+)
 from superlinked.framework.dsl.storage.vector_database import VectorDatabase
 from superlinked.framework.storage.common.vdb_settings import VDBSettings
+from superlinked.framework.storage.in_memory.in_memory_ivf_params import (
+    InMemoryIVFParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_quantization_params import (
+    InMemoryQuantizationParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_sharding_params import (
+    InMemoryShardingParams,
+)
 from superlinked.framework.storage.in_memory.in_memory_vdb import InMemoryVDB
+from superlinked.framework.storage.in_memory.in_memory_write_ahead_log_params import (
+    InMemoryWriteAheadLogParams,
+)
 
 
 class InMemoryVectorDatabase(VectorDatabase[InMemoryVDB]):
@@ -25,17 +40,44 @@ class InMemoryVectorDatabase(VectorDatabase[InMemoryVDB]):
     and development purposes.
     """
 
-    def __init__(self, default_query_limit: int = -1) -> None:
+    def __init__(
+        self,
+        default_query_limit: int = -1,
+        search_algorithm: SearchAlgorithm = SearchAlgorithm.FLAT,
+        ivf_params: InMemoryIVFParams | None = None,
+        write_ahead_log_params: InMemoryWriteAheadLogParams | None = None,
+        quantization_params: InMemoryQuantizationParams | None = None,
+        sharding_params: InMemoryShardingParams | None = None,
+    ) -> None:
         """
         Initialize the InMemoryVectorDatabase.
 
         Args:
             default_query_limit (int): The default limit for query results. A value of -1 indicates no limit.
+            search_algorithm (SearchAlgorithm): The vector search algorithm. FLAT is exact search,
+                IVF is approximate search over k-means partitioned vectors. Defaults to FLAT.
+            ivf_params (InMemoryIVFParams | None): Recall/latency tuning of the IVF search.
+                Defaults to None, which uses the default InMemoryIVFParams.
+            write_ahead_log_params (InMemoryWriteAheadLogParams | None): Enables logging every write to a local
+                directory with periodic compacting snapshots; restoring then recovers the state from that
+                directory. Defaults to None, which keeps the database purely in memory.
+            quantization_params (InMemoryQuantizationParams | None): Enables scoring on a float16 or int8
+                scalar-quantized vector matrix, optionally rescoring the top candidates at full precision,
+                or dropping the full precision vectors to save memory.
+                Defaults to None, which scores full precision vectors.
+            sharding_params (InMemoryShardingParams | None): Enables keeping the vectors in shared memory and
+                scoring large searches in parallel worker processes. Defaults to None, which scores every search
+                in the calling process.
 
         Sets up an in-memory vector DB connector for testing and development.
         """
         super().__init__()
         self.__settings = VDBSettings(default_query_limit)
+        self.__search_algorithm = search_algorithm
+        self.__ivf_params = ivf_params
+        self.__write_ahead_log_params = write_ahead_log_params
+        self.__quantization_params = quantization_params
+        self.__sharding_params = sharding_params
 
     @property
     def _vdb_connector(self) -> InMemoryVDB:
@@ -45,4 +87,11 @@ class InMemoryVectorDatabase(VectorDatabase[InMemoryVDB]):
         Returns:
             InMemoryVDB: The in-memory vector database connector instance.
         """
-        return InMemoryVDB(self.__settings)
+        return InMemoryVDB(
+            self.__settings,
+            self.__search_algorithm,
+            self.__ivf_params,
+            self.__write_ahead_log_params,
+            self.__quantization_params,
+            self.__sharding_params,
+        )
@@ -14,14 +14,14 @@
 
 from __future__ import annotations
 
-from functools import reduce
+from collections import defaultdict
 
 from beartype.typing import Sequence, cast
 from typing_extensions import override
 
 from superlinked.framework.common.dag.concatenation_node import ConcatenationNode
 from superlinked.framework.common.dag.context import ExecutionContext
-from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.data_types import Vector, VectorBatch
 from superlinked.framework.common.exception import ValidationException
 from superlinked.framework.common.interface.has_length import HasLength
 from superlinked.framework.common.space.normalization.normalization import ConstantNorm
@@ -53,22 +53,42 @@ class OnlineConcatenationNode(DefaultOnlineNode[ConcatenationNode, Vector], HasL
         context: ExecutionContext,
     ) -> list[Vector | None]:
         self._check_evaluation_inputs(parent_results)
-        vector_and_nodes_list: list[list[tuple[Vector, OnlineNode]]] = [
-            [(result.value, parent) for parent, result in parent_result.items()] for parent_result in parent_results
-        ]
-        weighted_vectors = [
-            self._apply_weights_and_concatenate(vector_and_nodes, context) for vector_and_nodes in vector_and_nodes_list
-        ]
-        return [self._norm.normalize(vector, context) for vector in weighted_vectors]
+        vectors: list[Vector | None] = [None] * len(parent_results)
+        for indices, vectors_by_parent in self._group_vectors_by_parents(parent_results).items():
+            concatenated_batch = self._apply_weights_and_concatenate(vectors_by_parent, context)
+            for i, vector in zip(indices, self._norm.normalize_batch(concatenated_batch, context).to_vectors()):
+                vectors[i] = vector
+        return vectors
+
+    def _group_vectors_by_parents(
+        self,
+        parent_results: Sequence[dict[OnlineNode, SingleEvaluationResult]],
+    ) -> dict[tuple[int, ...], list[tuple[list[Vector], OnlineNode]]]:
+        """
+        Group the results having the same parents with the same dimensions, in the same order,
+        so that every group can be concatenated as a whole.
+        """
+        indices_by_key: dict[tuple[tuple[OnlineNode, int], ...], list[int]] = defaultdict(list)
+        for i, parent_result in enumerate(parent_results):
+            key = tuple((parent, cast(Vector, result.value).dimension) for parent, result in parent_result.items())
+            indices_by_key[key].append(i)
+        return {
+            tuple(indices): [
+                ([cast(Vector, parent_results[i][parent].value) for i in indices], parent) for parent, _ in key
+            ]
+            for key, indices in indices_by_key.items()
+        }
 
     def _apply_weights_and_concatenate(
         self,
-        vector_and_nodes: list[tuple[Vector, OnlineNode]],
+        vectors_and_nodes: list[tuple[list[Vector], OnlineNode]],
         context: ExecutionContext,
-    ) -> Vector:
-        weighted_vectors = (vector * context.get_weight_of_node(parent.node_id) for vector, parent in vector_and_nodes)
-        vector = reduce(lambda a, b: a.concatenate(b), weighted_vectors)
-        return vector
+    ) -> VectorBatch:
+        weighted_batches = [
+            VectorBatch.from_vectors(vectors) * context.get_weight_of_node(parent.node_id)
+            for vectors, parent in vectors_and_nodes
+        ]
+        return VectorBatch.concatenate_all(weighted_batches)
 
     def _check_evaluation_inputs(
         self,
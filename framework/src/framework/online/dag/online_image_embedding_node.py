@@ -86,9 +86,10 @@ class OnlineImageEmbeddingNode(OnlineNode[ImageEmbeddingNode, Vector], HasLength
     def _get_image_data(self, parsed_schema: ParsedSchema) -> ImageData:
         image, description = self.__load_input(parsed_schema)
         loaded_image: Image | None = None
+        image_hash: str | None = None
         if image is not None and image.data is not None:
-            loaded_image = ImageUtil.open_image(image.data)
-        return ImageData(loaded_image, description)
+            loaded_image, image_hash = ImageUtil.open_image_with_hash(image.data)
+        return ImageData(loaded_image, description, image_hash)
 
     def __load_input(self, parsed_schema: ParsedSchema) -> tuple[BlobInformation | None, str | None]:
         description = self._get_field_value(parsed_schema, self._description_node)
@@ -14,12 +14,8 @@
 
 from __future__ import annotations
 
-import base64
-import io
-
 from beartype.typing import cast
-from PIL import Image
-from PIL.ImageFile import ImageFile
+from PIL.Image import Image
 from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
@@ -33,6 +29,8 @@ from superlinked.framework.common.schema.blob_information import BlobInformation
 from superlinked.framework.common.schema.image_data import ImageData
 from superlinked.framework.common.schema.schema_object import SchemaField
 from superlinked.framework.common.storage_manager.storage_manager import StorageManager
+from superlinked.framework.common.util.image_pipeline import ImagePipeline
+from superlinked.framework.common.util.image_util import ImageUtil
 from superlinked.framework.online.dag.evaluation_result import EvaluationResult
 from superlinked.framework.online.dag.online_node import OnlineNode
 from superlinked.framework.online.dag.parent_validator import ParentValidationType
@@ -66,16 +64,18 @@ class OnlineImageInformationNode(OnlineNode[ImageInformationNode, ImageData]):
         parsed_schemas: list[ParsedSchema],
         context: ExecutionContext,
     ) -> list[EvaluationResult[ImageData]]:
-        return [self.evaluate_self_single(schema) for schema in parsed_schemas]
+        # blobs are loaded in parallel, pixels are decoded lazily in preprocessing
+        return list(ImagePipeline().map(self.evaluate_self_single, parsed_schemas))
 
     def evaluate_self_single(
         self, parsed_schema: ParsedSchema
     ) -> EvaluationResult[ImageData]:
         image, description = self.__load_input(parsed_schema)
-        loaded_image: ImageFile | None = None
+        loaded_image: Image | None = None
+        image_hash: str | None = None
         if image is not None and image.data is not None:
-            loaded_image = Image.open(io.BytesIO(base64.b64decode(image.data)))
-        image_data = ImageData(loaded_image, description)
+            loaded_image, image_hash = ImageUtil.open_image_with_hash(image.data)
+        image_data = ImageData(loaded_image, description, image_hash)
         return EvaluationResult(self._get_single_evaluation_result(image_data))
 
     def __load_input(
@@ -14,12 +14,7 @@
 
 from __future__ import annotations
 
-import base64
-import io
-
 from beartype.typing import Mapping, Sequence
-from PIL import Image
-from PIL.ImageFile import ImageFile
 from typing_extensions import override
 
 from superlinked.framework.common.dag.context import ExecutionContext
@@ -27,6 +22,7 @@ from superlinked.framework.common.dag.image_information_node import ImageInforma
 from superlinked.framework.common.interface.weighted import Weighted
 from superlinked.framework.common.parser.blob_loader import BlobLoader
 from superlinked.framework.common.schema.image_data import ImageData
+from superlinked.framework.common.util.image_util import ImageUtil
 from superlinked.framework.query.dag.query_evaluation_data_types import (
     QueryEvaluationResult,
 )
@@ -48,14 +44,7 @@ class QueryImageInformationNode(QueryNode[ImageInformationNode, ImageData]):
         context: ExecutionContext,
     ) -> QueryEvaluationResult[ImageData]:
         descriptions = self._get_field_values(inputs, self.node.description_node_id)
-        opened_images = self.__open_images(inputs)
-        weighted_image_data_from_images = [
-            Weighted(
-                ImageData(image=opened_image.item, description=None),
-                opened_image.weight,
-            )
-            for opened_image in opened_images
-        ]
+        weighted_image_data_from_images = self.__open_images(inputs)
         weighted_image_data_from_descriptions = [
             Weighted(
                 ImageData(image=None, description=description.item), description.weight
@@ -68,7 +57,7 @@ class QueryImageInformationNode(QueryNode[ImageInformationNode, ImageData]):
 
     def __open_images(
         self, inputs: Mapping[str, Sequence[QueryNodeInput]]
-    ) -> list[Weighted[ImageFile]]:
+    ) -> list[Weighted[ImageData]]:
         image_like_inputs = self._get_field_values(inputs, self.node.image_node_id)
         loaded_images = [
             self._blob_loader.load(image_like_input.item)
@@ -81,8 +70,9 @@ class QueryImageInformationNode(QueryNode[ImageInformationNode, ImageData]):
         ]
         return opened_images
 
-    def _open_image(self, image_data: bytes) -> ImageFile:
-        return Image.open(io.BytesIO(base64.b64decode(image_data)))
+    def _open_image(self, image_data: bytes) -> ImageData:
+        image, image_hash = ImageUtil.open_image_with_hash(image_data)
+        return ImageData(image=image, description=None, image_hash=image_hash)
 
     def _get_field_values(
         self,
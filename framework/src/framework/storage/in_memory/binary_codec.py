@@ -0,0 +1,105 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from collections import defaultdict
+
+import numpy as np
+from beartype.typing import Any, Sequence
+
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.storage.in_memory.binary_object_serializer import (
+    BinaryObjectSerializer,
+)
+from superlinked.framework.storage.in_memory.in_memory_partition_data import (
+    InMemoryPartitionData,
+    InMemoryVectorBlock,
+)
+from superlinked.framework.storage.in_memory.json_codec import JsonDecoder, JsonEncoder
+
+FORMAT_VERSION = 2
+
+
+class BinaryCodec:
+    """
+    Columnar persistence format of the in-memory vector database.
+    Every partition is written as its vector blocks, raw array blocks holding the vectors of a field together with
+    the row numbers they belong to, and its other fields column-wise in a JSON sidecar.
+    Vector blocks are read back as they are (memory-mapped, if the serializer supports it), so restoring does not
+    copy the vectors: the vector stores adopt the blocks as their matrices.
+    """
+
+    def __init__(self, serializer: BinaryObjectSerializer) -> None:
+        self.__serializer = serializer
+
+    def encode(self, partitions: Sequence[InMemoryPartitionData], key: str) -> None:
+        sidecar_partitions = []
+        for partition_number, partition in enumerate(partitions):
+            scalar_columns = defaultdict[str, dict[str, list]](lambda: {"rows": [], "values": []})
+            vector_columns = defaultdict[tuple[str, int], dict[str, list]](lambda: {"rows": [], "values": []})
+            for row_number, values in enumerate(partition.rows):
+                for field_name, value in values.items():
+                    column = (
+                        vector_columns[(field_name, value.dimension)]
+                        if isinstance(value, Vector)
+                        else scalar_columns[field_name]
+                    )
+                    column["rows"].append(row_number)
+                    column["values"].append(value.value if isinstance(value, Vector) else value)
+            vector_blocks = list(partition.vector_blocks) + [
+                InMemoryVectorBlock(
+                    field_name,
+                    np.array(column["rows"], dtype=np.int64),
+                    np.stack(column["values"]) if dimension else np.empty((len(column["rows"]), 0)),
+                )
+                for (field_name, dimension), column in vector_columns.items()
+            ]
+            sidecar_vector_blocks = []
+            for block_number, vector_block in enumerate(vector_blocks):
+                block_key = f"{key}.{partition_number}.{block_number}"
+                self.__serializer.write_array(vector_block.row_numbers, f"{block_key}.rows")
+                self.__serializer.write_array(vector_block.vectors, f"{block_key}.vectors")
+                sidecar_vector_blocks.append({"field": vector_block.field_name, "key": block_key})
+            sidecar_partitions.append(
+                {
+                    "schema_id": partition.schema_id,
+                    "object_ids": list(partition.object_ids),
+                    "scalar_columns": scalar_columns,
+                    "vector_blocks": sidecar_vector_blocks,
+                }
+            )
+        sidecar = {"version": FORMAT_VERSION, "partitions": sidecar_partitions}
+        self.__serializer.write(json.dumps(sidecar, cls=JsonEncoder), key)
+
+    def decode(self, key: str) -> list[InMemoryPartitionData]:
+        sidecar = json.loads(self.__serializer.read(key), cls=JsonDecoder)
+        if sidecar.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported in-memory vector database format version: {sidecar.get('version')}")
+        return [self.__decode_partition(partition) for partition in sidecar["partitions"]]
+
+    def __decode_partition(self, partition: dict[str, Any]) -> InMemoryPartitionData:
+        rows: list[dict[str, Any]] = [{} for _ in partition["object_ids"]]
+        for field_name, column in partition["scalar_columns"].items():
+            for row_number, value in zip(column["rows"], column["values"]):
+                rows[row_number][field_name] = value
+        vector_blocks = [
+            InMemoryVectorBlock(
+                vector_block["field"],
+                np.asarray(self.__serializer.read_array(f"{vector_block['key']}.rows")),
+                # a plain ndarray view avoids the overhead of memmap subclass slicing
+                np.asarray(self.__serializer.read_array(f"{vector_block['key']}.vectors")),
+            )
+            for vector_block in partition["vector_blocks"]
+        ]
+        return InMemoryPartitionData(partition["schema_id"], partition["object_ids"], rows, vector_blocks)
@@ -0,0 +1,40 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import abstractmethod
+
+import numpy as np
+
+from superlinked.framework.storage.in_memory.object_serializer import ObjectSerializer
+
+
+class BinaryObjectSerializer(ObjectSerializer):
+    """
+    An object serializer that can also store raw NumPy arrays next to the serialized objects.
+    Vector databases supporting it persist their vectors as binary blocks instead of encoding them in the
+    serialized string.
+    """
+
+    @abstractmethod
+    def read_array(self, key: str) -> np.ndarray:
+        """
+        Read the array associated with the given key.
+        Implementations are encouraged to return a read-only memory-mapped array to avoid copying.
+        """
+
+    @abstractmethod
+    def write_array(self, array: np.ndarray, key: str) -> None:
+        """
+        Write the array under the specified key.
+        """
@@ -0,0 +1,203 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+from operator import itemgetter
+
+import numpy as np
+from beartype.typing import AbstractSet, Any, Hashable, Sequence
+
+from superlinked.framework.common.interface.comparison_operand import (
+    ComparisonOperation,
+)
+from superlinked.framework.common.interface.comparison_operation_type import (
+    ComparisonOperationType,
+)
+
+
+class InMemoryFieldIndex:
+    """
+    Secondary index of a single scalar or list field.
+    Scalar values are kept in an inverted (value -> row ids) map, list values in an inverted
+    (item -> row ids) map. Range lookups use a sorted value array that is rebuilt lazily after writes.
+    `find_row_ids` returns None for operations the index cannot answer; those must be evaluated row by row.
+    Lookups may run while a single thread updates the index: their results reflect every update finished before
+    they started, and possibly some of the ones running meanwhile. A returned set may be one of the index,
+    changed by later updates, so it has to be copied (by a set operation) before being iterated.
+    """
+
+    def __init__(self) -> None:
+        self.__value_by_row_id: dict[int, Any] = {}
+        self.__row_ids_by_value = defaultdict[Hashable, set[int]](set)
+        self.__row_ids_by_item = defaultdict[Hashable, set[int]](set)
+        self.__has_scalar_values = False
+        self.__has_list_values = False
+        self.__has_unhashable_values = False
+        self.__version = 0
+        # the version it was built of, the sorted values and their row ids
+        self.__sorted_index: tuple[int, np.ndarray, np.ndarray] | None = None
+
+    @property
+    def row_ids(self) -> AbstractSet[int]:
+        return self.__value_by_row_id.keys()
+
+    def update(self, row_id: int, value: Any) -> None:
+        self.__remove(row_id)
+        if value is None:
+            return
+        self.__value_by_row_id[row_id] = value
+        self.__version += 1
+        if isinstance(value, list):
+            self.__has_list_values = True
+            for item in value:
+                self.__add(self.__row_ids_by_item, item, row_id)
+        else:
+            self.__has_scalar_values = True
+            self.__add(self.__row_ids_by_value, value, row_id)
+
+    def find_row_ids(self, operation: ComparisonOperation, all_row_ids: AbstractSet[int]) -> AbstractSet[int] | None:
+        if self.__has_unhashable_values:
+            return None
+        match operation._op:
+            case ComparisonOperationType.EQUAL:
+                return self.__find_equal(operation._other, all_row_ids)
+            case ComparisonOperationType.NOT_EQUAL:
+                return self.__complement(self.__find_equal(operation._other, all_row_ids), all_row_ids)
+            case ComparisonOperationType.IN:
+                return self.__find_in(operation._get_other_as_sequence(), all_row_ids)
+            case ComparisonOperationType.NOT_IN:
+                return self.__complement(self.__find_in(operation._get_other_as_sequence(), all_row_ids), all_row_ids)
+            case ComparisonOperationType.CONTAINS:
+                return self.__find_contains(operation._get_other_as_sequence())
+            case ComparisonOperationType.NOT_CONTAINS:
+                return self.__complement(self.__find_contains(operation._get_other_as_sequence()), self.row_ids)
+            case ComparisonOperationType.CONTAINS_ALL:
+                return self.__find_contains_all(operation._get_other_as_sequence(), all_row_ids)
+            case (
+                ComparisonOperationType.GREATER_THAN
+                | ComparisonOperationType.GREATER_EQUAL
+                | ComparisonOperationType.LESS_THAN
+                | ComparisonOperationType.LESS_EQUAL
+            ):
+                return self.__find_in_range(operation._op, operation._other)
+            case _:
+                return None
+
+    def __find_equal(self, other: Any, all_row_ids: AbstractSet[int]) -> AbstractSet[int] | None:
+        return self.__find_in([other], all_row_ids)
+
+    def __find_in(self, others: Sequence[Any], all_row_ids: AbstractSet[int]) -> AbstractSet[int] | None:
+        if self.__has_list_values or not self.__are_hashable(others):
+            return None
+        if len(others) == 1 and others[0] is not None:
+            # read-only, callers combine candidate sets into new sets
+            return self.__row_ids_by_value.get(others[0], frozenset())
+        row_ids = set[int]().union(*(self.__row_ids_by_value.get(other, ()) for other in others))
+        if None in others:
+            row_ids |= all_row_ids - self.row_ids
+        return row_ids
+
+    def __find_contains(self, others: Sequence[Any]) -> AbstractSet[int] | None:
+        if self.__has_scalar_values or not self.__are_hashable(others):
+            return None
+        return set[int]().union(*(self.__row_ids_by_item.get(other, ()) for other in others))
+
+    def __find_contains_all(self, others: Sequence[Any], all_row_ids: AbstractSet[int]) -> AbstractSet[int] | None:
+        if self.__has_scalar_values or not self.__are_hashable(others):
+            return None
+        if not others:
+            return all_row_ids
+        row_ids_with_all = set[int](self.__row_ids_by_item.get(others[0], ())).intersection(
+            *(self.__row_ids_by_item.get(other, ()) for other in others[1:])
+        )
+        return row_ids_with_all | (all_row_ids - self.row_ids)
+
+    def __find_in_range(self, op: ComparisonOperationType, other: Any) -> AbstractSet[int] | None:
+        if self.__has_list_values or other is None or (sorted_index := self.__get_sorted_index()) is None:
+            return None
+        sorted_values, sorted_row_ids = sorted_index
+        if not self.__is_comparable(sorted_values, other):
+            return None
+        side = "right" if op in (ComparisonOperationType.GREATER_THAN, ComparisonOperationType.LESS_EQUAL) else "left"
+        position = int(np.searchsorted(sorted_values, other, side=side))
+        if op in (ComparisonOperationType.GREATER_THAN, ComparisonOperationType.GREATER_EQUAL):
+            return set(sorted_row_ids[position:].tolist())
+        return set(sorted_row_ids[:position].tolist())
+
+    def __get_sorted_index(self) -> tuple[np.ndarray, np.ndarray] | None:
+        sorted_index = self.__sorted_index
+        if sorted_index is None or sorted_index[0] != self.__version:
+            # the version is read first, so an index built while being updated is rebuilt on the next lookup
+            version = self.__version
+            try:
+                items = sorted(self.__value_by_row_id.items(), key=itemgetter(1))
+            except TypeError:
+                return None
+            sorted_index = (
+                version,
+                np.array([value for _, value in items]),
+                np.array([row_id for row_id, _ in items], dtype=np.int64),
+            )
+            self.__sorted_index = sorted_index
+        return sorted_index[1], sorted_index[2]
+
+    def __is_comparable(self, sorted_values: np.ndarray, other: Any) -> bool:
+        if sorted_values.dtype.kind in "biuf":
+            return isinstance(other, int | float)
+        if sorted_values.dtype.kind == "U":
+            return isinstance(other, str)
+        return False
+
+    def __complement(
+        self, row_ids: AbstractSet[int] | None, all_row_ids: AbstractSet[int]
+    ) -> AbstractSet[int] | None:
+        if row_ids is None:
+            return None
+        return all_row_ids - row_ids
+
+    def __add(self, row_ids_by_key: defaultdict[Hashable, set[int]], key: Any, row_id: int) -> None:
+        try:
+            row_ids_by_key[key].add(row_id)
+        except TypeError:
+            self.__has_unhashable_values = True
+
+    def __remove(self, row_id: int) -> None:
+        value = self.__value_by_row_id.pop(row_id, None)
+        if value is None:
+            return
+        self.__version += 1
+        if isinstance(value, list):
+            for item in value:
+                self.__discard(self.__row_ids_by_item, item, row_id)
+        else:
+            self.__discard(self.__row_ids_by_value, value, row_id)
+
+    def __discard(self, row_ids_by_key: defaultdict[Hashable, set[int]], key: Any, row_id: int) -> None:
+        try:
+            row_ids = row_ids_by_key.get(key)
+        except TypeError:
+            return
+        if row_ids is None:
+            return
+        row_ids.discard(row_id)
+        if not row_ids:
+            del row_ids_by_key[key]
+
+    def __are_hashable(self, values: Sequence[Any]) -> bool:
+        try:
+            for value in values:
+                hash(value)
+        except TypeError:
+            return False
+        return True
@@ -0,0 +1,31 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+from beartype.typing import Mapping
+
+from superlinked.framework.storage.in_memory.in_memory_partition_snapshot import (
+    InMemoryPartitionSnapshot,
+)
+
+
+@dataclass(frozen=True)
+class InMemoryGeneration:
+    """
+    The state of an `InMemoryVDB` published by a write batch: the snapshots of its partitions, by schema id.
+    """
+
+    number: int
+    partitions: Mapping[str, InMemoryPartitionSnapshot]
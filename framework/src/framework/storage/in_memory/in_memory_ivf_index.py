@@ -0,0 +1,155 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import numpy as np
+from beartype.typing import Callable
+
+from superlinked.framework.common.data_types import NPArray
+from superlinked.framework.storage.in_memory.in_memory_ivf_params import (
+    InMemoryIVFParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_ivf_training import (
+    InMemoryIVFTraining,
+)
+
+UNASSIGNED = -1
+RETRAINING_GROWTH_FACTOR = 2
+
+
+class InMemoryIVFIndex:
+    """
+    Inverted file index over the positions of an `InMemoryVectorStore`.
+    Vectors are partitioned by a spherical k-means coarse quantizer; a query only scores the vectors
+    of the `probe_count` closest lists. Training becomes due once the store reaches the training threshold,
+    and again whenever it doubles in size since: it is run by the owner of the store through `start_training`
+    and `finish_training`, off the write path. Until the first training is installed there are no lists and the
+    queries are searched exhaustively, afterwards the old lists keep serving them during a retraining.
+    New vectors are assigned to their closest list incrementally once the index is trained.
+    The store never overwrites a position, so a position is assigned once. The lists only ever get positions
+    appended, or are replaced as a whole together with their centroids, so they can be read while being written:
+    readers drop the positions their snapshot of the store does not contain.
+    """
+
+    def __init__(self, params: InMemoryIVFParams) -> None:
+        self.__params = params
+        # the centroids and the positions of their lists, replaced together
+        self.__lists: tuple[NPArray, list[list[int]]] | None = None
+        self.__assignments = np.empty(0, dtype=np.int64)
+        self.__trained_size = 0
+        self.__training: InMemoryIVFTraining | None = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.__lists is not None
+
+    def update(self, position: int, size: int, get_vectors: Callable[[slice | NPArray], NPArray]) -> None:
+        """
+        Index the vector written at the position, if the index is trained already.
+        `get_vectors` returns the stored vectors at the given positions.
+        """
+        if self.__lists is None:
+            return
+        centroids, positions_by_list = self.__lists
+        list_id = int(np.argmax(centroids @ get_vectors(slice(position, position + 1))[0]))
+        if position >= len(self.__assignments):
+            self.__assignments = self.__grow_assignments(self.__assignments, position + 1)
+        self.__assignments[position] = list_id
+        positions_by_list[list_id].append(position)
+
+    def is_training_due(self, size: int) -> bool:
+        if self.__training is not None:
+            return False
+        if self.__lists is None:
+            return size >= self.__params.training_threshold
+        return size >= self.__trained_size * RETRAINING_GROWTH_FACTOR
+
+    def start_training(self, size: int, get_vectors: Callable[[slice | NPArray], NPArray]) -> InMemoryIVFTraining:
+        """
+        Sample the first `size` stored vectors for a training. The returned training is run by the caller,
+        reading the stored vectors with `get_vectors`, which has to read a snapshot of the store.
+        """
+        self.__training = self.__create_training(size, get_vectors)
+        return self.__training
+
+    def finish_training(
+        self, training: InMemoryIVFTraining, size: int, get_vectors: Callable[[slice | NPArray], NPArray]
+    ) -> None:
+        """
+        Swap in the lists of the finished training, with the positions written while it was running assigned.
+        A training this index did not start, or no longer waits for, is ignored.
+        """
+        if training is not self.__training:
+            return
+        self.__training = None
+        self.__install(training, size, get_vectors)
+
+    def cancel_training(self, training: InMemoryIVFTraining) -> None:
+        if training is self.__training:
+            self.__training = None
+
+    def find_candidate_positions(self, vector: NPArray) -> NPArray | None:
+        if (lists := self.__lists) is None:
+            return None
+        centroids, positions_by_list = lists
+        probe_count = min(self.__params.probe_count, len(centroids))
+        probed_lists = np.argpartition(-(centroids @ vector), probe_count - 1)[:probe_count]
+        return np.sort(
+            np.concatenate([np.array(positions_by_list[list_id], dtype=np.int64) for list_id in probed_lists])
+        )
+
+    def compact(self, positions: NPArray) -> InMemoryIVFIndex:
+        """
+        Return a new index of the vectors at the positions, which the store moves to the front in this order.
+        """
+        ivf_index = InMemoryIVFIndex(self.__params)
+        if self.__lists is not None:
+            assignments = self.__grow_assignments(self.__assignments, int(positions.max(initial=-1)) + 1)[positions]
+            ivf_index.__assignments = assignments
+            ivf_index.__lists = (self.__lists[0], self.__build_lists(assignments, len(self.__lists[0])))
+            ivf_index.__trained_size = min(self.__trained_size, len(positions))
+        return ivf_index
+
+    def __create_training(
+        self, size: int, get_vectors: Callable[[slice | NPArray], NPArray]
+    ) -> InMemoryIVFTraining:
+        return InMemoryIVFTraining(self.__params.list_count or int(np.sqrt(size)), size, get_vectors)
+
+    def __install(
+        self, training: InMemoryIVFTraining, size: int, get_vectors: Callable[[slice | NPArray], NPArray]
+    ) -> None:
+        centroids = training.centroids
+        assignments = training.assignments
+        if size > training.size:
+            # written after the training was sampled
+            later_vectors = get_vectors(slice(training.size, size))
+            assignments = np.concatenate([assignments, np.argmax(later_vectors @ centroids.T, axis=1)])
+        self.__assignments = assignments.astype(np.int64)
+        self.__lists = (centroids, self.__build_lists(self.__assignments, len(centroids)))
+        self.__trained_size = training.size
+
+    def __grow_assignments(self, assignments: NPArray, required_size: int) -> NPArray:
+        if required_size <= len(assignments):
+            return assignments
+        grown_assignments = np.full(max(required_size, len(assignments) * 2), UNASSIGNED, dtype=np.int64)
+        grown_assignments[: len(assignments)] = assignments
+        return grown_assignments
+
+    def __build_lists(self, assignments: NPArray, list_count: int) -> list[list[int]]:
+        positions_by_list: list[list[int]] = [[] for _ in range(list_count)]
+        for position, list_id in enumerate(assignments.tolist()):
+            if list_id != UNASSIGNED:
+                positions_by_list[list_id].append(position)
+        return positions_by_list
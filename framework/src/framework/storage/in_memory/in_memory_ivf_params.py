@@ -0,0 +1,51 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+from superlinked.framework.common.exception import ValidationException
+
+
+@dataclass(frozen=True)
+class InMemoryIVFParams:
+    """
+    Parameters of the approximate (IVF) search of the in-memory vector database.
+
+    Attributes:
+        list_count (int | None): Number of inverted lists (k-means clusters) the vectors are partitioned into.
+            Defaults to None, which uses the square root of the number of stored vectors.
+        probe_count (int): Number of the closest lists scanned per query. Higher values increase recall
+            at the expense of latency. Defaults to 8.
+        training_threshold (int): Number of stored vectors the lists are first built from, at least `list_count`.
+            Once this size is reached the lists are trained in the background, searches are exact until they are
+            ready. The lists are retrained in the background whenever the number of stored vectors doubles.
+            Defaults to 10000.
+    """
+
+    list_count: int | None = None
+    probe_count: int = 8
+    training_threshold: int = 10000
+
+    def __post_init__(self) -> None:
+        if self.list_count is not None and self.list_count < 1:
+            raise ValidationException(f"IVF list_count must be positive, got {self.list_count}.")
+        if self.probe_count < 1:
+            raise ValidationException(f"IVF probe_count must be positive, got {self.probe_count}.")
+        if self.training_threshold < 1:
+            raise ValidationException(f"IVF training_threshold must be positive, got {self.training_threshold}.")
+        if self.list_count is not None and self.training_threshold < self.list_count:
+            raise ValidationException(
+                f"IVF training_threshold ({self.training_threshold}) must not be smaller "
+                f"than list_count ({self.list_count})."
+            )
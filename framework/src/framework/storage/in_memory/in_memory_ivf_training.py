@@ -0,0 +1,97 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+from beartype.typing import Callable
+
+from superlinked.framework.common.data_types import NPArray
+
+TRAINING_SAMPLE_SIZE_PER_LIST = 256
+KMEANS_ITERATION_COUNT = 10
+ASSIGNMENT_CHUNK_SIZE = 65536
+RANDOM_SEED = 0
+
+
+class InMemoryIVFTraining:
+    """
+    Training of the lists of an `InMemoryIVFIndex` over the first `size` positions of a vector store.
+    The spherical k-means centroids are trained on a copied sample, then the stored vectors are assigned
+    to them one chunk at a time. `get_vectors` returns the stored vectors at the given positions: it has to read
+    a snapshot of the store, as the training runs while the store is written.
+    """
+
+    def __init__(self, list_count: int, size: int, get_vectors: Callable[[slice | NPArray], NPArray]) -> None:
+        self.__list_count = min(list_count, size)
+        self.__size = size
+        self.__get_vectors = get_vectors
+        rng = np.random.default_rng(RANDOM_SEED)
+        sample_size = min(size, self.__list_count * TRAINING_SAMPLE_SIZE_PER_LIST)
+        sample = get_vectors(np.sort(rng.choice(size, sample_size, replace=False)))
+        self.__sample: NPArray | None = sample
+        self.__initial_centroids = sample[rng.choice(sample_size, self.__list_count, replace=False)].copy()
+        self.__centroids: NPArray | None = None
+        self.__assignment_chunks: list[NPArray] = []
+        self.__assigned_size = 0
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def centroids(self) -> NPArray:
+        if self.__centroids is None:
+            raise ValueError("IVF centroids are not trained yet.")
+        return self.__centroids
+
+    @property
+    def is_assigned(self) -> bool:
+        return self.__assigned_size == self.__size
+
+    @property
+    def assignments(self) -> NPArray:
+        if not self.is_assigned:
+            raise ValueError("IVF assignments are not complete yet.")
+        return np.concatenate(self.__assignment_chunks) if self.__assignment_chunks else np.empty(0, dtype=np.int64)
+
+    def train(self) -> None:
+        """
+        Train the centroids on the sample. Does not read the vector store.
+        """
+        if self.__sample is None:
+            return
+        sample = self.__sample
+        centroids = self.__initial_centroids
+        for _ in range(KMEANS_ITERATION_COUNT):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            non_empty = norms > 0
+            centroids[non_empty] = sums[non_empty] / norms[non_empty, None]
+        self.__centroids = centroids
+        self.__sample = None
+
+    def assign_chunk(self) -> None:
+        """
+        Assign the next chunk of the stored vectors to their closest centroid.
+        """
+        stop = min(self.__assigned_size + ASSIGNMENT_CHUNK_SIZE, self.__size)
+        vectors = self.__get_vectors(slice(self.__assigned_size, stop))
+        self.__assignment_chunks.append(np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int64))
+        self.__assigned_size = stop
+
+    def run(self) -> None:
+        self.train()
+        while not self.is_assigned:
+            self.assign_chunk()
@@ -0,0 +1,202 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import defaultdict
+
+import numpy as np
+from beartype.typing import Any, Mapping, Sequence
+
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.storage.in_memory.in_memory_field_index import (
+    InMemoryFieldIndex,
+)
+from superlinked.framework.storage.in_memory.in_memory_partition_data import (
+    InMemoryPartitionData,
+    InMemoryVectorBlock,
+)
+from superlinked.framework.storage.in_memory.in_memory_partition_snapshot import (
+    InMemoryPartitionSnapshot,
+)
+from superlinked.framework.storage.in_memory.in_memory_rows import InMemoryRows
+from superlinked.framework.storage.in_memory.in_memory_vector_store import (
+    InMemoryVectorStore,
+)
+
+
+class InMemoryPartition:
+    """
+    The rows of a single schema in the in-memory vector database.
+    Object ids are interned to dense integer row numbers, which address the rows,
+    the field indices and the vector stores of the partition. Searches only touch the partition
+    of the searched schema, so their cost does not grow with the data of other schemas.
+    The vectors of the indexed vector fields are only kept in the vector stores, not in the rows.
+    It is read through snapshots taken of it after every write batch (generation), which the later writes
+    leave unchanged: the rows are replaced, not changed, the replaced ones are kept in undo logs while needed,
+    and the vector stores only append. Only a single thread may write the partition at a time.
+    """
+
+    def __init__(
+        self,
+        schema_id: str,
+        field_indices: Mapping[str, InMemoryFieldIndex],
+        vector_stores: Mapping[str, InMemoryVectorStore],
+    ) -> None:
+        self.__schema_id = schema_id
+        self.__field_indices = field_indices
+        self.__vector_stores = vector_stores
+        self.__rows = InMemoryRows()
+        # loaded, but not yet indexed vectors
+        self.__vector_blocks: list[InMemoryVectorBlock] = []
+
+    @property
+    def schema_id(self) -> str:
+        return self.__schema_id
+
+    @property
+    def size(self) -> int:
+        return self.__rows.size
+
+    @property
+    def vector_stores(self) -> Sequence[InMemoryVectorStore]:
+        return list(self.__vector_stores.values())
+
+    def validate(self, values: Mapping[str, Any]) -> None:
+        """
+        Raise a `ValidationException` if the values cannot be written, without changing the partition.
+        """
+        for field_name, value in values.items():
+            if vector_store := self.__vector_stores.get(field_name):
+                vector_store.validate(value)
+
+    def write(self, object_id: str, values: Mapping[str, Any], generation: int) -> None:
+        """
+        Write the values as part of the generation, which the snapshots taken of earlier generations do not see.
+        """
+        self.validate(values)
+        row_number = self.__rows.intern(object_id, generation)
+        row = dict(self.__rows.get(row_number))
+        for field_name, value in values.items():
+            if field_index := self.__field_indices.get(field_name):
+                field_index.update(row_number, value)
+            if vector_store := self.__vector_stores.get(field_name):
+                vector_store.upsert(row_number, value)
+                row.pop(field_name, None)
+            else:
+                row[field_name] = value
+        self.__rows.replace(row_number, row)
+
+    def snapshot(self, generation: int) -> InMemoryPartitionSnapshot:
+        """
+        Return the snapshot of the partition as of the generation, which has to be the last one written.
+        """
+        return InMemoryPartitionSnapshot(
+            self.schema_id,
+            generation,
+            self.size,
+            self.__rows,
+            self.__field_indices,
+            {field_name: vector_store.snapshot() for field_name, vector_store in self.__vector_stores.items()},
+        )
+
+    def release(self, generation: int) -> None:
+        """
+        Release what only the snapshots of the earlier generations than the given one need.
+        """
+        self.__rows.release(generation)
+
+    def load(self, object_id: str, values: Mapping[str, Any]) -> int:
+        """
+        Write the values without indexing them, to be followed by a `reindex`. Returns the row number.
+        """
+        row_number = self.__rows.intern(object_id)
+        self.__rows.replace(row_number, {**self.__rows.get(row_number), **values})
+        return row_number
+
+    def load_data(self, data: InMemoryPartitionData) -> None:
+        """
+        Load the persisted data without indexing it, to be followed by a `reindex`.
+        The vector blocks are kept as they are until the reindexing hands them to the vector stores.
+        """
+        is_empty = not self.size
+        row_numbers = np.fromiter(
+            (self.load(object_id, values) for object_id, values in zip(data.object_ids, data.rows)),
+            dtype=np.int64,
+            count=len(data.object_ids),
+        )
+        self.__vector_blocks.extend(
+            (
+                vector_block
+                if is_empty
+                else InMemoryVectorBlock(
+                    vector_block.field_name, row_numbers[vector_block.row_numbers], vector_block.vectors
+                )
+            )
+            for vector_block in data.vector_blocks
+        )
+
+    def reindex(
+        self,
+        field_indices: Mapping[str, InMemoryFieldIndex],
+        vector_stores: Mapping[str, InMemoryVectorStore],
+    ) -> None:
+        """
+        Replace the field indices and the vector stores with the given empty ones and fill them
+        from the vectors of the replaced stores, the loaded vector blocks and the rows, in this order.
+        Only a partition no snapshot was taken of yet may be reindexed.
+        """
+        self.__vector_blocks[:0] = [
+            InMemoryVectorBlock(field_name, *vector_store.snapshot().export_vectors())
+            for field_name, vector_store in self.__vector_stores.items()
+            if vector_store.size
+        ]
+        self.close()
+        self.__field_indices = field_indices
+        self.__vector_stores = vector_stores
+        self.__index_vector_blocks()
+        for row_number in range(self.size):
+            row = self.__rows.get(row_number)
+            for field_name, value in row.items():
+                if field_index := self.__field_indices.get(field_name):
+                    field_index.update(row_number, value)
+                if vector_store := self.__vector_stores.get(field_name):
+                    vector_store.upsert(row_number, value)
+            if any(field_name in self.__vector_stores for field_name in row):
+                self.__rows.replace(
+                    row_number,
+                    {field_name: value for field_name, value in row.items() if field_name not in self.__vector_stores},
+                )
+
+    def close(self) -> None:
+        for vector_store in self.__vector_stores.values():
+            vector_store.close()
+
+    def __index_vector_blocks(self) -> None:
+        vector_blocks_by_field_name = defaultdict[str, list[InMemoryVectorBlock]](list)
+        for vector_block in self.__vector_blocks:
+            vector_blocks_by_field_name[vector_block.field_name].append(vector_block)
+        self.__vector_blocks = []
+        for field_name, vector_blocks in vector_blocks_by_field_name.items():
+            vector_store = self.__vector_stores.get(field_name)
+            if vector_store is None:
+                # not indexed anymore, the vectors move to the rows, unless a later block or the row overrides them
+                for vector_block in reversed(vector_blocks):
+                    for row_number, vector in zip(vector_block.row_numbers.tolist(), vector_block.vectors):
+                        if field_name not in (row := self.__rows.get(row_number)):
+                            self.__rows.replace(row_number, {**row, field_name: Vector(vector)})
+            elif len(vector_blocks) == 1:
+                vector_store.load(vector_blocks[0].row_numbers, vector_blocks[0].vectors)
+            else:
+                for vector_block in vector_blocks:
+                    for row_number, vector in zip(vector_block.row_numbers.tolist(), vector_block.vectors):
+                        vector_store.upsert(row_number, Vector(vector))
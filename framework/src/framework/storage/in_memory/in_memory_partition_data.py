@@ -0,0 +1,43 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+from beartype.typing import Any, Mapping, Sequence
+
+from superlinked.framework.common.data_types import NPArray
+
+
+@dataclass(frozen=True)
+class InMemoryVectorBlock:
+    """
+    The vectors of a field of a partition, as a matrix with the row numbers of its rows.
+    """
+
+    field_name: str
+    row_numbers: NPArray
+    vectors: NPArray
+
+
+@dataclass(frozen=True)
+class InMemoryPartitionData:
+    """
+    The content of an `InMemoryPartition`, as persisted.
+    Row numbers index `object_ids` and `rows`. The rows do not contain the values kept in the vector blocks.
+    """
+
+    schema_id: str
+    object_ids: Sequence[str]
+    rows: Sequence[Mapping[str, Any]]
+    vector_blocks: Sequence[InMemoryVectorBlock]
@@ -0,0 +1,124 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from beartype.typing import AbstractSet, Any, Mapping, Sequence, cast
+
+from superlinked.framework.common.interface.comparison_operand import (
+    ComparisonOperation,
+)
+from superlinked.framework.common.storage.field.field import Field
+from superlinked.framework.storage.in_memory.in_memory_field_index import (
+    InMemoryFieldIndex,
+)
+from superlinked.framework.storage.in_memory.in_memory_partition_data import (
+    InMemoryPartitionData,
+    InMemoryVectorBlock,
+)
+from superlinked.framework.storage.in_memory.in_memory_row import InMemoryRow
+from superlinked.framework.storage.in_memory.in_memory_rows import InMemoryRows
+from superlinked.framework.storage.in_memory.in_memory_vector_store_snapshot import (
+    InMemoryVectorStoreSnapshot,
+)
+
+
+class InMemoryPartitionSnapshot:
+    """
+    An `InMemoryPartition` as of a generation, unaffected by the writes of the later generations.
+    The rows and the field indices are shared with the partition: the rows replaced since are read from
+    the undo logs, and the lookups of the field indices are corrected for the rows changed since.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        schema_id: str,
+        generation: int,
+        size: int,
+        rows: InMemoryRows,
+        field_indices: Mapping[str, InMemoryFieldIndex],
+        vector_stores: Mapping[str, InMemoryVectorStoreSnapshot],
+    ) -> None:
+        self.__schema_id = schema_id
+        self.__generation = generation
+        self.__size = size
+        self.__rows = rows
+        self.__field_indices = field_indices
+        self.__vector_stores = vector_stores
+
+    @property
+    def schema_id(self) -> str:
+        return self.__schema_id
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def object_ids(self) -> Sequence[str]:
+        """
+        The object ids by row number, of which only the first `size` belong to the snapshot.
+        """
+        return self.__rows.object_ids
+
+    def get_row(self, object_id: str) -> Mapping[str, Any]:
+        row_number = self.__rows.get_row_number(object_id)
+        return {} if row_number is None or row_number >= self.size else self.get_row_by_number(row_number)
+
+    def get_row_by_number(self, row_number: int) -> Mapping[str, Any]:
+        return InMemoryRow(self.__rows.get(row_number, self.__generation), row_number, self.__vector_stores)
+
+    def get_rows(self) -> Sequence[Mapping[str, Any]]:
+        return [
+            InMemoryRow(row, row_number, self.__vector_stores)
+            for row_number, row in enumerate(self.__rows.export(self.__generation, self.size))
+        ]
+
+    def get_vector_store(self, field_name: str) -> InMemoryVectorStoreSnapshot:
+        return self.__vector_stores[field_name]
+
+    def find_row_numbers(self, operation: ComparisonOperation[Field]) -> AbstractSet[int] | None:
+        """
+        Return the row numbers matching the operation using the field index of its field,
+        or None if the field is not indexed or the index cannot answer the operation.
+        """
+        field_name = cast(Field, operation._operand).name
+        if (field_index := self.__field_indices.get(field_name)) is None:
+            return None
+        row_numbers = field_index.find_row_ids(operation, self.__rows.row_numbers)
+        if row_numbers is None:
+            return None
+        # collected after the lookup, as rows are logged as changed before the index is updated
+        changed_row_numbers = self.__rows.get_changed_row_numbers(self.__generation)
+        return (row_numbers - changed_row_numbers) | {
+            row_number
+            for row_number in changed_row_numbers
+            if row_number < self.size
+            and operation.evaluate(self.__rows.get(row_number, self.__generation).get(field_name))
+        }
+
+    def export_data(self) -> InMemoryPartitionData:
+        """
+        Return a copy of the content of the snapshot.
+        Only the lists of the rows and the matrices of the vector stores are copied, at memory bandwidth:
+        the rows themselves are replaced instead of being changed.
+        """
+        return InMemoryPartitionData(
+            self.schema_id,
+            list(self.object_ids[: self.size]),
+            self.__rows.export(self.__generation, self.size),
+            [
+                InMemoryVectorBlock(field_name, *vector_store.export_vectors())
+                for field_name, vector_store in self.__vector_stores.items()
+                if vector_store.size
+            ],
+        )
@@ -0,0 +1,49 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+from superlinked.framework.common.exception import ValidationException
+from superlinked.framework.storage.in_memory.in_memory_vector_precision import (
+    InMemoryVectorPrecision,
+)
+
+
+@dataclass(frozen=True)
+class InMemoryQuantizationParams:
+    """
+    Parameters of the scalar-quantized vector storage of the in-memory vector database.
+
+    Attributes:
+        precision (InMemoryVectorPrecision): Component type of the scored vector matrix. INT8 quantizes every
+            dimension to 255 levels using a per-dimension scale and offset, its matrix is 8x smaller than float64
+            and scores faster. FLOAT16 is more accurate, but its scoring is slower as numpy widens half
+            precision floats without SIMD support. Defaults to INT8.
+        rescore_factor (int): The top `limit * rescore_factor` candidates of the quantized scoring are rescored
+            with the full precision vectors. 0 disables rescoring. Defaults to 4.
+        keep_full_precision (bool): Whether to keep the full precision vectors next to the quantized matrix,
+            for rescoring and for reading and persisting the exact vectors. Without them, only the quantized
+            matrix is kept, so the vectors take 4x (FLOAT16) or 8x (INT8) less memory than float64,
+            but they are read and persisted dequantized and cannot be rescored. Defaults to True.
+    """
+
+    precision: InMemoryVectorPrecision = InMemoryVectorPrecision.INT8
+    rescore_factor: int = 4
+    keep_full_precision: bool = True
+
+    def __post_init__(self) -> None:
+        if self.rescore_factor < 0:
+            raise ValidationException(f"rescore_factor must not be negative, got {self.rescore_factor}.")
+        if self.rescore_factor and not self.keep_full_precision:
+            raise ValidationException("Rescoring needs the full precision vectors, set rescore_factor to 0.")
@@ -0,0 +1,51 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from beartype.typing import Any, Iterator, Mapping
+
+from superlinked.framework.storage.in_memory.in_memory_vector_store_snapshot import (
+    InMemoryVectorStoreSnapshot,
+)
+
+
+class InMemoryRow(Mapping[str, Any]):
+    """
+    A row of an `InMemoryPartitionSnapshot`.
+    The vectors of the indexed vector fields are not kept in the row, they are read from the vector stores on access.
+    """
+
+    def __init__(
+        self, values: Mapping[str, Any], row_number: int, vector_stores: Mapping[str, InMemoryVectorStoreSnapshot]
+    ) -> None:
+        self.__values = values
+        self.__row_number = row_number
+        self.__vector_stores = vector_stores
+
+    def __getitem__(self, key: str) -> Any:
+        if (vector_store := self.__vector_stores.get(key)) and (
+            vector := vector_store.get_vector(self.__row_number)
+        ) is not None:
+            return vector
+        return self.__values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.__values
+        yield from (
+            field_name
+            for field_name, vector_store in self.__vector_stores.items()
+            if field_name not in self.__values and vector_store.contains(self.__row_number)
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -0,0 +1,121 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from beartype.typing import AbstractSet, Any, Mapping, Sequence
+
+
+class InMemoryRows:
+    """
+    The rows of an `InMemoryPartition` and their object ids, interned to dense integer row numbers.
+    Rows are never changed in place but replaced, and can be read as of an earlier generation while being written:
+    a write logs the rows it is about to replace (or add) in the undo log of its generation first,
+    and the logs are kept until no reader of an earlier generation is left to read them.
+    Only a single thread may write the rows at a time.
+    """
+
+    def __init__(self) -> None:
+        self.__rows: list[Mapping[str, Any]] = []
+        self.__object_ids: list[str] = []
+        self.__row_number_by_object_id: dict[str, int] = {}
+        self.__row_numbers: set[int] = set()
+        # the generations written since the oldest one still read, with the rows they replaced (None if they added it)
+        self.__undo_logs: list[tuple[int, dict[int, Mapping[str, Any] | None]]] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.__rows)
+
+    @property
+    def object_ids(self) -> Sequence[str]:
+        return self.__object_ids
+
+    @property
+    def row_numbers(self) -> AbstractSet[int]:
+        return self.__row_numbers
+
+    def get_row_number(self, object_id: str) -> int | None:
+        return self.__row_number_by_object_id.get(object_id)
+
+    def get(self, row_number: int, generation: int | None = None) -> Mapping[str, Any]:
+        """
+        Return the row as of the generation, or the current row if None.
+        """
+        # read before the undo logs, which get the row before it is replaced
+        row = self.__rows[row_number]
+        if generation is not None:
+            for log_generation, replaced_rows in self.__undo_logs:
+                if log_generation > generation and row_number in replaced_rows:
+                    return replaced_rows[row_number] or {}
+        return row
+
+    def export(self, generation: int, size: int) -> list[Mapping[str, Any]]:
+        """
+        Return a copy of the list of the first `size` rows as of the generation.
+        """
+        rows = self.__rows[:size]
+        # the oldest replaced row wins, the rows added since are beyond the size
+        for log_generation, replaced_rows in reversed(self.__undo_logs):
+            if log_generation > generation:
+                for row_number, row in list(replaced_rows.items()):
+                    if row is not None and row_number < size:
+                        rows[row_number] = row
+        return rows
+
+    def get_changed_row_numbers(self, generation: int) -> AbstractSet[int]:
+        """
+        Return the row numbers of the rows written (or being written) since the generation.
+        """
+        return set[int]().union(
+            *(
+                replaced_rows.keys()
+                for log_generation, replaced_rows in self.__undo_logs
+                if log_generation > generation
+            )
+        )
+
+    def intern(self, object_id: str, generation: int | None = None) -> int:
+        """
+        Return the row number of the object id, adding an empty row for a new one.
+        If a generation is given, the row is logged as written by it before anything else changes.
+        """
+        row_number = self.__row_number_by_object_id.get(object_id)
+        if generation is not None:
+            self.__log(
+                len(self.__rows) if row_number is None else row_number,
+                None if row_number is None else self.__rows[row_number],
+                generation,
+            )
+        if row_number is None:
+            row_number = len(self.__rows)
+            self.__rows.append({})
+            self.__object_ids.append(object_id)
+            self.__row_number_by_object_id[object_id] = row_number
+            self.__row_numbers.add(row_number)
+        return row_number
+
+    def replace(self, row_number: int, row: Mapping[str, Any]) -> None:
+        self.__rows[row_number] = row
+
+    def release(self, generation: int) -> None:
+        """
+        Drop the undo logs not needed by the readers of the generation and the later ones.
+        """
+        if self.__undo_logs and self.__undo_logs[0][0] <= generation:
+            self.__undo_logs = [undo_log for undo_log in self.__undo_logs if undo_log[0] > generation]
+
+    def __log(self, row_number: int, row: Mapping[str, Any] | None, generation: int) -> None:
+        if not self.__undo_logs or self.__undo_logs[-1][0] != generation:
+            self.__undo_logs.append((generation, {}))
+        # the row as of before the generation, it may be written more than once by a generation
+        self.__undo_logs[-1][1].setdefault(row_number, row)
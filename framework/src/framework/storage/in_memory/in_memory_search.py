@@ -14,18 +14,18 @@
 
 from collections import defaultdict
 
-from beartype.typing import Any, Sequence, cast
+import numpy as np
+from beartype.typing import AbstractSet, Any, Iterable, Mapping, Sequence, cast
 
 from superlinked.framework.common.calculation.distance_metric import DistanceMetric
 from superlinked.framework.common.calculation.vector_similarity import (
     VectorSimilarityCalculator,
 )
-from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.data_types import NPArray, Vector
 from superlinked.framework.common.interface.comparison_operand import (
     ComparisonOperation,
 )
 from superlinked.framework.common.storage.field.field import Field
-from superlinked.framework.common.storage.field.field_data import VectorFieldData
 from superlinked.framework.common.storage.index_config import IndexConfig
 from superlinked.framework.common.storage.query.vdb_knn_search_params import (
     VDBKNNSearchParams,
@@ -33,110 +33,344 @@ from superlinked.framework.common.storage.query.vdb_knn_search_params import (
 from superlinked.framework.common.storage.search import Search
 from superlinked.framework.storage.in_memory.exception import (
     VectorFieldDimensionException,
-    VectorFieldTypeException,
+)
+from superlinked.framework.storage.in_memory.in_memory_partition_snapshot import (
+    InMemoryPartitionSnapshot,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_store_snapshot import (
+    InMemoryVectorStoreSnapshot,
 )
 
 # This is associated with the DEFAULT_LIMIT from superlinked.framework.common.const
 UNLIMITED_SEARCH_RESULTS = -1
+# upper bound of the rows x queries similarity matrix computed at once during batched search
+MAX_SIMILARITY_MATRIX_SIZE = 1 << 24
 
 
 class InMemorySearch:
     def search(
         self,
-        vdb: defaultdict[str, dict[str, Any]],
+        partition: InMemoryPartitionSnapshot,
         filters: Sequence[ComparisonOperation[Field]],
         has_fields: Sequence[Field],
-    ) -> Sequence[str]:
-        return [row_id for row_id, values in vdb.items() if InMemorySearch._is_subset(values, filters, has_fields)]
+    ) -> Sequence[int]:
+        candidate_row_numbers, residual_filters = self._resolve_indexed_filters(partition, filters)
+        row_numbers = range(partition.size) if candidate_row_numbers is None else sorted(candidate_row_numbers)
+        return [
+            row_number
+            for row_number in row_numbers
+            if InMemorySearch._is_subset(partition.get_row_by_number(row_number), residual_filters, has_fields)
+        ]
 
     def knn_search(
         self,
         index_config: IndexConfig,
-        vdb: defaultdict[str, dict[str, Any]],
+        partition: InMemoryPartitionSnapshot | None,
         search_params: VDBKNNSearchParams,
-    ) -> Sequence[tuple[str, float]]:
+    ) -> Sequence[tuple[int, float]]:
+        """
+        Search the partition of the searched schema, returning the row numbers and similarities of the hits.
+        """
         Search.check_vector_field(index_config, search_params.vector_field)
         Search.check_filters(index_config, search_params.filters)
-        filtered_vectors = self._filter_indexed_vectors(
-            vdb,
-            search_params.vector_field,
-            search_params.filters,
+        vector = cast(Vector, search_params.vector_field.value)
+        self._validate_vector_dimension(index_config, vector)
+        if partition is None:
+            return []
+        vector_store = partition.get_vector_store(search_params.vector_field.name)
+        positions = self._filter_positions(partition, vector_store, search_params.filters)
+        positions = self._narrow_positions_to_candidates(positions, vector_store.find_candidate_positions(vector))
+        distance_metric = index_config.vector_field_descriptor.distance_metric
+        return self._search_exhaustively(distance_metric, vector_store, positions, [search_params])[0]
+
+    def knn_search_batch(
+        self,
+        index_config: IndexConfig,
+        partition: InMemoryPartitionSnapshot | None,
+        search_params_list: Sequence[VDBKNNSearchParams],
+    ) -> Sequence[Sequence[tuple[int, float]]]:
+        """
+        Search with many vectors at once. Filters are resolved once per distinct filter set,
+        and the queries scoring every filtered row are scored together with a single matrix-matrix product.
+        """
+        for search_params in search_params_list:
+            Search.check_vector_field(index_config, search_params.vector_field)
+            Search.check_filters(index_config, search_params.filters)
+            self._validate_vector_dimension(index_config, cast(Vector, search_params.vector_field.value))
+        results: list[Sequence[tuple[int, float]]] = [[] for _ in search_params_list]
+        if partition is None:
+            return results
+        distance_metric = index_config.vector_field_descriptor.distance_metric
+        vector_store = partition.get_vector_store(index_config.vector_field_descriptor.field_name)
+        for query_indices in self._group_query_indices_by_filters(search_params_list):
+            positions = self._filter_positions(partition, vector_store, search_params_list[query_indices[0]].filters)
+            exhaustive_query_indices = []
+            for query_index in query_indices:
+                vector = cast(Vector, search_params_list[query_index].vector_field.value)
+                candidate_positions = vector_store.find_candidate_positions(vector)
+                if candidate_positions is None:
+                    exhaustive_query_indices.append(query_index)
+                    continue
+                narrowed_positions = self._narrow_positions_to_candidates(positions, candidate_positions)
+                results[query_index] = self._search_exhaustively(
+                    distance_metric, vector_store, narrowed_positions, [search_params_list[query_index]]
+                )[0]
+            for query_index, result in zip(
+                exhaustive_query_indices,
+                self._search_exhaustively(
+                    distance_metric,
+                    vector_store,
+                    positions,
+                    [search_params_list[query_index] for query_index in exhaustive_query_indices],
+                ),
+            ):
+                results[query_index] = result
+        return results
+
+    def _group_query_indices_by_filters(self, search_params_list: Sequence[VDBKNNSearchParams]) -> list[list[int]]:
+        query_indices_by_filters = defaultdict[tuple[int, ...], list[int]](list)
+        for query_index, search_params in enumerate(search_params_list):
+            # filters have no value equality, queries share filters by sharing the filter objects
+            query_indices_by_filters[tuple(id(filter_) for filter_ in search_params.filters or [])].append(query_index)
+        return list(query_indices_by_filters.values())
+
+    def _search_exhaustively(
+        self,
+        distance_metric: DistanceMetric,
+        vector_store: InMemoryVectorStoreSnapshot,
+        positions: NPArray | None,
+        search_params_list: Sequence[VDBKNNSearchParams],
+    ) -> list[Sequence[tuple[int, float]]]:
+        if not search_params_list:
+            return []
+        vectors = np.stack(
+            [cast(Vector, search_params.vector_field.value).value for search_params in search_params_list]
         )
-        similarities = self._calculate_similarities(
-            index_config.vector_field_descriptor.distance_metric,
-            search_params.vector_field.value,
-            filtered_vectors,
+        row_count = vector_store.size if positions is None else len(positions)
+        chunk_size = max(1, MAX_SIMILARITY_MATRIX_SIZE // max(row_count, 1))
+        results: list[Sequence[tuple[int, float]]] = []
+        for start in range(0, len(search_params_list), chunk_size):
+            chunk_vectors = vectors[start : start + chunk_size]
+            chunk_search_params_list = search_params_list[start : start + chunk_size]
+            sharded_candidates = self._find_sharded_candidates(
+                distance_metric, vector_store, chunk_vectors, positions, chunk_search_params_list
+            )
+            if sharded_candidates is not None:
+                results.extend(
+                    self._select_top_results(
+                        distance_metric, vector_store, candidate_positions, similarities, search_params
+                    )
+                    for (candidate_positions, similarities), search_params in zip(
+                        sharded_candidates, chunk_search_params_list
+                    )
+                )
+                continue
+            similarity_matrix = self._calculate_similarities(distance_metric, vector_store, chunk_vectors, positions)
+            results.extend(
+                self._select_top_results(
+                    distance_metric, vector_store, positions, similarity_matrix[:, column], search_params
+                )
+                for column, search_params in enumerate(chunk_search_params_list)
+            )
+        return results
+
+    def _find_sharded_candidates(
+        self,
+        distance_metric: DistanceMetric,
+        vector_store: InMemoryVectorStoreSnapshot,
+        vectors: NPArray,
+        positions: NPArray | None,
+        search_params_list: Sequence[VDBKNNSearchParams],
+    ) -> list[tuple[NPArray, NPArray]] | None:
+        """
+        Preselect the candidates of every search shard by shard, if the vector store is sharded.
+        The candidates of a shard are the ones `_select_top_results` could select from the shard.
+        """
+        quantization_params = vector_store.quantization_params
+        rescore_factor = quantization_params.rescore_factor if quantization_params else 0
+        candidate_counts: list[int | None] = []
+        min_similarities: list[float | None] = []
+        for search_params in search_params_list:
+            is_unlimited = search_params.limit == UNLIMITED_SEARCH_RESULTS
+            candidate_counts.append(None if is_unlimited else search_params.limit * max(rescore_factor, 1))
+            # a limited rescored search applies the radius to the rescored similarities only
+            is_radius_applicable = bool(search_params.radius) and (is_unlimited or not rescore_factor)
+            min_similarities.append(1 - cast(float, search_params.radius) if is_radius_applicable else None)
+        return vector_store.find_top_candidates(
+            VectorSimilarityCalculator(distance_metric), vectors, positions, candidate_counts, min_similarities
         )
-        sorted_similarities = self._sort_similarities(
+
+    def _select_top_results(
+        self,
+        distance_metric: DistanceMetric,
+        vector_store: InMemoryVectorStoreSnapshot,
+        positions: NPArray | None,
+        similarities: NPArray,
+        search_params: VDBKNNSearchParams,
+    ) -> Sequence[tuple[int, float]]:
+        quantization_params = vector_store.quantization_params
+        if quantization_params and quantization_params.rescore_factor:
+            positions, similarities = self._rescore_candidates(
+                distance_metric,
+                vector_store,
+                positions,
+                similarities,
+                search_params,
+                quantization_params.rescore_factor,
+            )
+        top_indices = self._select_top_indices(
             similarities,
             search_params.radius,
+            search_params.limit,
+            vector_store.superseded_positions if positions is None else None,
         )
-        return (
-            sorted_similarities[: search_params.limit]
-            if search_params.limit != UNLIMITED_SEARCH_RESULTS
-            else sorted_similarities
+        top_positions = top_indices if positions is None else positions[top_indices]
+        return list(
+            zip(vector_store.row_numbers[top_positions].tolist(), similarities[top_indices].tolist())
         )
 
-    def _filter_indexed_vectors(
+    def _rescore_candidates(
         self,
-        vdb: dict[str, dict[str, Any]],
-        vector_field: VectorFieldData,
-        filters: Sequence[ComparisonOperation[Field]] | None,
-    ) -> dict[str, Vector]:
-        filtered_unchecked_vectors = {
-            row_id: values[vector_field.name]
-            for row_id, values in vdb.items()
-            if InMemorySearch._is_subset(values, filters or []) and values.get(vector_field.name) is not None
-        }
-        filtered_vectors = self._validate_filtered_vectors(
-            filtered_unchecked_vectors,
-            cast(Vector, vector_field.value),
+        distance_metric: DistanceMetric,
+        vector_store: InMemoryVectorStoreSnapshot,
+        positions: NPArray | None,
+        similarities: NPArray,
+        search_params: VDBKNNSearchParams,
+        rescore_factor: int,
+    ) -> tuple[NPArray, NPArray]:
+        """
+        Select the best candidates by their quantized similarities and rescore them with the full precision
+        vectors of the vector store. Returns the candidate positions in ascending order and their exact similarities.
+        """
+        is_unlimited = search_params.limit == UNLIMITED_SEARCH_RESULTS
+        candidate_indices = self._select_top_indices(
+            similarities,
+            search_params.radius if is_unlimited else None,
+            UNLIMITED_SEARCH_RESULTS if is_unlimited else search_params.limit * rescore_factor,
+            vector_store.superseded_positions if positions is None else None,
+        )
+        candidate_positions = np.sort(candidate_indices if positions is None else positions[candidate_indices])
+        if not candidate_positions.size:
+            return candidate_positions, np.empty(0)
+        vectors = vector_store.get_full_precision_vectors(candidate_positions)
+        query_vector = cast(Vector, search_params.vector_field.value)
+        return candidate_positions, VectorSimilarityCalculator(distance_metric).calculate_similarities_np(
+            vectors, query_vector.value
         )
-        return filtered_vectors
-
-    def _validate_filtered_vectors(
-        self, filtered_unchecked_vectors: dict[str, Any], vector: Vector
-    ) -> dict[str, Vector]:
-        if wrong_types := {
-            type(value) for value in filtered_unchecked_vectors.values() if not isinstance(value, Vector)
-        }:
-            raise VectorFieldTypeException(f"Indexed vector field contains non-vectors: {wrong_types}")
-        if wrong_dimensions := {
-            value.dimension for value in filtered_unchecked_vectors.values() if value.dimension != vector.dimension
-        }:
+
+    def _filter_positions(
+        self,
+        partition: InMemoryPartitionSnapshot,
+        vector_store: InMemoryVectorStoreSnapshot,
+        filters: Sequence[ComparisonOperation[Field]] | None,
+    ) -> NPArray | None:
+        """
+        Return the positions of the vectors of the rows matching the filters, or None if all rows match.
+        """
+        if not filters:
+            return None
+        candidate_row_numbers, residual_filters = self._resolve_indexed_filters(partition, filters)
+        if not residual_filters and (candidate_row_numbers is None or len(candidate_row_numbers) == partition.size):
+            # typically the schema filter alone, which every row of the partition matches
+            return None
+        row_numbers: Iterable[int] = range(partition.size) if candidate_row_numbers is None else candidate_row_numbers
+        if residual_filters:
+            row_numbers = [
+                row_number
+                for row_number in row_numbers
+                if InMemorySearch._is_subset(partition.get_row_by_number(row_number), residual_filters)
+            ]
+        return np.sort(vector_store.get_positions(row_numbers))
+
+    def _narrow_positions_to_candidates(
+        self,
+        positions: NPArray | None,
+        candidate_positions: NPArray | None,
+    ) -> NPArray | None:
+        if candidate_positions is None:
+            return positions
+        if positions is None:
+            return candidate_positions
+        # a selective filter is cheaper and more accurate to score exhaustively
+        if len(positions) <= len(candidate_positions):
+            return positions
+        return np.intersect1d(positions, candidate_positions, assume_unique=True)
+
+    def _resolve_indexed_filters(
+        self,
+        partition: InMemoryPartitionSnapshot,
+        filters: Sequence[ComparisonOperation[Field]],
+    ) -> tuple[AbstractSet[int] | None, Sequence[ComparisonOperation[Field]]]:
+        """
+        Narrow down the rows using the field indices.
+        Returns the candidate row numbers (None if no filter could be resolved)
+        and the filters that still need to be evaluated on the candidates.
+        """
+        candidate_row_ids: AbstractSet[int] | None = None
+        residual_filters: list[ComparisonOperation[Field]] = []
+        for group_key, group in ComparisonOperation._group_filters_by_group_key(filters).items():
+            disjunctions = [[filter_] for filter_ in group] if group_key is None else [group]
+            for disjunction in disjunctions:
+                disjunction_row_ids = self._resolve_indexed_disjunction(partition, disjunction)
+                if disjunction_row_ids is None:
+                    residual_filters.extend(disjunction)
+                elif candidate_row_ids is None:
+                    candidate_row_ids = disjunction_row_ids
+                else:
+                    candidate_row_ids = candidate_row_ids & disjunction_row_ids
+        return candidate_row_ids, residual_filters
+
+    def _resolve_indexed_disjunction(
+        self,
+        partition: InMemoryPartitionSnapshot,
+        disjunction: Sequence[ComparisonOperation[Field]],
+    ) -> AbstractSet[int] | None:
+        row_id_sets = []
+        for filter_ in disjunction:
+            row_ids = partition.find_row_numbers(filter_)
+            if row_ids is None:
+                return None
+            row_id_sets.append(row_ids)
+        return row_id_sets[0] if len(row_id_sets) == 1 else set[int]().union(*row_id_sets)
+
+    def _validate_vector_dimension(self, index_config: IndexConfig, vector: Vector) -> None:
+        indexed_dimension = index_config.vector_field_descriptor.field_size
+        if indexed_dimension != vector.dimension:
             raise VectorFieldDimensionException(
-                f"Indexed vector field contains vectors with wrong dimensions: {wrong_dimensions}"
+                f"Searched vector dimension {vector.dimension} doesn't match "
+                + f"the indexed vector dimension {indexed_dimension}."
             )
-        return cast(dict[str, Vector], filtered_unchecked_vectors)
 
     def _calculate_similarities(
         self,
         distance_metric: DistanceMetric,
-        vector: Vector,
-        filtered_vectors: dict[str, Vector],
-    ) -> dict[str, float]:
-        vector_similarity_calculator = VectorSimilarityCalculator(distance_metric)
-        return {
-            row_id: vector_similarity_calculator.calculate_similarity(filtered_vector, vector)
-            for row_id, filtered_vector in filtered_vectors.items()
-        }
-
-    def _sort_similarities(
-        self,
-        similarities: dict[str, float],
-        radius: float | None,
-    ) -> Sequence[tuple[str, float]]:
-        return sorted(
-            {
-                k: similarity for k, similarity in similarities.items() if not radius or similarity >= (1 - radius)
-            }.items(),
-            key=lambda x: x[1],
-            reverse=True,
-        )
+        vector_store: InMemoryVectorStoreSnapshot,
+        vectors: NPArray,
+        positions: NPArray | None,
+    ) -> NPArray:
+        return vector_store.calculate_similarities(VectorSimilarityCalculator(distance_metric), vectors, positions)
+
+    def _select_top_indices(
+        self, similarities: NPArray, radius: float | None, limit: int, excluded_indices: NPArray | None = None
+    ) -> NPArray:
+        if excluded_indices is not None and excluded_indices.size:
+            is_selectable = similarities >= (1 - radius) if radius else np.ones(len(similarities), dtype=bool)
+            is_selectable[excluded_indices] = False
+            indices = np.flatnonzero(is_selectable)
+        else:
+            indices = np.flatnonzero(similarities >= (1 - radius)) if radius else np.arange(len(similarities))
+        if limit != UNLIMITED_SEARCH_RESULTS and limit < len(indices):
+            indices = self._partition_top_indices(similarities, indices, limit)
+        return indices[np.argsort(-similarities[indices], kind="stable")]
+
+    def _partition_top_indices(self, similarities: NPArray, indices: NPArray, limit: int) -> NPArray:
+        if limit <= 0:
+            return indices[:0]
+        return np.sort(indices[np.argpartition(-similarities[indices], limit - 1)[:limit]])
 
     @staticmethod
     def _is_subset(
-        raw_entity: dict[str, Any],
+        raw_entity: Mapping[str, Any],
         filters: Sequence[ComparisonOperation[Field]],
         has_fields: Sequence[Field] | None = None,
     ) -> bool:
@@ -153,7 +387,7 @@ class InMemorySearch:
     @staticmethod
     def _evaluate_grouped_filters(
         grouped_filters: dict[int | None, list[ComparisonOperation[Field]]],
-        entity: dict[str, Any],
+        entity: Mapping[str, Any],
     ) -> bool:
         return all(
             InMemorySearch._evaluate_group(group, group_key, entity) for group_key, group in grouped_filters.items()
@@ -163,11 +397,11 @@ class InMemorySearch:
     def _evaluate_group(
         group: list[ComparisonOperation[Field]],
         group_key: int | None,
-        entity: dict[str, Any],
+        entity: Mapping[str, Any],
     ) -> bool:
         evaluate_func = all if group_key is None else any
         return evaluate_func(filter_.evaluate(entity.get(cast(Field, filter_._operand).name)) for filter_ in group)
 
     @staticmethod
-    def _evaluate_has_fields(has_fields: Sequence[Field] | None, entity: dict[str, Any]) -> bool:
+    def _evaluate_has_fields(has_fields: Sequence[Field] | None, entity: Mapping[str, Any]) -> bool:
         return all(entity.get(field.name) is not None for field in has_fields or [])
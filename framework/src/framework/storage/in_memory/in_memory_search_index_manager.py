@@ -29,7 +29,7 @@ class InMemorySearchIndexManager(DynamicSearchIndexManager):
     @override
     @property
     def supported_vector_indexing(self) -> Sequence[SearchAlgorithm]:
-        return [SearchAlgorithm.FLAT]
+        return [SearchAlgorithm.FLAT, SearchAlgorithm.IVF]
 
     def _list_search_index_names_from_vdb(self, collection_name: str) -> Sequence[str]:
         return list(self._index_configs.keys())
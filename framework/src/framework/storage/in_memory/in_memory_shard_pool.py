@@ -0,0 +1,252 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from beartype.typing import Sequence
+
+from superlinked.framework.common.calculation.vector_similarity import (
+    VectorSimilarityCalculator,
+)
+from superlinked.framework.common.data_types import NPArray
+from superlinked.framework.storage.in_memory.in_memory_sharding_params import (
+    InMemoryShardingParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_quantizer import (
+    InMemoryVectorQuantizer,
+)
+
+# the shared memories attached by a worker process, by name
+_attached_shared_memories: dict[str, SharedMemory] = {}
+
+
+@dataclass(frozen=True)
+class InMemoryShardTask:
+    """
+    Scoring of a shard of a shared vector matrix: the rows from start to stop except the excluded positions,
+    or the given positions.
+    """
+
+    shared_memory_name: str
+    live_shared_memory_names: frozenset[str]
+    shape: tuple[int, ...]
+    dtype: str
+    start: int
+    stop: int
+    positions: NPArray | None
+    excluded_positions: NPArray | None
+    quantizer: InMemoryVectorQuantizer | None
+    calculator: VectorSimilarityCalculator
+    vectors: NPArray
+    candidate_counts: Sequence[int | None]
+    min_similarities: Sequence[float | None]
+
+
+class InMemoryShardPool:
+    """
+    Pool of worker processes scoring shards of the vector matrices of the in-memory vector database.
+    The matrices are allocated in shared memory, where the workers read them in place:
+    only the queries and the best candidates of the shards cross the process boundaries.
+    The shared memory of a matrix is freed once the matrix is garbage collected, or when it is released.
+    """
+
+    def __init__(self, params: InMemoryShardingParams) -> None:
+        self.__params = params
+        self.__worker_count = params.worker_count or os.cpu_count() or 1
+        self.__executor: ProcessPoolExecutor | None = None
+        self.__lock = threading.Lock()
+        # keyed by the address of their buffer, which is shared by every view of the allocated array
+        self.__shared_memories: dict[int, SharedMemory] = {}
+        # unlinked, but still mapped by arrays not yet garbage collected
+        self.__released_shared_memories: list[SharedMemory] = []
+        self.__finalizer = weakref.finalize(
+            self, InMemoryShardPool.__close_all, self.__shared_memories, self.__released_shared_memories
+        )
+
+    def allocate(self, shape: tuple[int, ...], dtype: type[np.generic]) -> NPArray:
+        shared_memory = SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+        array: NPArray = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+        with self.__lock:
+            self.__shared_memories[array.ctypes.data] = shared_memory
+            self.__close_released()
+        weakref.finalize(array, self.__release, array.ctypes.data)
+        return array
+
+    def release(self, array: NPArray) -> None:
+        """
+        Free the shared memory of an allocated array once it is garbage collected.
+        """
+        self.__release(array.ctypes.data)
+
+    def find_top_candidates(  # pylint: disable=too-many-arguments
+        self,
+        matrix: NPArray,
+        size: int,
+        positions: NPArray | None,
+        excluded_positions: NPArray | None,
+        quantizer: InMemoryVectorQuantizer | None,
+        calculator: VectorSimilarityCalculator,
+        vectors: NPArray,
+        candidate_counts: Sequence[int | None],
+        min_similarities: Sequence[float | None],
+    ) -> list[tuple[NPArray, NPArray]] | None:
+        """
+        Score the first `size` rows of the allocated matrix but the excluded positions (or the rows at the
+        positions) against the vectors in parallel. Returns the positions and similarities of the candidates
+        of every vector, in the order of the scored rows: the best `candidate_count` (all if None) having
+        at least `min_similarity` of every shard.
+        Returns None if the rows are too few to be worth sharding.
+        """
+        row_count = size if positions is None else len(positions)
+        shard_count = min(self.__worker_count, row_count // self.__params.min_shard_size)
+        if shard_count < 2:
+            return None
+        with self.__lock:
+            shared_memory = self.__shared_memories[matrix.ctypes.data]
+            live_shared_memory_names = frozenset(memory.name for memory in self.__shared_memories.values())
+        bounds = np.linspace(0, row_count, shard_count + 1).astype(int).tolist()
+        tasks = [
+            InMemoryShardTask(
+                shared_memory.name,
+                live_shared_memory_names,
+                matrix.shape,
+                matrix.dtype.str,
+                start,
+                stop,
+                None if positions is None else positions[start:stop],
+                (
+                    excluded_positions[(excluded_positions >= start) & (excluded_positions < stop)]
+                    if positions is None and excluded_positions is not None and excluded_positions.size
+                    else None
+                ),
+                quantizer,
+                calculator,
+                vectors,
+                candidate_counts,
+                min_similarities,
+            )
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        shard_candidates = list(self.__get_executor().map(find_shard_candidates, tasks))
+        return [
+            (
+                np.concatenate([candidates[column][0] for candidates in shard_candidates]),
+                np.concatenate([candidates[column][1] for candidates in shard_candidates]),
+            )
+            for column in range(len(vectors))
+        ]
+
+    def close(self) -> None:
+        """
+        Stop the workers and free the shared memory of every allocated array. The pool restarts on its next use.
+        """
+        with self.__lock:
+            if self.__executor:
+                self.__executor.shutdown()
+                self.__executor = None
+            InMemoryShardPool.__close_all(self.__shared_memories, self.__released_shared_memories)
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                # spawned workers do not inherit the locks and threads of the serving process
+                self.__executor = ProcessPoolExecutor(
+                    self.__worker_count, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.__executor
+
+    def __release(self, address: int) -> None:
+        with self.__lock:
+            if (shared_memory := self.__shared_memories.pop(address, None)) is None:
+                return
+            shared_memory.unlink()
+            self.__released_shared_memories.append(shared_memory)
+            self.__close_released()
+
+    def __close_released(self) -> None:
+        self.__released_shared_memories[:] = [
+            shared_memory
+            for shared_memory in self.__released_shared_memories
+            if not InMemoryShardPool.__try_close(shared_memory)
+        ]
+
+    @staticmethod
+    def __close_all(
+        shared_memories: dict[int, SharedMemory], released_shared_memories: list[SharedMemory]
+    ) -> None:
+        for shared_memory in shared_memories.values():
+            shared_memory.unlink()
+        released_shared_memories.extend(shared_memories.values())
+        shared_memories.clear()
+        for shared_memory in released_shared_memories:
+            InMemoryShardPool.__try_close(shared_memory)
+        released_shared_memories.clear()
+
+    @staticmethod
+    def __try_close(shared_memory: SharedMemory) -> bool:
+        try:
+            shared_memory.close()
+        except BufferError:
+            return False
+        return True
+
+
+def find_shard_candidates(task: InMemoryShardTask) -> list[tuple[NPArray, NPArray]]:
+    """
+    Score a shard in a worker process, returning the positions and similarities of the candidates of every vector.
+    """
+    matrix: NPArray = np.ndarray(task.shape, dtype=task.dtype, buffer=_attach_shared_memory(task).buf)
+    if task.positions is None:
+        positions = np.arange(task.start, task.stop)
+        codes = matrix[task.start : task.stop]
+    else:
+        positions = task.positions
+        codes = matrix[positions]
+    if task.quantizer:
+        similarity_matrix = task.quantizer.calculate_similarities(task.calculator, codes, task.vectors)
+    else:
+        similarity_matrix = task.calculator.calculate_similarity_matrix_np(codes, task.vectors)
+    del matrix, codes
+    is_included = None
+    if task.excluded_positions is not None:
+        is_included = np.ones(len(positions), dtype=bool)
+        is_included[task.excluded_positions - task.start] = False
+    candidates = []
+    for column, (candidate_count, min_similarity) in enumerate(zip(task.candidate_counts, task.min_similarities)):
+        similarities = similarity_matrix[:, column]
+        is_candidate = None if min_similarity is None else similarities >= min_similarity
+        if is_included is not None:
+            is_candidate = is_included if is_candidate is None else is_candidate & is_included
+        indices = np.arange(len(similarities)) if is_candidate is None else np.flatnonzero(is_candidate)
+        if candidate_count is not None and candidate_count < len(indices):
+            indices = np.sort(indices[np.argpartition(-similarities[indices], candidate_count - 1)[:candidate_count]])
+        candidates.append((positions[indices], similarities[indices]))
+    return candidates
+
+
+def _attach_shared_memory(task: InMemoryShardTask) -> SharedMemory:
+    for name in set(_attached_shared_memories) - task.live_shared_memory_names:
+        # the coordinator released it, the mapping is kept alive only by this worker
+        _attached_shared_memories.pop(name).close()
+    if (shared_memory := _attached_shared_memories.get(task.shared_memory_name)) is None:
+        shared_memory = SharedMemory(name=task.shared_memory_name)
+        _attached_shared_memories[task.shared_memory_name] = shared_memory
+    return shared_memory
@@ -0,0 +1,41 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+from superlinked.framework.common.exception import ValidationException
+
+
+@dataclass(frozen=True)
+class InMemoryShardingParams:
+    """
+    Parameters of the sharded search of the in-memory vector database.
+    The vector matrices are kept in shared memory, and large searches are split into shards
+    scored in parallel by worker processes.
+
+    Attributes:
+        worker_count (int | None): Number of worker processes. Defaults to None, which uses the number of CPUs.
+        min_shard_size (int): Minimum number of vectors scored by a worker. Searches scoring fewer than
+            twice as many vectors run in the calling process, as their parallel scoring would cost more
+            than it saves. Defaults to 65536.
+    """
+
+    worker_count: int | None = None
+    min_shard_size: int = 65536
+
+    def __post_init__(self) -> None:
+        if self.worker_count is not None and self.worker_count < 1:
+            raise ValidationException(f"Sharding worker_count must be positive, got {self.worker_count}.")
+        if self.min_shard_size < 1:
+            raise ValidationException(f"Sharding min_shard_size must be positive, got {self.min_shard_size}.")
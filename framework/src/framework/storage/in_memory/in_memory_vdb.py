@@ -13,11 +13,17 @@
 # limitations under the License.
 
 import json
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import partial
 
-from beartype.typing import Any, Sequence
+import structlog
+from beartype.typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 from typing_extensions import override
 
+from superlinked.framework.common.exception import ValidationException
 from superlinked.framework.common.interface.comparison_operand import (
     ComparisonOperation,
 )
@@ -26,6 +32,7 @@ from superlinked.framework.common.storage.entity.entity_data import EntityData
 from superlinked.framework.common.storage.entity.entity_id import EntityId
 from superlinked.framework.common.storage.field.field import Field
 from superlinked.framework.common.storage.field.field_data import FieldData
+from superlinked.framework.common.storage.index_config import IndexConfig
 from superlinked.framework.common.storage.query.vdb_knn_search_params import (
     VDBKNNSearchParams,
 )
@@ -33,28 +40,113 @@ from superlinked.framework.common.storage.result_entity_data import ResultEntity
 from superlinked.framework.common.storage.search_index.manager.search_index_manager import (
     SearchIndexManager,
 )
+from superlinked.framework.common.storage.search_index.search_algorithm import (
+    SearchAlgorithm,
+)
 from superlinked.framework.common.storage.vdb_connector import VDBConnector
 from superlinked.framework.storage.common.vdb_settings import VDBSettings
+from superlinked.framework.storage.in_memory.binary_codec import BinaryCodec
+from superlinked.framework.storage.in_memory.binary_object_serializer import (
+    BinaryObjectSerializer,
+)
+from superlinked.framework.storage.in_memory.in_memory_field_index import (
+    InMemoryFieldIndex,
+)
+from superlinked.framework.storage.in_memory.in_memory_generation import (
+    InMemoryGeneration,
+)
+from superlinked.framework.storage.in_memory.in_memory_ivf_training import (
+    InMemoryIVFTraining,
+)
+from superlinked.framework.storage.in_memory.in_memory_ivf_params import (
+    InMemoryIVFParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_partition import (
+    InMemoryPartition,
+)
+from superlinked.framework.storage.in_memory.in_memory_partition_snapshot import (
+    InMemoryPartitionSnapshot,
+)
+from superlinked.framework.storage.in_memory.in_memory_quantization_params import (
+    InMemoryQuantizationParams,
+)
 from superlinked.framework.storage.in_memory.in_memory_search import InMemorySearch
 from superlinked.framework.storage.in_memory.in_memory_search_index_manager import (
     InMemorySearchIndexManager,
 )
+from superlinked.framework.storage.in_memory.in_memory_shard_pool import (
+    InMemoryShardPool,
+)
+from superlinked.framework.storage.in_memory.in_memory_sharding_params import (
+    InMemoryShardingParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_store import (
+    InMemoryVectorStore,
+)
+from superlinked.framework.storage.in_memory.in_memory_write_ahead_log import (
+    InMemoryWriteAheadLog,
+)
+from superlinked.framework.storage.in_memory.in_memory_write_ahead_log_params import (
+    InMemoryWriteAheadLogParams,
+)
 from superlinked.framework.storage.in_memory.json_codec import JsonDecoder, JsonEncoder
 from superlinked.framework.storage.in_memory.object_serializer import ObjectSerializer
 
+logger = structlog.getLogger()
+
 
 class InMemoryVDB(VDBConnector):
-    def __init__(self, vdb_settings: VDBSettings) -> None:
-        super().__init__()
-        self._vdb = defaultdict[str, dict[str, Any]](dict)
+    """
+    Vector database keeping the data in the memory of the process.
+    Every write batch publishes a new generation: immutable snapshots of the partitions, swapped in atomically.
+    Readers (searches, entity reads, persisting) pin the last published generation and never wait for writers,
+    while the partitions keep what the pinned generations still read: replaced rows in undo logs, superseded
+    vectors in the append-only vector stores. Write batches, restoring and reindexing are serialized by a lock;
+    the latter two build new partitions instead of changing the ones the readers may read.
+    Maintenance (IVF training, write-ahead log compaction) runs in a background thread instead of the writing call,
+    reading snapshots, and only takes the write lock to start or to install its result.
+    """
+
+    def __init__(
+        self,
+        vdb_settings: VDBSettings,
+        search_algorithm: SearchAlgorithm = SearchAlgorithm.FLAT,
+        ivf_params: InMemoryIVFParams | None = None,
+        write_ahead_log_params: InMemoryWriteAheadLogParams | None = None,
+        quantization_params: InMemoryQuantizationParams | None = None,
+        sharding_params: InMemoryShardingParams | None = None,
+    ) -> None:
+        super().__init__(search_algorithm=search_algorithm)
+        self._partitions: dict[str, InMemoryPartition] = {}
         self._search = InMemorySearch()
         self.__vdb_settings = vdb_settings
         self.__search_index_manager = InMemorySearchIndexManager()
+        self.__ivf_params = ivf_params or InMemoryIVFParams()
+        self.__quantization_params = quantization_params
+        self.__shard_pool = InMemoryShardPool(sharding_params) if sharding_params else None
+        self.__write_ahead_log = InMemoryWriteAheadLog(write_ahead_log_params) if write_ahead_log_params else None
+        self.__generation = InMemoryGeneration(0, {})
+        self.__write_lock = threading.Lock()
+        self.__pin_lock = threading.Lock()
+        self.__pinned_generation_counts = defaultdict[int, int](int)
+        self.__maintenance_lock = threading.Lock()
+        self.__maintenance_executor: ThreadPoolExecutor | None = None
+        self.__scheduled_maintenance_tasks: set[Callable[[], None]] = set()
 
     @override
     def close_connection(self) -> None:
-        self._vdb = defaultdict[str, dict[str, Any]](dict)
-        self.search_index_manager.clear_configs()
+        with self.__maintenance_lock:
+            maintenance_executor, self.__maintenance_executor = self.__maintenance_executor, None
+        if maintenance_executor:
+            maintenance_executor.shutdown(cancel_futures=True)
+        with self.__write_lock:
+            for partition in self._partitions.values():
+                partition.close()
+            self._partitions = {}
+            self.__publish(self.__generation.number + 1, {})
+            self.search_index_manager.clear_configs()
+            if self.__shard_pool:
+                self.__shard_pool.close()
 
     @property
     @override
@@ -66,31 +158,212 @@ class InMemoryVDB(VDBConnector):
     def _default_search_limit(self) -> int:
         return self.__vdb_settings.default_query_limit
 
+    @override
+    def init_search_index_configs(
+        self,
+        index_configs: Sequence[IndexConfig],
+        create_search_indices: bool,
+        override_existing: bool = False,
+    ) -> None:
+        with self.__write_lock:
+            super().init_search_index_configs(index_configs, create_search_indices, override_existing)
+            self._build_indices()
+
     @override
     def write_entities(self, entity_data: Sequence[EntityData]) -> None:
+        rows = defaultdict[EntityId, dict[str, Any]](dict)
         for ed in entity_data:
-            row_id = InMemoryVDB._get_row_id_from_entity_id(ed.id_)
-            self._vdb[row_id].update({name: fd.value for name, fd in ed.field_data.items()})
+            rows[ed.id_].update({name: fd.value for name, fd in ed.field_data.items()})
+        with self.__write_lock:
+            # the whole batch is validated first, so a failing batch is neither applied partially nor logged
+            for entity_id, values in rows.items():
+                self._get_partition(entity_id.schema_id).validate(values)
+            generation_number = self.__generation.number + 1
+            for entity_id, values in rows.items():
+                self._get_partition(entity_id.schema_id).write(entity_id.object_id, values, generation_number)
+            if self.__write_ahead_log:
+                self.__write_ahead_log.append(
+                    {InMemoryVDB._get_row_id_from_entity_id(entity_id): values for entity_id, values in rows.items()}
+                )
+            written_partitions = [
+                self._partitions[schema_id] for schema_id in {entity_id.schema_id for entity_id in rows}
+            ]
+            self.__publish(
+                generation_number,
+                {
+                    **self.__generation.partitions,
+                    **{partition.schema_id: partition.snapshot(generation_number) for partition in written_partitions},
+                },
+            )
+            self._schedule_ivf_training_if_due(written_partitions)
+        if self.__write_ahead_log and self.__write_ahead_log.should_compact():
+            self.__schedule_maintenance(self._compact_write_ahead_log)
 
-    @override
-    def read_entities(self, entities: Sequence[Entity]) -> Sequence[EntityData]:
-        return [
-            EntityData(
-                entity.id_,
-                self._find_field_data(
-                    InMemoryVDB._get_row_id_from_entity_id(entity.id_),
-                    list(entity.fields.values()),
+    def _compact_write_ahead_log(self) -> None:
+        if (write_ahead_log := self.__write_ahead_log) is None:
+            return
+        with ExitStack() as stack:
+            # batches are appended and published under the write lock, so the pinned generation is exactly
+            # what the log before the new segment replays to
+            with self.__write_lock:
+                if not write_ahead_log.should_compact():
+                    return
+                first_segment, serializer = write_ahead_log.start_compaction()
+                generation = stack.enter_context(self._pin_generation())
+            write_snapshot = self._capture(generation, serializer)
+        write_snapshot()
+        write_ahead_log.finish_compaction(first_segment)
+
+    def _schedule_ivf_training_if_due(self, partitions: Iterable[InMemoryPartition]) -> None:
+        if any(
+            vector_store.is_ivf_training_due() for partition in partitions for vector_store in partition.vector_stores
+        ):
+            self.__schedule_maintenance(self._train_ivf_indices)
+
+    def _train_ivf_indices(self) -> None:
+        with self.__write_lock:
+            trainings = [
+                (vector_store, training)
+                for partition in self._partitions.values()
+                for vector_store in partition.vector_stores
+                if (training := vector_store.start_ivf_training())
+            ]
+        for vector_store, training in trainings:
+            self._run_ivf_training(vector_store, training)
+
+    def _run_ivf_training(self, vector_store: InMemoryVectorStore, training: InMemoryIVFTraining) -> None:
+        # the training reads a snapshot of the store without the lock, writers only wait for the lists to be installed
+        try:
+            training.run()
+        except BaseException:
+            with self.__write_lock:
+                vector_store.cancel_ivf_training(training)
+            raise
+        with self.__write_lock:
+            if not vector_store.is_closed:
+                vector_store.finish_ivf_training(training)
+
+    def __schedule_maintenance(self, task: Callable[[], None]) -> None:
+        with self.__maintenance_lock:
+            if task in self.__scheduled_maintenance_tasks:
+                return
+            if self.__maintenance_executor is None:
+                self.__maintenance_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="in-memory-vdb-maintenance"
+                )
+            self.__scheduled_maintenance_tasks.add(task)
+            self.__maintenance_executor.submit(self.__run_maintenance, task)
+
+    def __run_maintenance(self, task: Callable[[], None]) -> None:
+        with self.__maintenance_lock:
+            self.__scheduled_maintenance_tasks.discard(task)
+        try:
+            task()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("failed in-memory vdb maintenance", task=task.__name__)
+
+    def _get_partition(self, schema_id: str) -> InMemoryPartition:
+        if (partition := self._partitions.get(schema_id)) is None:
+            partition = InMemoryPartition(schema_id, self.__create_field_indices(), self.__create_vector_stores())
+            self._partitions[schema_id] = partition
+        return partition
+
+    def _build_indices(self) -> None:
+        self.__install_partitions(self.__copy_partitions())
+
+    def __copy_partitions(self) -> dict[str, InMemoryPartition]:
+        """
+        Return new partitions loaded with the data of the current generation, to be installed once loaded further.
+        The current partitions are left to the readers of the pinned generations.
+        """
+        partitions: dict[str, InMemoryPartition] = {}
+        for schema_id, partition_snapshot in self.__generation.partitions.items():
+            self._get_loaded_partition(partitions, schema_id).load_data(partition_snapshot.export_data())
+        return partitions
+
+    def __install_partitions(self, partitions: dict[str, InMemoryPartition]) -> None:
+        for partition in partitions.values():
+            partition.reindex(self.__create_field_indices(), self.__create_vector_stores())
+        self._partitions = partitions
+        generation_number = self.__generation.number + 1
+        self.__publish(
+            generation_number,
+            {schema_id: partition.snapshot(generation_number) for schema_id, partition in partitions.items()},
+        )
+        self._schedule_ivf_training_if_due(partitions.values())
+
+    def __publish(self, generation_number: int, partitions: Mapping[str, InMemoryPartitionSnapshot]) -> None:
+        with self.__pin_lock:
+            self.__generation = InMemoryGeneration(generation_number, partitions)
+            oldest_pinned_generation_number = min(self.__pinned_generation_counts, default=generation_number)
+        for partition in self._partitions.values():
+            partition.release(oldest_pinned_generation_number)
+
+    @contextmanager
+    def _pin_generation(self) -> Iterator[InMemoryGeneration]:
+        """
+        Pin the last published generation for reading it.
+        """
+        with self.__pin_lock:
+            generation = self.__generation
+            self.__pinned_generation_counts[generation.number] += 1
+        try:
+            yield generation
+        finally:
+            with self.__pin_lock:
+                self.__pinned_generation_counts[generation.number] -= 1
+                if not self.__pinned_generation_counts[generation.number]:
+                    del self.__pinned_generation_counts[generation.number]
+
+    @staticmethod
+    def _get_loaded_partition(partitions: dict[str, InMemoryPartition], schema_id: str) -> InMemoryPartition:
+        if (partition := partitions.get(schema_id)) is None:
+            partition = InMemoryPartition(schema_id, {}, {})
+            partitions[schema_id] = partition
+        return partition
+
+    def __create_field_indices(self) -> dict[str, InMemoryFieldIndex]:
+        return {
+            field_descriptor.field_name: InMemoryFieldIndex()
+            for index_config in self.__search_index_manager._index_configs.values()
+            for field_descriptor in index_config.field_descriptors
+        }
+
+    def __create_vector_stores(self) -> dict[str, InMemoryVectorStore]:
+        return {
+            index_config.vector_field_descriptor.field_name: InMemoryVectorStore(
+                index_config.vector_field_descriptor.field_size,
+                (
+                    self.__ivf_params
+                    if index_config.vector_field_descriptor.search_algorithm == SearchAlgorithm.IVF
+                    else None
                 ),
+                self.__quantization_params,
+                self.__shard_pool,
             )
-            for entity in entities
-        ]
+            for index_config in self.__search_index_manager._index_configs.values()
+        }
+
+    @override
+    def read_entities(self, entities: Sequence[Entity]) -> Sequence[EntityData]:
+        with self._pin_generation() as generation:
+            return [
+                EntityData(
+                    entity.id_,
+                    self._find_field_data(self._get_row(generation, entity.id_), list(entity.fields.values())),
+                )
+                for entity in entities
+            ]
 
-    def _find_field_data(self, row_id: str, fields: Sequence[Field]) -> dict[str, FieldData]:
-        raw_entity = self._vdb[row_id]
+    def _get_row(self, generation: InMemoryGeneration, entity_id: EntityId) -> Mapping[str, Any]:
+        partition = generation.partitions.get(entity_id.schema_id)
+        return partition.get_row(entity_id.object_id) if partition else {}
+
+    def _find_field_data(self, raw_entity: Mapping[str, Any], fields: Sequence[Field]) -> dict[str, FieldData]:
         return {
-            field.name: FieldData.from_field(field, raw_entity.get(field.name))
+            field.name: FieldData.from_field(field, value)
             for field in fields
-            if raw_entity.get(field.name) is not None
+            if (value := raw_entity.get(field.name)) is not None
         }
 
     def read_entities_matching_filters(
@@ -99,14 +372,15 @@ class InMemoryVDB(VDBConnector):
         has_fields: Sequence[Field],
         return_fields: Sequence[Field],
     ) -> Sequence[EntityData]:
-        row_ids = self._search.search(self._vdb, filters, has_fields)
-        return [
-            EntityData(
-                InMemoryVDB._get_entity_id_from_row_id(row_id),
-                self._find_field_data(row_id, return_fields),
-            )
-            for row_id in row_ids
-        ]
+        with self._pin_generation() as generation:
+            return [
+                EntityData(
+                    EntityId(partition.schema_id, partition.object_ids[row_number]),
+                    self._find_field_data(partition.get_row_by_number(row_number), return_fields),
+                )
+                for partition in generation.partitions.values()
+                for row_number in self._search.search(partition, filters, has_fields)
+            ]
 
     @override
     def _knn_search(
@@ -116,37 +390,117 @@ class InMemoryVDB(VDBConnector):
         vdb_knn_search_params: VDBKNNSearchParams,
         **params: Any,
     ) -> Sequence[ResultEntityData]:
-        index_config = self._get_index_config(index_name)
-        sorted_scores = self._search.knn_search(index_config, self._vdb, vdb_knn_search_params)
-        return [
-            self._get_result_entity_data(row_id, score, vdb_knn_search_params.fields_to_return)
-            for row_id, score in sorted_scores
-        ]
+        with self._pin_generation() as generation:
+            partition = generation.partitions.get(schema_name)
+            sorted_scores = self._search.knn_search(
+                self._get_index_config(index_name), partition, vdb_knn_search_params
+            )
+            return self._get_result_entity_data(partition, sorted_scores, vdb_knn_search_params.fields_to_return)
+
+    @override
+    def _knn_search_batch(
+        self,
+        index_name: str,
+        schema_name: str,
+        vdb_knn_search_params_list: Sequence[VDBKNNSearchParams],
+        **params: Any,
+    ) -> Sequence[Sequence[ResultEntityData]]:
+        with self._pin_generation() as generation:
+            partition = generation.partitions.get(schema_name)
+            sorted_scores_list = self._search.knn_search_batch(
+                self._get_index_config(index_name), partition, vdb_knn_search_params_list
+            )
+            return [
+                self._get_result_entity_data(partition, sorted_scores, vdb_knn_search_params.fields_to_return)
+                for sorted_scores, vdb_knn_search_params in zip(sorted_scores_list, vdb_knn_search_params_list)
+            ]
 
     @override
     def persist(self, serializer: ObjectSerializer) -> None:
+        """
+        Persist the last published generation with the serializer. Writes continue meanwhile.
+        """
+        with self._pin_generation() as generation:
+            write_snapshot = self._capture(generation, serializer)
+        write_snapshot()
+
+    def _capture(self, generation: InMemoryGeneration, serializer: ObjectSerializer) -> Callable[[], None]:
+        """
+        Copy the generation to persist, returning the function writing the copy with the serializer.
+        """
         app_identifier = "_".join(self.search_index_manager._index_configs.keys())
-        serializer.write(
-            json.dumps(self._vdb, cls=JsonEncoder),
-            app_identifier,
-        )
+        if isinstance(serializer, BinaryObjectSerializer):
+            partitions = [partition.export_data() for partition in generation.partitions.values()]
+            return partial(BinaryCodec(serializer).encode, partitions, app_identifier)
+        rows = self._get_rows_by_row_id(generation)
+        return lambda: serializer.write(json.dumps(rows, cls=JsonEncoder), app_identifier)
 
     @override
-    def restore(self, serializer: ObjectSerializer) -> None:
+    def restore(self, serializer: ObjectSerializer | None = None) -> None:
+        """
+        Restore the state persisted by the serializer.
+        If a write-ahead log is configured, the state is recovered from the log directory instead, so no serializer
+        may be given: the last compacted snapshot is loaded and the log tail is replayed on top of it.
+        """
+        if self.__write_ahead_log and serializer is not None:
+            raise ValidationException(
+                "InMemoryVDB with a write-ahead log restores from the log directory, call restore without a serializer."
+            )
+        if self.__write_ahead_log is None and serializer is None:
+            raise ValidationException("InMemoryVDB without a write-ahead log needs a serializer to restore from.")
+        with self.__write_lock:
+            partitions = self.__copy_partitions()
+            if self.__write_ahead_log:
+                if snapshot_serializer := self.__write_ahead_log.snapshot_serializer:
+                    self._load_snapshot(snapshot_serializer, partitions)
+                for rows in self.__write_ahead_log.read():
+                    self._load_rows(rows, partitions)
+            elif serializer is not None:
+                self._load_snapshot(serializer, partitions)
+            self.__install_partitions(partitions)
+
+    def _load_snapshot(self, serializer: ObjectSerializer, partitions: dict[str, InMemoryPartition]) -> None:
         app_identifier = "_".join(self.search_index_manager._index_configs.keys())
-        self._vdb.update(
+        if isinstance(serializer, BinaryObjectSerializer):
+            for partition_data in BinaryCodec(serializer).decode(app_identifier):
+                self._get_loaded_partition(partitions, partition_data.schema_id).load_data(partition_data)
+            return
+        self._load_rows(
             json.loads(
                 serializer.read(app_identifier),
                 cls=JsonDecoder,
-            )
+            ),
+            partitions,
         )
 
-    def _get_result_entity_data(self, row_id: str, score: float, fields_to_return: Sequence[Field]) -> ResultEntityData:
-        return ResultEntityData(
-            InMemoryVDB._get_entity_id_from_row_id(row_id),
-            self._find_field_data(row_id, fields_to_return),
-            score,
-        )
+    def _load_rows(self, rows: Mapping[str, Mapping[str, Any]], partitions: dict[str, InMemoryPartition]) -> None:
+        for row_id, values in rows.items():
+            entity_id = InMemoryVDB._get_entity_id_from_row_id(row_id)
+            self._get_loaded_partition(partitions, entity_id.schema_id).load(entity_id.object_id, values)
+
+    def _get_rows_by_row_id(self, generation: InMemoryGeneration) -> dict[str, Mapping[str, Any]]:
+        return {
+            InMemoryVDB._get_row_id_from_entity_id(EntityId(partition.schema_id, object_id)): dict(row)
+            for partition in generation.partitions.values()
+            for object_id, row in zip(partition.object_ids, partition.get_rows())
+        }
+
+    def _get_result_entity_data(
+        self,
+        partition: InMemoryPartitionSnapshot | None,
+        sorted_scores: Sequence[tuple[int, float]],
+        fields_to_return: Sequence[Field],
+    ) -> list[ResultEntityData]:
+        if partition is None:
+            return []
+        return [
+            ResultEntityData(
+                EntityId(partition.schema_id, partition.object_ids[row_number]),
+                self._find_field_data(partition.get_row_by_number(row_number), fields_to_return),
+                score,
+            )
+            for row_number, score in sorted_scores
+        ]
 
     @staticmethod
     def _get_row_id_from_entity_id(entity_id: EntityId) -> str:
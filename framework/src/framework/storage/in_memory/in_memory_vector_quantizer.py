@@ -0,0 +1,197 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from superlinked.framework.common.calculation.vector_similarity import (
+    VectorSimilarityCalculator,
+)
+from superlinked.framework.common.data_types import NPArray
+from superlinked.framework.storage.in_memory.in_memory_vector_precision import (
+    InMemoryVectorPrecision,
+)
+
+SCORING_CHUNK_SIZE = 1024
+INT8_MAX_CODE = 127
+RANGE_PADDING_RATIO = 0.25
+MIN_RANGE_PADDING = 1e-6
+
+
+class InMemoryVectorQuantizer(ABC):
+    """
+    Scalar quantization of the vectors of an `InMemoryVectorStore`.
+    Every quantized component is an affine function of the original one, so the query can be transformed
+    instead of the stored codes: the similarities are the inner products of the codes and the transformed
+    queries, shifted by a per-query bias.
+    Quantizers are immutable: one fitting new vectors is a new quantizer, so the codes encoded by a quantizer
+    can be read with it while the writer re-encodes a copy of them.
+    """
+
+    @property
+    @abstractmethod
+    def dtype(self) -> type[np.generic]:
+        pass
+
+    @abstractmethod
+    def fit(self, vectors: NPArray) -> InMemoryVectorQuantizer:
+        """
+        Return a quantizer able to encode the vectors as well, this one if it can already.
+        """
+
+    @abstractmethod
+    def recode(self, codes: NPArray, quantizer: InMemoryVectorQuantizer) -> None:
+        """
+        Re-encode the codes encoded by the given quantizer, which this one was fitted from, in place.
+        """
+
+    @abstractmethod
+    def encode(self, codes: NPArray, vectors: NPArray) -> None:
+        """
+        Encode the vectors into the codes of the same length. The quantizer must have been fitted to the vectors.
+        """
+
+    @abstractmethod
+    def decode(self, codes: NPArray) -> NPArray:
+        pass
+
+    @abstractmethod
+    def _transform_queries(self, vectors: NPArray) -> tuple[NPArray, NPArray]:
+        pass
+
+    def calculate_similarities(
+        self, calculator: VectorSimilarityCalculator, codes: NPArray, vectors: NPArray
+    ) -> NPArray:
+        weights, biases = self._transform_queries(vectors)
+        weights = weights.astype(np.float32)
+        similarities = np.empty((len(codes), len(vectors)), dtype=np.float32)
+        # codes are widened chunk by chunk to keep the temporary float matrix cache-sized
+        for start in range(0, len(codes), SCORING_CHUNK_SIZE):
+            similarities[start : start + SCORING_CHUNK_SIZE] = calculator.calculate_similarity_matrix_np(
+                codes[start : start + SCORING_CHUNK_SIZE].astype(np.float32), weights
+            )
+        return similarities + biases.astype(np.float32)
+
+    @staticmethod
+    def from_precision(precision: InMemoryVectorPrecision) -> InMemoryVectorQuantizer:
+        match precision:
+            case InMemoryVectorPrecision.FLOAT16:
+                return InMemoryFloat16VectorQuantizer()
+            case InMemoryVectorPrecision.INT8:
+                return InMemoryInt8VectorQuantizer()
+            case _:
+                raise ValueError(f"Unsupported vector precision: {precision}")
+
+
+class InMemoryFloat16VectorQuantizer(InMemoryVectorQuantizer):
+    @property
+    def dtype(self) -> type[np.generic]:
+        return np.float16
+
+    def fit(self, vectors: NPArray) -> InMemoryVectorQuantizer:
+        return self
+
+    def recode(self, codes: NPArray, quantizer: InMemoryVectorQuantizer) -> None:
+        pass
+
+    def encode(self, codes: NPArray, vectors: NPArray) -> None:
+        codes[:] = vectors
+
+    def decode(self, codes: NPArray) -> NPArray:
+        return codes.astype(np.float32)
+
+    def _transform_queries(self, vectors: NPArray) -> tuple[NPArray, NPArray]:
+        return vectors, np.zeros(len(vectors))
+
+
+class InMemoryInt8VectorQuantizer(InMemoryVectorQuantizer):
+    """
+    Quantizes every dimension to 255 levels over the range of the stored values of the dimension.
+    A vector falling outside the range widens it with some padding, re-encoding only the affected columns;
+    as every widening grows the range geometrically, a column gets re-encoded a logarithmic number of times.
+    """
+
+    def __init__(self, lower: NPArray | None = None, upper: NPArray | None = None) -> None:
+        self.__lower = lower
+        self.__upper = upper
+
+    @property
+    def dtype(self) -> type[np.generic]:
+        return np.int8
+
+    def fit(self, vectors: NPArray) -> InMemoryVectorQuantizer:
+        if not len(vectors):
+            return self
+        vector_lower, vector_upper = vectors.min(axis=0).astype(np.float64), vectors.max(axis=0).astype(np.float64)
+        if self.__lower is None or self.__upper is None:
+            padding = self.__get_padding(vector_upper - vector_lower)
+            return InMemoryInt8VectorQuantizer(vector_lower - padding, vector_upper + padding)
+        widened_dimensions = np.flatnonzero((vector_lower < self.__lower) | (vector_upper > self.__upper))
+        if not widened_dimensions.size:
+            return self
+        widened_lower = np.minimum(self.__lower[widened_dimensions], vector_lower[widened_dimensions])
+        widened_upper = np.maximum(self.__upper[widened_dimensions], vector_upper[widened_dimensions])
+        padding = self.__get_padding(widened_upper - widened_lower)
+        lower, upper = self.__lower.copy(), self.__upper.copy()
+        lower[widened_dimensions] = widened_lower - padding
+        upper[widened_dimensions] = widened_upper + padding
+        return InMemoryInt8VectorQuantizer(lower, upper)
+
+    def recode(self, codes: NPArray, quantizer: InMemoryVectorQuantizer) -> None:
+        if not isinstance(quantizer, InMemoryInt8VectorQuantizer) or quantizer.__lower is None:
+            return
+        lower, upper = self.__get_range()
+        widened_dimensions = np.flatnonzero((lower != quantizer.__lower) | (upper != quantizer.__upper))
+        if not widened_dimensions.size:
+            return
+        previous_offset, previous_scale = quantizer.__get_offset_and_scale()
+        offset, scale = self.__get_offset_and_scale()
+        values = codes[:, widened_dimensions] * previous_scale[widened_dimensions] + previous_offset[widened_dimensions]
+        codes[:, widened_dimensions] = self.__quantize(values, offset[widened_dimensions], scale[widened_dimensions])
+
+    def encode(self, codes: NPArray, vectors: NPArray) -> None:
+        offset, scale = self.__get_offset_and_scale()
+        # quantized chunk by chunk to keep the temporary float matrix cache-sized
+        for start in range(0, len(vectors), SCORING_CHUNK_SIZE):
+            codes[start : start + SCORING_CHUNK_SIZE] = self.__quantize(
+                vectors[start : start + SCORING_CHUNK_SIZE], offset, scale
+            )
+
+    def decode(self, codes: NPArray) -> NPArray:
+        offset, scale = self.__get_offset_and_scale()
+        return (codes * scale + offset).astype(np.float32)
+
+    def _transform_queries(self, vectors: NPArray) -> tuple[NPArray, NPArray]:
+        if self.__lower is None:
+            return vectors, np.zeros(len(vectors))
+        offset, scale = self.__get_offset_and_scale()
+        return vectors * scale, vectors @ offset
+
+    def __get_range(self) -> tuple[NPArray, NPArray]:
+        if self.__lower is None or self.__upper is None:
+            raise ValueError("The quantization range is not initialized.")
+        return self.__lower, self.__upper
+
+    def __get_offset_and_scale(self) -> tuple[NPArray, NPArray]:
+        lower, upper = self.__get_range()
+        return (lower + upper) / 2, (upper - lower) / (2 * INT8_MAX_CODE)
+
+    def __quantize(self, values: NPArray, offset: NPArray, scale: NPArray) -> NPArray:
+        return np.clip(np.rint((values - offset) / scale), -INT8_MAX_CODE, INT8_MAX_CODE).astype(np.int8)
+
+    def __get_padding(self, width: NPArray) -> NPArray:
+        return np.maximum(width * RANGE_PADDING_RATIO, MIN_RANGE_PADDING)
@@ -0,0 +1,357 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import replace
+
+import numpy as np
+from beartype.typing import Any
+
+from superlinked.framework.common.data_types import NPArray, Vector, get_vector_dtype
+from superlinked.framework.storage.in_memory.exception import (
+    VectorFieldDimensionException,
+    VectorFieldTypeException,
+)
+from superlinked.framework.storage.in_memory.in_memory_ivf_index import InMemoryIVFIndex
+from superlinked.framework.storage.in_memory.in_memory_ivf_params import (
+    InMemoryIVFParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_ivf_training import (
+    InMemoryIVFTraining,
+)
+from superlinked.framework.storage.in_memory.in_memory_quantization_params import (
+    InMemoryQuantizationParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_shard_pool import (
+    InMemoryShardPool,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_quantizer import (
+    InMemoryVectorQuantizer,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_store_snapshot import (
+    UNSTORED,
+    InMemoryVectorStoreSnapshot,
+    InMemoryVectorStoreState,
+)
+
+INITIAL_CAPACITY = 16
+GROWTH_FACTOR = 2
+# superseded positions are compacted away once they outnumber the current ones
+MAX_SUPERSEDED_RATIO = 0.5
+
+
+class InMemoryVectorStore:
+    """
+    Columnar storage of a single indexed vector field, the only copy of its vectors in the partition.
+    Vectors are kept in a contiguous, growable 2D matrix, their row numbers in a parallel array.
+    Row numbers are the dense integer ids of the rows in their partition, mapped to matrix positions by an array.
+    Positions are append-only, so the store can be read through snapshots while it is written: a new vector
+    of a row supersedes its previous position, and once half of the positions are superseded,
+    the current ones are compacted into new arrays.
+    If IVF params are given, an inverted file index is maintained for approximate search.
+    If quantization params are given, the matrix holds scalar-quantized vectors, and unless disabled,
+    the full precision vectors are kept in a second matrix for rescoring and reading them back.
+    If a shard pool is given, the matrix is allocated in its shared memory, so large searches can be sharded.
+    Bulk loaded arrays (e.g. memory-mapped snapshot blocks) are adopted as they are, and only copied on the first write.
+    Only a single thread may write the store at a time.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        ivf_params: InMemoryIVFParams | None = None,
+        quantization_params: InMemoryQuantizationParams | None = None,
+        shard_pool: InMemoryShardPool | None = None,
+    ) -> None:
+        self.__dimension = dimension
+        self.__ivf_params = ivf_params
+        self.__quantization_params = quantization_params
+        self.__shard_pool = shard_pool
+        self.__state = self.__create_state(INITIAL_CAPACITY, INITIAL_CAPACITY)
+        self.__size = 0
+        self.__superseded_positions = np.empty(0, dtype=np.int64)
+        # superseded since the last snapshot
+        self.__new_superseded_positions: list[int] = []
+        self.__is_closed = False
+
+    @property
+    def dimension(self) -> int:
+        return self.__dimension
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__is_closed
+
+    def validate(self, value: Any) -> Vector:
+        """
+        Return the value if it can be stored, raise a `ValidationException` otherwise.
+        """
+        if not isinstance(value, Vector):
+            raise VectorFieldTypeException(f"Indexed vector field contains non-vectors: {type(value)}")
+        if value.dimension != self.dimension:
+            raise VectorFieldDimensionException(
+                f"Indexed vector field contains vectors with wrong dimensions: {value.dimension}"
+            )
+        return value
+
+    def snapshot(self) -> InMemoryVectorStoreSnapshot:
+        """
+        Return a snapshot of the store, which later writes leave unchanged.
+        """
+        if self.__new_superseded_positions:
+            self.__superseded_positions = np.concatenate(
+                [self.__superseded_positions, np.array(self.__new_superseded_positions, dtype=np.int64)]
+            )
+            self.__new_superseded_positions = []
+        return InMemoryVectorStoreSnapshot(
+            self.__state, self.size, self.__superseded_positions, self.__quantization_params, self.__shard_pool
+        )
+
+    def upsert(self, row_number: int, value: Any) -> None:
+        vector = self.validate(value).value
+        if self.__count_superseded_positions() > self.size * MAX_SUPERSEDED_RATIO:
+            self.__compact()
+        self.__ensure_capacity(self.size + 1, row_number + 1)
+        state = self.__state
+        if state.quantizer and (quantizer := state.quantizer.fit(vector[None])) is not state.quantizer:
+            state = self.__requantize(quantizer)
+        position = self.size
+        if state.quantizer:
+            state.quantizer.encode(state.matrix[position : position + 1], vector[None])
+        else:
+            state.matrix[position] = vector
+        if state.full_precision_matrix is not None:
+            state.full_precision_matrix[position] = vector
+        previous_position = int(state.positions_by_row_number[row_number])
+        state.row_numbers[position] = row_number
+        state.previous_positions[position] = previous_position
+        state.next_positions[position] = UNSTORED
+        self.__size += 1
+        # the new position is linked before it becomes the position of the row, so readers can always follow it back
+        if previous_position != UNSTORED:
+            state.next_positions[previous_position] = position
+            self.__new_superseded_positions.append(previous_position)
+        state.positions_by_row_number[row_number] = position
+        if state.ivf_index:
+            state.ivf_index.update(position, self.size, self.__get_vectors)
+
+    def load(self, row_numbers: NPArray, vectors: NPArray) -> None:
+        """
+        Fill the empty store with the vectors of the row numbers in bulk.
+        Unless they have to be quantized or moved to shared memory, the arrays are adopted without copying
+        and only copied on the first write.
+        """
+        if self.size:
+            raise ValueError("Only an empty vector store can be loaded.")
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise VectorFieldDimensionException(
+                f"Indexed vector field contains vectors with wrong dimensions: {vectors.shape[1:]}"
+            )
+        if not len(row_numbers):
+            return
+        size = len(row_numbers)
+        row_number_array = np.asarray(row_numbers, dtype=np.int64)
+        positions_by_row_number = self.__create_positions(int(row_number_array.max()) + 1)
+        positions_by_row_number[row_number_array] = np.arange(size)
+        quantizer = self.__state.quantizer.fit(vectors) if self.__state.quantizer else None
+        if quantizer or self.__shard_pool:
+            matrix = self.__create_matrix(size, quantizer)
+            if quantizer:
+                quantizer.encode(matrix, vectors)
+            else:
+                matrix[:] = vectors
+        else:
+            matrix = vectors
+        self.__state = InMemoryVectorStoreState(
+            matrix,
+            vectors if self.__state.full_precision_matrix is not None else None,
+            quantizer,
+            row_number_array,
+            self.__create_positions(size),
+            self.__create_positions(size),
+            positions_by_row_number,
+            self.__create_ivf_index(),
+        )
+        self.__size = size
+
+    def is_ivf_training_due(self) -> bool:
+        return self.__state.ivf_index is not None and self.__state.ivf_index.is_training_due(self.size)
+
+    def start_ivf_training(self) -> InMemoryIVFTraining | None:
+        """
+        Start (re)training the IVF index if it is due, returning the training to run and pass to
+        `finish_ivf_training`. The training reads a snapshot of the store, so it may run while the store is written.
+        """
+        if self.__state.ivf_index is None or not self.is_ivf_training_due():
+            return None
+        return self.__state.ivf_index.start_training(self.size, self.snapshot().get_vectors)
+
+    def finish_ivf_training(self, training: InMemoryIVFTraining) -> None:
+        """
+        Install the lists of the training, unless the store got compacted since it was started.
+        """
+        if self.__state.ivf_index:
+            self.__state.ivf_index.finish_training(training, self.size, self.__get_vectors)
+
+    def cancel_ivf_training(self, training: InMemoryIVFTraining) -> None:
+        if self.__state.ivf_index:
+            self.__state.ivf_index.cancel_training(training)
+
+    def close(self) -> None:
+        """
+        Release the shared memory of the matrix. The store must not be used afterwards.
+        """
+        if self.__shard_pool:
+            self.__shard_pool.release(self.__state.matrix)
+        self.__is_closed = True
+
+    def __get_vectors(self, positions: slice | NPArray) -> NPArray:
+        rows = self.__state.matrix[: self.size][positions]
+        return self.__state.quantizer.decode(rows) if self.__state.quantizer else rows
+
+    def __count_superseded_positions(self) -> int:
+        return len(self.__superseded_positions) + len(self.__new_superseded_positions)
+
+    def __ensure_capacity(self, position_count: int, row_count: int) -> None:
+        # adopted arrays may be read-only memory maps, they get copied into owned arrays before the first write
+        state = self.__state
+        if position_count > len(state.matrix) or not state.matrix.flags.writeable or not (
+            state.row_numbers.flags.writeable
+            and (state.full_precision_matrix is None or state.full_precision_matrix.flags.writeable)
+        ):
+            # the positions of the arrays indexed by row number have to stay within the position arrays of the state
+            self.__state = self.__copy_state(
+                self.__get_capacity(len(state.matrix), position_count),
+                self.__get_capacity(len(state.positions_by_row_number), row_count),
+            )
+        elif row_count > len(state.positions_by_row_number):
+            positions_by_row_number = self.__create_positions(
+                self.__get_capacity(len(state.positions_by_row_number), row_count)
+            )
+            positions_by_row_number[: len(state.positions_by_row_number)] = state.positions_by_row_number
+            self.__state = replace(state, positions_by_row_number=positions_by_row_number)
+
+    def __copy_state(self, capacity: int, row_capacity: int) -> InMemoryVectorStoreState:
+        state = self.__state
+        size = self.size
+        matrix = self.__create_matrix(capacity, state.quantizer)
+        matrix[:size] = state.matrix[:size]
+        full_precision_matrix = None
+        if state.full_precision_matrix is not None:
+            full_precision_matrix = self.__create_full_precision_matrix(capacity)
+            full_precision_matrix[:size] = state.full_precision_matrix[:size]
+        row_numbers, previous_positions, next_positions, positions_by_row_number = (
+            self.__create_positions(capacity),
+            self.__create_positions(capacity),
+            self.__create_positions(capacity),
+            self.__create_positions(row_capacity),
+        )
+        row_numbers[:size] = state.row_numbers[:size]
+        previous_positions[:size] = state.previous_positions[:size]
+        next_positions[:size] = state.next_positions[:size]
+        positions_by_row_number[: len(state.positions_by_row_number)] = state.positions_by_row_number
+        return InMemoryVectorStoreState(
+            matrix,
+            full_precision_matrix,
+            state.quantizer,
+            row_numbers,
+            previous_positions,
+            next_positions,
+            positions_by_row_number,
+            state.ivf_index,
+        )
+
+    def __requantize(self, quantizer: InMemoryVectorQuantizer) -> InMemoryVectorStoreState:
+        state = self.__state
+        matrix = self.__create_matrix(len(state.matrix), quantizer)
+        matrix[: self.size] = state.matrix[: self.size]
+        if state.quantizer:
+            quantizer.recode(matrix[: self.size], state.quantizer)
+        self.__state = replace(state, matrix=matrix, quantizer=quantizer)
+        return self.__state
+
+    def __compact(self) -> None:
+        state = self.__state
+        positions = np.sort(state.positions_by_row_number[state.positions_by_row_number != UNSTORED])
+        size = len(positions)
+        capacity = self.__get_capacity(INITIAL_CAPACITY, size + 1)
+        matrix = self.__create_matrix(capacity, state.quantizer)
+        matrix[:size] = state.matrix[positions]
+        full_precision_matrix = None
+        if state.full_precision_matrix is not None:
+            full_precision_matrix = self.__create_full_precision_matrix(capacity)
+            full_precision_matrix[:size] = state.full_precision_matrix[positions]
+        row_numbers = self.__create_positions(capacity)
+        row_numbers[:size] = state.row_numbers[positions]
+        positions_by_row_number = self.__create_positions(len(state.positions_by_row_number))
+        positions_by_row_number[row_numbers[:size]] = np.arange(size)
+        self.__state = InMemoryVectorStoreState(
+            matrix,
+            full_precision_matrix,
+            state.quantizer,
+            row_numbers,
+            self.__create_positions(capacity),
+            self.__create_positions(capacity),
+            positions_by_row_number,
+            state.ivf_index.compact(positions) if state.ivf_index else None,
+        )
+        self.__size = size
+        self.__superseded_positions = np.empty(0, dtype=np.int64)
+        self.__new_superseded_positions = []
+
+    def __get_capacity(self, capacity: int, required_capacity: int) -> int:
+        capacity = max(capacity, 1)
+        while capacity < required_capacity:
+            capacity *= GROWTH_FACTOR
+        return capacity
+
+    def __create_state(self, capacity: int, row_capacity: int) -> InMemoryVectorStoreState:
+        quantizer = (
+            InMemoryVectorQuantizer.from_precision(self.__quantization_params.precision)
+            if self.__quantization_params
+            else None
+        )
+        return InMemoryVectorStoreState(
+            self.__create_matrix(capacity, quantizer),
+            (
+                self.__create_full_precision_matrix(capacity)
+                if self.__quantization_params and self.__quantization_params.keep_full_precision
+                else None
+            ),
+            quantizer,
+            self.__create_positions(capacity),
+            self.__create_positions(capacity),
+            self.__create_positions(capacity),
+            self.__create_positions(row_capacity),
+            self.__create_ivf_index(),
+        )
+
+    def __create_matrix(self, capacity: int, quantizer: InMemoryVectorQuantizer | None) -> NPArray:
+        shape = (capacity, self.dimension)
+        dtype = quantizer.dtype if quantizer else get_vector_dtype()
+        if self.__shard_pool:
+            return self.__shard_pool.allocate(shape, dtype)
+        return np.empty(shape, dtype=dtype)
+
+    def __create_full_precision_matrix(self, capacity: int) -> NPArray:
+        return np.empty((capacity, self.dimension), dtype=get_vector_dtype())
+
+    def __create_positions(self, capacity: int) -> NPArray:
+        return np.full(capacity, UNSTORED, dtype=np.int64)
+
+    def __create_ivf_index(self) -> InMemoryIVFIndex | None:
+        return InMemoryIVFIndex(self.__ivf_params) if self.__ivf_params else None
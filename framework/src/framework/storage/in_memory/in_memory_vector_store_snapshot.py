@@ -0,0 +1,214 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+import numpy as np
+from beartype.typing import Iterable, Sequence
+
+from superlinked.framework.common.calculation.vector_similarity import (
+    VectorSimilarityCalculator,
+)
+from superlinked.framework.common.data_types import NPArray, Vector, get_vector_dtype
+from superlinked.framework.storage.in_memory.in_memory_ivf_index import InMemoryIVFIndex
+from superlinked.framework.storage.in_memory.in_memory_quantization_params import (
+    InMemoryQuantizationParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_shard_pool import (
+    InMemoryShardPool,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_quantizer import (
+    InMemoryVectorQuantizer,
+)
+
+UNSTORED = -1
+
+
+@dataclass(frozen=True)
+class InMemoryVectorStoreState:
+    """
+    The arrays of an `InMemoryVectorStore`, indexed by position unless noted otherwise.
+    Positions are never overwritten: a new vector of a stored row is appended at a new position, linked to the
+    previous one. When an array has to grow or be rewritten, the store copies the arrays into a new state,
+    leaving the snapshots with the state they were taken of.
+    """
+
+    matrix: NPArray
+    full_precision_matrix: NPArray | None
+    quantizer: InMemoryVectorQuantizer | None
+    row_numbers: NPArray
+    # the position of the previous vector of the row, UNSTORED if none
+    previous_positions: NPArray
+    # the position of the next vector of the row, UNSTORED if none
+    next_positions: NPArray
+    # indexed by row number, the position of the last vector of the row, UNSTORED if none
+    positions_by_row_number: NPArray
+    ivf_index: InMemoryIVFIndex | None
+
+
+class InMemoryVectorStoreSnapshot:
+    """
+    The vectors of an `InMemoryVectorStore` as of the time the snapshot was taken, unaffected by later writes.
+    It reads the first `size` positions of its state, except the superseded ones: those whose rows got a newer
+    vector within the first `size` positions. Rows written since are followed back to their position as of then.
+    """
+
+    def __init__(
+        self,
+        state: InMemoryVectorStoreState,
+        size: int,
+        superseded_positions: NPArray,
+        quantization_params: InMemoryQuantizationParams | None,
+        shard_pool: InMemoryShardPool | None,
+    ) -> None:
+        self.__state = state
+        self.__size = size
+        self.__superseded_positions = superseded_positions
+        self.__quantization_params = quantization_params
+        self.__shard_pool = shard_pool
+
+    @property
+    def size(self) -> int:
+        """
+        The number of positions, including the superseded ones.
+        """
+        return self.__size
+
+    @property
+    def matrix(self) -> NPArray:
+        return self.__state.matrix[: self.size]
+
+    @property
+    def quantization_params(self) -> InMemoryQuantizationParams | None:
+        return self.__quantization_params
+
+    @property
+    def row_numbers(self) -> NPArray:
+        return self.__state.row_numbers[: self.size]
+
+    @property
+    def superseded_positions(self) -> NPArray:
+        """
+        The positions to be skipped when every position is read, in no particular order.
+        """
+        return self.__superseded_positions
+
+    def contains(self, row_number: int) -> bool:
+        return self.__get_position(row_number) != UNSTORED
+
+    def get_vector(self, row_number: int) -> Vector | None:
+        """
+        Return the vector of the row as a new full precision vector, or None if the row has no stored vector.
+        """
+        position = self.__get_position(row_number)
+        if position == UNSTORED:
+            return None
+        return Vector(np.array(self.get_full_precision_vectors(position), dtype=get_vector_dtype()))
+
+    def get_positions(self, row_numbers: Iterable[int]) -> NPArray:
+        row_number_array = np.fromiter(row_numbers, dtype=np.int64)
+        positions_by_row_number = self.__state.positions_by_row_number
+        positions = positions_by_row_number[row_number_array[row_number_array < len(positions_by_row_number)]]
+        while (is_later := positions >= self.size).any():
+            positions[is_later] = self.__state.previous_positions[positions[is_later]]
+        return positions[positions != UNSTORED]
+
+    def export_vectors(self) -> tuple[NPArray, NPArray]:
+        """
+        Return copies of the row numbers and the full precision vectors of the positions not superseded.
+        """
+        positions: slice | NPArray = slice(None)
+        if self.__superseded_positions.size:
+            is_current = np.ones(self.size, dtype=bool)
+            is_current[self.__superseded_positions] = False
+            positions = np.flatnonzero(is_current)
+        return np.array(self.row_numbers[positions]), np.array(self.get_full_precision_vectors(positions))
+
+    def get_vectors(self, positions: slice | NPArray) -> NPArray:
+        """
+        Return the (dequantized) vectors at the positions.
+        """
+        rows = self.matrix[positions]
+        return self.__state.quantizer.decode(rows) if self.__state.quantizer else rows
+
+    def get_full_precision_vectors(self, positions: int | slice | NPArray) -> NPArray:
+        """
+        Return the full precision vectors at the positions, or the dequantized ones if they are not kept.
+        """
+        if self.__state.full_precision_matrix is None:
+            return self.get_vectors(positions)
+        return self.__state.full_precision_matrix[: self.size][positions]
+
+    def calculate_similarities(
+        self, calculator: VectorSimilarityCalculator, vectors: NPArray, positions: NPArray | None
+    ) -> NPArray:
+        """
+        Return the similarities of the stored vectors at the positions (all if None, superseded ones included)
+        to the vectors, shaped (position count, vector count).
+        """
+        matrix = self.matrix if positions is None else self.matrix[positions]
+        if self.__state.quantizer:
+            return self.__state.quantizer.calculate_similarities(calculator, matrix, vectors)
+        return calculator.calculate_similarity_matrix_np(matrix, vectors)
+
+    def find_top_candidates(
+        self,
+        calculator: VectorSimilarityCalculator,
+        vectors: NPArray,
+        positions: NPArray | None,
+        candidate_counts: Sequence[int | None],
+        min_similarities: Sequence[float | None],
+    ) -> list[tuple[NPArray, NPArray]] | None:
+        """
+        Score the stored vectors at the positions (all but the superseded ones if None) shard by shard
+        in the worker processes, returning the positions and similarities of the best candidates
+        of every shard for every vector.
+        Returns None if the search is not sharded, in which case `calculate_similarities` has to be used.
+        """
+        if self.__shard_pool is None:
+            return None
+        return self.__shard_pool.find_top_candidates(
+            self.__state.matrix,
+            self.size,
+            positions,
+            self.__superseded_positions if positions is None else None,
+            self.__state.quantizer,
+            calculator,
+            vectors,
+            candidate_counts,
+            min_similarities,
+        )
+
+    def find_candidate_positions(self, vector: Vector) -> NPArray | None:
+        """
+        Return the positions worth scoring for the vector in ascending order,
+        or None if every position has to be scored.
+        """
+        if self.__state.ivf_index is None:
+            return None
+        candidates = self.__state.ivf_index.find_candidate_positions(vector.value)
+        if candidates is None:
+            return None
+        candidates = candidates[candidates < self.size]
+        next_positions = self.__state.next_positions[candidates]
+        return candidates[(next_positions == UNSTORED) | (next_positions >= self.size)]
+
+    def __get_position(self, row_number: int) -> int:
+        positions_by_row_number = self.__state.positions_by_row_number
+        if row_number >= len(positions_by_row_number):
+            return UNSTORED
+        position = int(positions_by_row_number[row_number])
+        while position >= self.size:
+            position = int(self.__state.previous_positions[position])
+        return position
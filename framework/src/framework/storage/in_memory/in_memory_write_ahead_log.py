@@ -0,0 +1,151 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import structlog
+from beartype.typing import Any, Iterator, Mapping
+
+from superlinked.framework.storage.in_memory.in_memory_write_ahead_log_params import (
+    InMemoryWriteAheadLogParams,
+)
+from superlinked.framework.storage.in_memory.json_codec import JsonDecoder, JsonEncoder
+from superlinked.framework.storage.in_memory.local_file_object_serializer import (
+    LocalFileObjectSerializer,
+)
+from superlinked.framework.storage.in_memory.object_serializer import ObjectSerializer
+
+logger = structlog.getLogger()
+
+MANIFEST_FILE_NAME = "manifest.json"
+SEGMENT_FILE_PATTERN = "segment.{number:08d}.wal"
+SEGMENT_FILE_GLOB = "segment.*.wal"
+SNAPSHOT_DIRECTORY_PATTERN = "snapshot.{number:08d}"
+SNAPSHOT_DIRECTORY_GLOB = "snapshot.*"
+
+
+class InMemoryWriteAheadLog:
+    """
+    Append-only log of the rows written to the in-memory vector database.
+    Every write batch is appended as a JSON line to the current log segment. Compaction starts a new segment,
+    writes a full snapshot next to it and only then drops the segments the snapshot covers, so a crash at any
+    point leaves a snapshot and a log tail that replay to the latest state. Replaying is idempotent,
+    as every batch is an upsert of field values.
+    Appends may continue while the snapshot is written: they go to the new segment, which the snapshot does not cover.
+    """
+
+    def __init__(self, params: InMemoryWriteAheadLogParams) -> None:
+        self.__params = params
+        self.__directory = Path(params.directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__manifest = self.__read_manifest()
+        # a new segment per process, so appends never continue a segment with a torn last line
+        self.__segment_number = max(self.__list_segment_numbers(), default=self.__manifest["first_segment"]) + 1
+        self.__log_size = sum(self.__get_segment_path(number).stat().st_size for number in self.__list_tail())
+        self.__snapshot_size = self.__get_snapshot_size()
+
+    @property
+    def snapshot_serializer(self) -> ObjectSerializer | None:
+        if self.__manifest["snapshot"] is None:
+            return None
+        return LocalFileObjectSerializer(self.__directory / self.__manifest["snapshot"])
+
+    def append(self, rows: Mapping[str, Mapping[str, Any]]) -> None:
+        line = json.dumps(rows, cls=JsonEncoder) + "\n"
+        with open(self.__get_segment_path(self.__segment_number), "a", encoding="utf-8") as segment:
+            segment.write(line)
+            segment.flush()
+            if self.__params.sync_writes:
+                os.fsync(segment.fileno())
+        self.__log_size += len(line)
+
+    def should_compact(self) -> bool:
+        return self.__log_size >= max(
+            self.__params.min_compaction_bytes, self.__params.compaction_ratio * self.__snapshot_size
+        )
+
+    def start_compaction(self) -> tuple[int, ObjectSerializer]:
+        """
+        Start a new segment, returning its number and the serializer to write the snapshot of the state before it to.
+        Must not overlap an append. The compaction is completed by `finish_compaction` once the snapshot is written.
+        """
+        self.__segment_number += 1
+        self.__log_size = 0
+        snapshot_directory = self.__get_snapshot_directory(self.__segment_number)
+        shutil.rmtree(snapshot_directory, ignore_errors=True)
+        return self.__segment_number, LocalFileObjectSerializer(snapshot_directory)
+
+    def finish_compaction(self, first_segment: int) -> None:
+        """
+        Switch to the snapshot written for the segments before the first segment, and drop them.
+        """
+        snapshot_name = self.__get_snapshot_directory(first_segment).name
+        self.__write_manifest({"snapshot": snapshot_name, "first_segment": first_segment})
+        self.__remove_compacted_files()
+        self.__snapshot_size = self.__get_snapshot_size()
+        logger.info("compacted write-ahead log", snapshot=snapshot_name, snapshot_size=self.__snapshot_size)
+
+    def read(self) -> Iterator[dict[str, dict[str, Any]]]:
+        for number in self.__list_tail():
+            yield from self.__read_segment(self.__get_segment_path(number))
+
+    def __read_segment(self, path: Path) -> Iterator[dict[str, dict[str, Any]]]:
+        with open(path, encoding="utf-8") as segment:
+            for line in segment:
+                try:
+                    yield json.loads(line, cls=JsonDecoder)
+                except json.JSONDecodeError:
+                    # only the last line of a segment can be incomplete, written during a crash
+                    logger.warning("skipped incomplete write-ahead log record", segment=path.name)
+
+    def __list_tail(self) -> list[int]:
+        return [number for number in self.__list_segment_numbers() if number >= self.__manifest["first_segment"]]
+
+    def __list_segment_numbers(self) -> list[int]:
+        return sorted(int(path.name.split(".")[1]) for path in self.__directory.glob(SEGMENT_FILE_GLOB))
+
+    def __get_segment_path(self, number: int) -> Path:
+        return self.__directory / SEGMENT_FILE_PATTERN.format(number=number)
+
+    def __get_snapshot_directory(self, number: int) -> Path:
+        return self.__directory / SNAPSHOT_DIRECTORY_PATTERN.format(number=number)
+
+    def __get_snapshot_size(self) -> int:
+        if self.__manifest["snapshot"] is None:
+            return 0
+        return sum(path.stat().st_size for path in (self.__directory / self.__manifest["snapshot"]).iterdir())
+
+    def __remove_compacted_files(self) -> None:
+        for number in self.__list_segment_numbers():
+            if number < self.__manifest["first_segment"]:
+                self.__get_segment_path(number).unlink(missing_ok=True)
+        for path in self.__directory.glob(SNAPSHOT_DIRECTORY_GLOB):
+            if path.name != self.__manifest["snapshot"]:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def __read_manifest(self) -> dict[str, Any]:
+        path = self.__directory / MANIFEST_FILE_NAME
+        if not path.exists():
+            return {"snapshot": None, "first_segment": 0}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def __write_manifest(self, manifest: dict[str, Any]) -> None:
+        path = self.__directory / MANIFEST_FILE_NAME
+        temporary_path = path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(temporary_path, path)
+        self.__manifest = manifest
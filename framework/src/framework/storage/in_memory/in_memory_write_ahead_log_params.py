@@ -0,0 +1,41 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+
+from superlinked.framework.common.exception import ValidationException
+
+
+@dataclass(frozen=True)
+class InMemoryWriteAheadLogParams:
+    """
+    Durability settings of the in-memory vector database.
+
+    Attributes:
+        directory (str): Local directory holding the log segments and the compacted snapshots.
+        compaction_ratio (float): A compacting snapshot is written once the log grows beyond this ratio
+            of the last snapshot's size, keeping the amortized checkpoint cost proportional to the changes.
+            Defaults to 1.0.
+        min_compaction_bytes (int): The log is never compacted below this size. Defaults to 64 MiB.
+        sync_writes (bool): Whether to fsync the log after every write. Defaults to False.
+    """
+
+    directory: str
+    compaction_ratio: float = 1.0
+    min_compaction_bytes: int = 64 * 1024 * 1024
+    sync_writes: bool = False
+
+    def __post_init__(self) -> None:
+        if self.compaction_ratio <= 0:
+            raise ValidationException(f"compaction_ratio must be positive, got {self.compaction_ratio}.")
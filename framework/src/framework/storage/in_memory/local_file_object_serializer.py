@@ -0,0 +1,73 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from beartype.typing import IO, Callable
+from typing_extensions import override
+
+from superlinked.framework.storage.in_memory.binary_object_serializer import (
+    BinaryObjectSerializer,
+)
+
+OBJECT_FILE_SUFFIX = ".json"
+ARRAY_FILE_SUFFIX = ".npy"
+TEMPORARY_FILE_SUFFIX = ".tmp"
+
+
+class LocalFileObjectSerializer(BinaryObjectSerializer):
+    """
+    Serializer storing objects as files in a local directory.
+    Arrays are saved in the `.npy` format and read back memory-mapped.
+    Files are written to a temporary file and renamed over the old one, so arrays still mapped from an earlier
+    snapshot keep their content instead of being truncated under their readers.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.__directory = Path(directory)
+
+    @override
+    def read(self, key: str) -> str:
+        return self.__get_path(key, OBJECT_FILE_SUFFIX).read_text(encoding="utf-8")
+
+    @override
+    def write(self, serialized_object: str, key: str) -> None:
+        self.__replace(self.__get_path(key, OBJECT_FILE_SUFFIX), lambda file: file.write(serialized_object.encode()))
+
+    @override
+    def read_array(self, key: str) -> np.ndarray:
+        return np.load(self.__get_path(key, ARRAY_FILE_SUFFIX), mmap_mode="r", allow_pickle=False)
+
+    @override
+    def write_array(self, array: np.ndarray, key: str) -> None:
+        self.__replace(self.__get_path(key, ARRAY_FILE_SUFFIX), lambda file: np.save(file, array, allow_pickle=False))
+
+    def __replace(self, path: Path, write: Callable[[IO[bytes]], object]) -> None:
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=path.name, suffix=TEMPORARY_FILE_SUFFIX, delete=False
+        ) as file:
+            try:
+                write(file)
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, path)
+
+    def __get_path(self, key: str, suffix: str) -> Path:
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        return self.__directory / f"{key}{suffix}"
@@ -230,8 +230,38 @@ class QdrantVDBConnector(VDBConnector):
             index_config,
             QdrantVDBKNNSearchParams.from_base(vdb_knn_search_params, self.collection_name, extended_fields_to_return),
         )
+        return self._get_result_entity_data_from_response(result, vdb_knn_search_params.fields_to_return)
+
+    @override
+    def _knn_search_batch(
+        self,
+        index_name: str,
+        schema_name: str,
+        vdb_knn_search_params_list: Sequence[VDBKNNSearchParams],
+        **params: Any,
+    ) -> Sequence[Sequence[ResultEntityData]]:
+        index_config = self._get_index_config(index_name)
+        results: Sequence[QueryResponse] = self._search.knn_search_batch_with_checks(
+            index_config,
+            [
+                QdrantVDBKNNSearchParams.from_base(
+                    vdb_knn_search_params,
+                    self.collection_name,
+                    list(vdb_knn_search_params.fields_to_return) + [ID_PAYLOAD_FIELD],
+                )
+                for vdb_knn_search_params in vdb_knn_search_params_list
+            ],
+        )
+        return [
+            self._get_result_entity_data_from_response(result, vdb_knn_search_params.fields_to_return)
+            for result, vdb_knn_search_params in zip(results, vdb_knn_search_params_list)
+        ]
+
+    def _get_result_entity_data_from_response(
+        self, result: QueryResponse, fields_to_return: Sequence[Field]
+    ) -> list[ResultEntityData]:
         return [
-            self._get_result_entity_data_from_point(point, vdb_knn_search_params.fields_to_return)
+            self._get_result_entity_data_from_point(point, fields_to_return)
             for point in self._calculate_sorted_result_points(result.points)
         ]
 
@@ -13,9 +13,10 @@
 # limitations under the License.
 
 
+from beartype.typing import Sequence
 from qdrant_client import QdrantClient
 from qdrant_client.conversions.common_types import QueryResponse
-from qdrant_client.models import SearchParams
+from qdrant_client.models import QueryRequest, SearchParams
 from typing_extensions import override
 
 from superlinked.framework.common.storage.index_config import IndexConfig
@@ -49,7 +50,6 @@ class QdrantSearch(Search[QdrantVDBKNNSearchParams, QdrantQuery, QueryResponse])
         index_config: IndexConfig,
         query: QdrantQuery,
     ) -> QueryResponse:
-        is_exact_search = index_config.vector_field_descriptor.search_algorithm == SearchAlgorithm.FLAT
         return self._client.query_points(
             collection_name=query.collection_name,
             query=query.vector.value,
@@ -57,7 +57,36 @@ class QdrantSearch(Search[QdrantVDBKNNSearchParams, QdrantQuery, QueryResponse])
             query_filter=query.filter_,
             limit=query.limit,
             score_threshold=query.score_treshold,
-            search_params=SearchParams(exact=is_exact_search),
+            search_params=self._get_search_params(index_config),
             with_vectors=query.with_vector,
             with_payload=query.returned_payload_fields,
         )
+
+    @override
+    def knn_search_batch(
+        self,
+        index_config: IndexConfig,
+        queries: Sequence[QdrantQuery],
+    ) -> Sequence[QueryResponse]:
+        if not queries:
+            return []
+        return self._client.query_batch_points(
+            collection_name=queries[0].collection_name,
+            requests=[
+                QueryRequest(
+                    query=query.vector.value.tolist(),
+                    using=index_config.vector_field_descriptor.field_name,
+                    filter=query.filter_,
+                    limit=query.limit,
+                    score_threshold=query.score_treshold,
+                    params=self._get_search_params(index_config),
+                    with_vector=query.with_vector,
+                    with_payload=query.returned_payload_fields,
+                )
+                for query in queries
+            ],
+        )
+
+    def _get_search_params(self, index_config: IndexConfig) -> SearchParams:
+        is_exact_search = index_config.vector_field_descriptor.search_algorithm == SearchAlgorithm.FLAT
+        return SearchParams(exact=is_exact_search)
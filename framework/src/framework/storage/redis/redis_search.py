@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 
-from beartype.typing import Any, cast
+from beartype.typing import Any, Sequence, cast
+from redis.commands.search.commands import SEARCH_CMD
 from typing_extensions import override
 
 from superlinked.framework.common.storage.index_config import IndexConfig
@@ -47,3 +49,31 @@ class RedisSearch(Search[VDBKNNSearchParams, VectorQueryObj, dict[bytes, Any]]):
     ) -> dict[bytes, Any]:
         result = self._client.client.ft(index_config.index_name).search(query.query, query.params)
         return cast(dict[bytes, Any], result)
+
+    @override
+    def knn_search_batch(
+        self,
+        index_config: IndexConfig,
+        queries: Sequence[VectorQueryObj],
+    ) -> Sequence[dict[bytes, Any]]:
+        """
+        Run the queries in a single pipeline round trip. The pipeline returns the raw replies,
+        so they are parsed like `search` parses the reply of a single query.
+        """
+        client = self._client.client
+        pipeline = client.pipeline(transaction=False)
+        for query in queries:
+            pipeline.ft(index_config.index_name).search(query.query, query.params)
+        start_time = time.time()
+        raw_results = pipeline.execute()
+        duration = (time.time() - start_time) * 1000.0
+        search = client.ft(index_config.index_name)
+        return [
+            cast(
+                dict[bytes, Any],
+                search._parse_results(  # pylint: disable=protected-access
+                    SEARCH_CMD, raw_result, query=query.query, duration=duration
+                ),
+            )
+            for raw_result, query in zip(raw_results, queries)
+        ]
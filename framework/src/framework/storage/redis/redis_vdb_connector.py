@@ -117,15 +117,32 @@ class RedisVDBConnector(VDBConnector):
         **params: Any,
     ) -> Sequence[ResultEntityData]:
         index_config = self._get_index_config(index_name)
-        result = self._encoder.convert_bytes_keys_dict(
-            self._search.knn_search_with_checks(index_config, vdb_knn_search_params)
-        )
+        result = self._search.knn_search_with_checks(index_config, vdb_knn_search_params)
+        return self._get_result_entity_data_from_result(result, vdb_knn_search_params.fields_to_return)
+
+    @override
+    def _knn_search_batch(
+        self,
+        index_name: str,
+        schema_name: str,
+        vdb_knn_search_params_list: Sequence[VDBKNNSearchParams],
+        **params: Any,
+    ) -> Sequence[Sequence[ResultEntityData]]:
+        index_config = self._get_index_config(index_name)
+        results = self._search.knn_search_batch_with_checks(index_config, vdb_knn_search_params_list)
+        return [
+            self._get_result_entity_data_from_result(result, vdb_knn_search_params.fields_to_return)
+            for result, vdb_knn_search_params in zip(results, vdb_knn_search_params_list)
+        ]
+
+    def _get_result_entity_data_from_result(
+        self, encoded_result: dict[bytes, Any], fields_to_return: Sequence[Field]
+    ) -> list[ResultEntityData]:
+        result = self._encoder.convert_bytes_keys_dict(encoded_result)
         return [
             ResultEntityData(
                 RedisVDBConnector._get_entity_id_from_redis_id(self._encoder._decode_string(document["id"])),
-                self._extract_fields_from_document(
-                    document["extra_attributes"], vdb_knn_search_params.fields_to_return
-                ),
+                self._extract_fields_from_document(document["extra_attributes"], fields_to_return),
                 self._convert_distance_to_score(
                     self._encoder._decode_double(document["extra_attributes"][DISTANCE_ID])
                 ),
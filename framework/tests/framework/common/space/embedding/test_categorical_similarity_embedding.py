@@ -0,0 +1,60 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.space.config.embedding.categorical_similarity_embedding_config import (
+    CategoricalSimilarityEmbeddingConfig,
+)
+from superlinked.framework.common.space.embedding.categorical_similarity_embedding import (
+    CategoricalSimilarityEmbedding,
+)
+
+CATEGORIES = ["a", "b", "c"]
+NEGATIVE_FILTER = -1.0
+
+
+def test_vectors_of_the_same_categories_share_their_negative_filter_mask() -> None:
+    embedding = CategoricalSimilarityEmbedding(
+        CategoricalSimilarityEmbeddingConfig(list, CATEGORIES, True, NEGATIVE_FILTER)
+    )
+    context = ExecutionContext(ExecutionEnvironment.IN_MEMORY)
+
+    vectors = [embedding.embed(categories, context) for categories in [["a", "c"], ["c", "a"], ["b"], ["x"], []]]
+
+    assert vectors[0].negative_filter_mask is vectors[1].negative_filter_mask
+    assert not vectors[0].negative_filter_mask.flags.writeable
+    assert [vector.negative_filter_mask.tolist() for vector in vectors] == [
+        [False, True, False, True],
+        [False, True, False, True],
+        [True, False, True, True],
+        # uncategorized inputs fall into the other category
+        [True, True, True, False],
+        [True, True, True, True],
+    ]
+    assert np.array_equal(
+        vectors[2].value, [NEGATIVE_FILTER, 1 / np.sqrt(len(CATEGORIES)), NEGATIVE_FILTER, NEGATIVE_FILTER]
+    )
+    assert [sorted(embedding.inverse_embed(vector, context)) for vector in vectors] == [
+        ["a", "c"],
+        ["a", "c"],
+        ["b"],
+        ["c_"],
+        [],
+    ]
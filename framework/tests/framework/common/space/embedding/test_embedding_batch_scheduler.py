@@ -0,0 +1,104 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from beartype.typing import Sequence
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.space.embedding.embedding_batch_scheduler import (
+    EmbeddingBatchScheduler,
+)
+
+# long enough for a batch to be only ever closed by reaching its maximal size
+LONG_WINDOW_MS = 60000
+SHORT_WINDOW_MS = 20
+WAIT_SECONDS = 10
+QUERY_CONTEXT = ExecutionContext(ExecutionEnvironment.QUERY)
+DOCUMENT_CONTEXT = ExecutionContext(ExecutionEnvironment.IN_MEMORY)
+
+
+class RecordingEmbedder:
+    """
+    Embeds the text `<number>` as `[number]`, recording the inputs and the kind of every call.
+    Fails the calls embedding the text `fail`.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls: list[tuple[bool, list[str]]] = []
+
+    def embed(self, inputs: Sequence[str], context: ExecutionContext) -> list[Vector]:
+        with self.lock:
+            self.calls.append((context.is_query_context, list(inputs)))
+        if "fail" in inputs:
+            raise ValueError("failed")
+        return [Vector(np.array([float(input_)])) for input_ in inputs]
+
+
+def _embed_concurrently(
+    scheduler: EmbeddingBatchScheduler, inputs_list: Sequence[Sequence[str]], context: ExecutionContext
+) -> list[list[list[float]]]:
+    with ThreadPoolExecutor(max_workers=len(inputs_list)) as executor:
+        futures = [executor.submit(scheduler.embed, inputs, context) for inputs in inputs_list]
+        return [[vector.value.tolist() for vector in future.result(WAIT_SECONDS)] for future in futures]
+
+
+def test_callers_get_the_vectors_of_their_own_inputs() -> None:
+    embedder = RecordingEmbedder()
+    inputs_list = [["1"], ["2", "3"], ["4", "5", "6"], ["7", "8"]]
+    scheduler = EmbeddingBatchScheduler(embedder.embed, LONG_WINDOW_MS, sum(len(inputs) for inputs in inputs_list))
+
+    results = _embed_concurrently(scheduler, inputs_list, DOCUMENT_CONTEXT)
+
+    assert results == [[[float(input_)] for input_ in inputs] for inputs in inputs_list]
+    # the batch is embedded at once, as soon as every input arrived
+    assert len(embedder.calls) == 1
+    assert sorted(embedder.calls[0][1]) == [input_ for inputs in inputs_list for input_ in inputs]
+
+
+def test_queries_and_documents_are_batched_apart() -> None:
+    embedder = RecordingEmbedder()
+    scheduler = EmbeddingBatchScheduler(embedder.embed, SHORT_WINDOW_MS, 100)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        query_results = executor.submit(_embed_concurrently, scheduler, [["1"], ["2"]], QUERY_CONTEXT)
+        document_results = executor.submit(_embed_concurrently, scheduler, [["3"], ["4"]], DOCUMENT_CONTEXT)
+
+        assert query_results.result(WAIT_SECONDS) == [[[1.0]], [[2.0]]]
+        assert document_results.result(WAIT_SECONDS) == [[[3.0]], [[4.0]]]
+    for is_query, inputs in embedder.calls:
+        assert set(inputs) <= ({"1", "2"} if is_query else {"3", "4"})
+
+
+def test_a_failed_batch_fails_every_caller_of_it() -> None:
+    embedder = RecordingEmbedder()
+    scheduler = EmbeddingBatchScheduler(embedder.embed, LONG_WINDOW_MS, 3)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(scheduler.embed, inputs, DOCUMENT_CONTEXT) for inputs in [["1", "2"], ["fail"]]]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(WAIT_SECONDS)
+    # the scheduler keeps serving the later callers
+    vectors = scheduler.embed(["3", "4", "5"], DOCUMENT_CONTEXT)
+    assert [vector.value.tolist() for vector in vectors] == [[3.0], [4.0], [5.0]]
@@ -0,0 +1,117 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from beartype.typing import Sequence
+
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.space.embedding.embedding_cache import (
+    EmbeddingCache,
+)
+
+CACHE_SIZE = 100
+WAIT_SECONDS = 10
+
+
+class RecordingEmbedder:
+    """
+    Embeds the text `<number>` as `[number]`, recording the inputs of every call.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed(self, inputs: Sequence[str]) -> list[Vector]:
+        self.calls.append(list(inputs))
+        return [Vector(np.array([float(input_)])) for input_ in inputs]
+
+
+def _to_lists(vectors: Sequence[Vector]) -> list[list[float]]:
+    return [vector.value.tolist() for vector in vectors]
+
+
+def test_get_or_embed_deduplicates_and_keeps_order() -> None:
+    cache = EmbeddingCache(CACHE_SIZE)
+    embedder = RecordingEmbedder()
+    cache.get_or_embed(["1"], ["1"], embedder.embed)
+
+    vectors = cache.get_or_embed(["2", "1", "3", "2"], ["2", "1", "3", "2"], embedder.embed)
+
+    assert _to_lists(vectors) == [[2.0], [1.0], [3.0], [2.0]]
+    assert embedder.calls == [["1"], ["2", "3"]]
+
+
+def test_get_or_embed_waits_for_keys_embedded_concurrently() -> None:
+    # without caching, a key is only shared while it is being embedded
+    cache = EmbeddingCache(0)
+    embedder = RecordingEmbedder()
+    is_first_embedding = threading.Event()
+    is_first_released = threading.Event()
+    is_second_embedding = threading.Event()
+
+    def embed_first(inputs: Sequence[str]) -> list[Vector]:
+        is_first_embedding.set()
+        assert is_first_released.wait(WAIT_SECONDS)
+        return embedder.embed(inputs)
+
+    def embed_second(inputs: Sequence[str]) -> list[Vector]:
+        # the keys of the caller are claimed before any of them is embedded
+        is_second_embedding.set()
+        return embedder.embed(inputs)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(cache.get_or_embed, ["1", "2"], ["1", "2"], embed_first)
+        assert is_first_embedding.wait(WAIT_SECONDS)
+        second = executor.submit(cache.get_or_embed, ["2", "3"], ["2", "3"], embed_second)
+        assert is_second_embedding.wait(WAIT_SECONDS)
+        is_first_released.set()
+
+        assert _to_lists(first.result(WAIT_SECONDS)) == [[1.0], [2.0]]
+        assert _to_lists(second.result(WAIT_SECONDS)) == [[2.0], [3.0]]
+    assert embedder.calls == [["3"], ["1", "2"]]
+
+
+def test_get_or_embed_embeds_again_what_a_concurrent_caller_failed_to() -> None:
+    cache = EmbeddingCache(0)
+    embedder = RecordingEmbedder()
+    is_first_embedding = threading.Event()
+    is_first_released = threading.Event()
+    is_second_embedding = threading.Event()
+
+    def fail_first(_: Sequence[str]) -> list[Vector]:
+        is_first_embedding.set()
+        assert is_first_released.wait(WAIT_SECONDS)
+        raise ValueError("failed")
+
+    def embed_second(inputs: Sequence[str]) -> list[Vector]:
+        is_second_embedding.set()
+        return embedder.embed(inputs)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(cache.get_or_embed, ["1"], ["1"], fail_first)
+        assert is_first_embedding.wait(WAIT_SECONDS)
+        second = executor.submit(cache.get_or_embed, ["1", "2"], ["1", "2"], embed_second)
+        assert is_second_embedding.wait(WAIT_SECONDS)
+        is_first_released.set()
+
+        with pytest.raises(ValueError):
+            first.result(WAIT_SECONDS)
+        # the failure is not passed on to the waiting caller, which embeds the key itself
+        assert _to_lists(second.result(WAIT_SECONDS)) == [[1.0], [2.0]]
+    assert embedder.calls == [["2"], ["1"]]
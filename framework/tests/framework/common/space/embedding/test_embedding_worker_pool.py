@@ -0,0 +1,65 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+from beartype.typing import Iterator, Sequence
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.data_types import NPArray
+from superlinked.framework.common.settings import Settings
+from superlinked.framework.common.space.embedding.embedding_worker_pool import (
+    EmbeddingWorkerPool,
+)
+
+WORKER_COUNT = 2
+EXIT_INPUT = "exit"
+
+
+def _embed_lengths(inputs: Sequence[str], _: ExecutionContext) -> NPArray:
+    # kills the worker process, breaking the pool like a crashing model would
+    if EXIT_INPUT in inputs:
+        os._exit(1)
+    return np.array([[float(len(input_))] for input_ in inputs])
+
+
+@pytest.fixture(name="worker_pool")
+def fixture_worker_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[EmbeddingWorkerPool]:
+    monkeypatch.setattr(Settings(), "SUPERLINKED_EMBEDDING_WORKER_COUNT", WORKER_COUNT)
+    monkeypatch.setattr(Settings(), "SUPERLINKED_EMBEDDING_WORKER_MIN_SHARD_SIZE", 1)
+    # a fresh pool instead of the process-wide singleton
+    pool = EmbeddingWorkerPool.__wrapped__()  # type: ignore[attr-defined]
+    yield pool
+    pool.close()
+
+
+def test_pool_restarts_after_a_worker_dies(worker_pool: EmbeddingWorkerPool) -> None:
+    context = ExecutionContext(ExecutionEnvironment.IN_MEMORY)
+    inputs = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    embeddings = worker_pool.embed(_embed_lengths, inputs, context)
+    with pytest.raises(BrokenProcessPool):
+        worker_pool.embed(_embed_lengths, ["a", EXIT_INPUT], context)
+    restarted_embeddings = worker_pool.embed(_embed_lengths, inputs, context)
+
+    assert worker_pool.should_shard(len(inputs))
+    assert embeddings.tolist() == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert np.array_equal(restarted_embeddings, embeddings)
@@ -0,0 +1,112 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from beartype.typing import Iterator
+from huggingface_hub import AsyncInferenceClient
+
+from superlinked.framework.common.space.embedding.hugging_face_async_client import (
+    HuggingFaceAsyncClient,
+)
+
+MAX_CONCURRENCY = 2
+SLOW_RESPONSE_SECONDS = 0.1
+BEHAVIORS = ["slow", "slow", "429", "ok", "503", "slow"]
+
+
+class StubEndpoint:
+    """
+    Feature extraction endpoint embedding the text `<index>:<behavior>` as `[index, 1]`.
+    The first request of a `429` or `503` text fails with that status, `slow` texts are answered slowly.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.attempts: Counter[str] = Counter()
+        self.in_flight_count = 0
+        self.peak_in_flight_count = 0
+
+    def respond(self, texts: list[str]) -> tuple[int, dict[str, str], list[list[float]]]:
+        with self.lock:
+            self.attempts.update(texts)
+            is_first_attempt = all(self.attempts[text] == 1 for text in texts)
+            self.in_flight_count += 1
+            self.peak_in_flight_count = max(self.peak_in_flight_count, self.in_flight_count)
+        try:
+            behaviors = {text.split(":")[1] for text in texts}
+            if is_first_attempt and "429" in behaviors:
+                return 429, {"Retry-After": "0"}, []
+            if is_first_attempt and "503" in behaviors:
+                return 503, {}, []
+            if "slow" in behaviors:
+                time.sleep(SLOW_RESPONSE_SECONDS)
+            return 200, {}, [[float(text.split(":")[0]), 1.0] for text in texts]
+        finally:
+            with self.lock:
+                self.in_flight_count -= 1
+
+
+@pytest.fixture(name="endpoint")
+def fixture_endpoint() -> Iterator[tuple[StubEndpoint, str]]:
+    endpoint = StubEndpoint()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # pylint: disable=invalid-name
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            inputs = payload["inputs"]
+            status, headers, embeddings = endpoint.respond(inputs if isinstance(inputs, list) else [inputs])
+            body = json.dumps(embeddings if status == 200 else {"error": "unavailable"}).encode()
+            self.send_response(status)
+            for name, value in {**headers, "Content-Type": "application/json"}.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # pylint: disable=redefined-builtin
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield endpoint, f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_feature_extraction_retries_and_keeps_order(endpoint: tuple[StubEndpoint, str]) -> None:
+    stub, base_url = endpoint
+    client = HuggingFaceAsyncClient(
+        AsyncInferenceClient(base_url=base_url, provider="hf-inference"),
+        MAX_CONCURRENCY,
+        max_retries=2,
+        retry_base_delay_ms=1,
+    )
+    texts = [f"{i}:{BEHAVIORS[i % len(BEHAVIORS)]}" for i in range(12)]
+
+    embeddings = client.feature_extraction([[text] for text in texts])
+
+    assert [embedding.tolist() for embedding in embeddings] == [[[float(i), 1.0]] for i in range(len(texts))]
+    assert all(stub.attempts[text] == (2 if text.endswith(("429", "503")) else 1) for text in texts)
+    assert stub.peak_in_flight_count == MAX_CONCURRENCY
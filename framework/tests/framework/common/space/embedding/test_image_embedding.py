@@ -0,0 +1,80 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import base64
+import io
+
+import numpy as np
+import pytest
+from beartype.typing import Sequence
+from PIL import Image
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.schema.image_data import ImageData
+from superlinked.framework.common.space.config.embedding.image_embedding_config import (
+    ImageEmbeddingConfig,
+    ModelHandler,
+)
+from superlinked.framework.common.space.embedding.image_embedding import (
+    ImageEmbedding,
+)
+from superlinked.framework.common.util.image_util import ImageUtil
+
+MODEL_NAME = "model"
+LENGTH = 2
+
+
+class RecordingManager:
+    """
+    Embeds an image of width `w` as `[w, 1]`, recording the widths of the embedded images.
+    """
+
+    def __init__(self) -> None:
+        self.embedded_widths: list[int] = []
+
+    def embed(self, inputs: Sequence[Image.Image | str | None], _: ExecutionContext) -> list[Vector | None]:
+        images = [input_ if isinstance(input_, Image.Image) else None for input_ in inputs]
+        self.embedded_widths.extend(image.width for image in images if image is not None)
+        return [None if image is None else Vector(np.array([float(image.width), 1.0])) for image in images]
+
+
+def _open_image(width: int, image_format: str = "PNG") -> ImageData:
+    # every image is opened anew from its encoded bytes, like the ones of the requests
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, 1), "red").save(buffer, format=image_format)
+    image, image_hash = ImageUtil.open_image_with_hash(base64.b64encode(buffer.getvalue()))
+    return ImageData(image, None, image_hash)
+
+
+def test_images_are_cached_by_the_hash_of_their_encoded_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    manager = RecordingManager()
+    monkeypatch.setattr(ImageEmbedding, "init_manager", classmethod(lambda cls, *_: manager))
+    embedding = ImageEmbedding(ImageEmbeddingConfig(ImageData, MODEL_NAME, None, ModelHandler.OPEN_CLIP, LENGTH))
+    context = ExecutionContext(ExecutionEnvironment.IN_MEMORY)
+
+    vectors = embedding.embed_multiple([_open_image(1), _open_image(2), _open_image(1)], context)
+    embedding.embed_multiple([_open_image(2), _open_image(1, "BMP")], context)
+    # an image without a hash cannot be identified without decoding it, so it is embedded every time
+    unhashed_image = _open_image(3)
+    embedding.embed_multiple([ImageData(unhashed_image.image, None), ImageData(unhashed_image.image, None)], context)
+
+    assert np.array_equal(vectors[0].value, vectors[2].value)
+    assert not np.array_equal(vectors[0].value, vectors[1].value)
+    # the same pixels encoded differently are other bytes, so they are embedded again
+    assert manager.embedded_widths == [1, 2, 1, 3, 3]
@@ -0,0 +1,91 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+
+import numpy as np
+import pytest
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.space.config.embedding.number_embedding_config import (
+    LinearScale,
+    LogarithmicScale,
+    Mode,
+    NumberEmbeddingConfig,
+    Scale,
+)
+from superlinked.framework.common.space.embedding.number_embedding import (
+    NumberEmbedding,
+)
+
+MIN_VALUE = 1.0
+MAX_VALUE = 1000.0
+NEGATIVE_FILTER = -5.0
+INPUTS = [0.0, 1.0, 2.5, 10.0, 999.0, 1000.0, 5000.0]
+
+
+def _transform(value: float, scale: Scale) -> float:
+    return math.log(1 + value, scale.base) if isinstance(scale, LogarithmicScale) else value
+
+
+def _embed_scalar(config: NumberEmbeddingConfig, input_: float) -> list[float]:
+    """
+    The former per-input implementation of `NumberEmbedding.embed`, clamping after the transformation.
+    """
+    if (input_ < config.min_value and config.mode in {Mode.MAXIMUM, Mode.SIMILAR}) or (
+        input_ > config.max_value and config.mode in {Mode.MINIMUM, Mode.SIMILAR}
+    ):
+        return [0.0, 0.0, config.negative_filter]
+    transformed_min, transformed_max = _transform(config.min_value, config.scale), _transform(
+        config.max_value, config.scale
+    )
+    constrained_input = min(max(transformed_min, _transform(input_, config.scale)), transformed_max)
+    angle_in_radians = (constrained_input - transformed_min) / (transformed_max - transformed_min) * math.pi / 2
+    return [math.sin(angle_in_radians), math.cos(angle_in_radians), 0.0]
+
+
+@pytest.mark.parametrize("mode", list(Mode))
+@pytest.mark.parametrize("scale", [LinearScale(), LogarithmicScale(), LogarithmicScale(2)])
+def test_embed_multiple_matches_the_scalar_formulas(mode: Mode, scale: Scale) -> None:
+    config = NumberEmbeddingConfig(float, MIN_VALUE, MAX_VALUE, mode, scale, NEGATIVE_FILTER)
+    embedding = NumberEmbedding[float](config)
+    context = ExecutionContext(ExecutionEnvironment.IN_MEMORY)
+
+    vectors = embedding.embed_multiple(INPUTS, context)
+
+    for vector, input_ in zip(vectors, INPUTS):
+        assert np.allclose(vector.value, _embed_scalar(config, input_), rtol=0, atol=1e-12)
+        assert vector.negative_filter_indices == {2}
+    assert embedding.embed(INPUTS[2], context).value.tolist() == vectors[2].value.tolist()
+
+
+@pytest.mark.parametrize("mode", list(Mode))
+def test_inverse_embed_multiple_restores_the_inputs(mode: Mode) -> None:
+    config = NumberEmbeddingConfig(float, MIN_VALUE, MAX_VALUE, mode, LogarithmicScale(), NEGATIVE_FILTER)
+    embedding = NumberEmbedding[float](config)
+    context = ExecutionContext(ExecutionEnvironment.IN_MEMORY)
+    in_bounds_inputs = [1.0, 2.5, 10.0, 999.0]
+    out_of_bounds_value = MIN_VALUE - 0.999 if mode == Mode.MAXIMUM else MAX_VALUE + 0.999
+
+    inverted = embedding.inverse_embed_multiple(embedding.embed_multiple(in_bounds_inputs, context), context)
+    out_of_bounds_inverted = embedding.inverse_embed_multiple(
+        [embedding.embed(0.0 if mode == Mode.MAXIMUM else 5000.0, context)], context
+    )
+
+    assert np.allclose(inverted, in_bounds_inputs)
+    assert out_of_bounds_inverted == pytest.approx([out_of_bounds_value])
@@ -0,0 +1,71 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from huggingface_hub import snapshot_download
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.space.embedding.onnx_manager import (
+    OnnxManager,
+)
+from superlinked.framework.common.space.embedding.sentence_transformer_manager import (
+    SentenceTransformerManager,
+)
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+TEXTS = [
+    "The quick brown fox jumps over the lazy dog.",
+    "Vector databases index embeddings for similarity search.",
+    "short",
+    "A considerably longer sentence, which is there to make sure that padding to the longest input of the batch "
+    "does not change the embeddings of the shorter inputs in the same batch.",
+]
+
+
+@pytest.fixture(name="model_cache_dir", scope="module")
+def fixture_model_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # the ONNX backend is an optional extra of sentence-transformers
+    pytest.importorskip("onnxruntime")
+    model_cache_dir = tmp_path_factory.mktemp("models")
+    try:
+        snapshot_download(repo_id=MODEL_NAME, cache_dir=str(model_cache_dir))
+    except OSError as e:
+        # offline, or the Hub is not reachable
+        pytest.skip(f"{MODEL_NAME} is not available: {e}")
+    return model_cache_dir
+
+
+def _embed(manager: SentenceTransformerManager) -> np.ndarray:
+    vectors = manager.embed_text(TEXTS, ExecutionContext(ExecutionEnvironment.IN_MEMORY))
+    return np.array([vector.value for vector in vectors])
+
+
+def _calculate_cosine_similarities(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    return np.sum(left * right, axis=1) / (np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1))
+
+
+@pytest.mark.parametrize(("is_quantized", "min_similarity"), [(False, 0.9999), (True, 0.95)])
+def test_onnx_embeddings_match_pytorch(model_cache_dir: Path, is_quantized: bool, min_similarity: float) -> None:
+    pytorch_embeddings = _embed(SentenceTransformerManager(MODEL_NAME, model_cache_dir))
+    onnx_embeddings = _embed(OnnxManager(MODEL_NAME, model_cache_dir, is_quantized=is_quantized))
+
+    assert onnx_embeddings.shape == pytorch_embeddings.shape
+    assert np.all(_calculate_cosine_similarities(onnx_embeddings, pytorch_embeddings) >= min_similarity)
@@ -0,0 +1,53 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from pathlib import Path
+
+import numpy as np
+
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.space.embedding.persistent_embedding_cache import (
+    PersistentEmbeddingCache,
+)
+
+MODEL_NAME = "model"
+PROMPT_NAME = "document"
+
+
+def test_stored_vectors_are_read_by_other_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache" / "embeddings.db")
+    vectors = [Vector(np.array([0.5, 1.0])), Vector(np.array([-2.0, 0.25]))]
+    PersistentEmbeddingCache(path).put_many(MODEL_NAME, PROMPT_NAME, ["first", "second"], vectors)
+
+    cache = PersistentEmbeddingCache(path)
+    stored_vectors = cache.get_many(MODEL_NAME, PROMPT_NAME, ["second", "missing", "first"])
+
+    assert [None if vector is None else vector.tolist() for vector in stored_vectors] == [
+        [-2.0, 0.25],
+        None,
+        [0.5, 1.0],
+    ]
+    # the vectors of other models and prompts are kept apart
+    assert cache.get_many("other", PROMPT_NAME, ["first"]) == [None]
+    assert cache.get_many(MODEL_NAME, "query", ["first"]) == [None]
+
+
+def test_database_errors_are_cache_misses(tmp_path: Path) -> None:
+    # a directory cannot be opened as the database
+    cache = PersistentEmbeddingCache(str(tmp_path))
+
+    cache.put_many(MODEL_NAME, PROMPT_NAME, ["first"], [Vector(np.array([1.0]))])
+
+    assert cache.get_many(MODEL_NAME, PROMPT_NAME, ["first"]) == [None]
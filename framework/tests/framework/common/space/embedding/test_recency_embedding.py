@@ -0,0 +1,99 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=protected-access
+
+import math
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from superlinked.framework.common.dag.context import (
+    CONTEXT_COMMON,
+    CONTEXT_COMMON_NOW,
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.dag.period_time import PeriodTime
+from superlinked.framework.common.space.config.embedding.recency_embedding_config import (
+    RecencyEmbeddingConfig,
+)
+from superlinked.framework.common.space.embedding.recency_embedding import (
+    RecencyEmbedding,
+)
+
+NOW = 1_700_000_000
+DAY = 24 * 60 * 60
+PERIOD_TIMES = [PeriodTime(timedelta(days=30), 2.0), PeriodTime(timedelta(days=1)), PeriodTime(timedelta(days=7), 0.5)]
+NEGATIVE_FILTER = -5.0
+
+
+def _create_context(environment: ExecutionEnvironment) -> ExecutionContext:
+    return ExecutionContext.from_context_data({CONTEXT_COMMON: {CONTEXT_COMMON_NOW: NOW}}, environment)
+
+
+def _embed_scalar(embedding: RecencyEmbedding, created_at: int, context: ExecutionContext) -> list[float]:
+    """
+    The former per-input and per-period implementation of `RecencyEmbedding.embed`.
+    """
+    values: list[float] = []
+    time_period_end = embedding._calculate_time_period_end(context.now())
+    for period_time in sorted(PERIOD_TIMES, key=lambda period_time: period_time.period_time):
+        time_period_start = embedding._calculate_time_period_start(period_time, context.now())
+        out_of_time_scope = not time_period_start <= created_at <= time_period_end
+        if out_of_time_scope:
+            x_value = y_value = 0.0
+        else:
+            normalized_time_elapsed = (created_at - time_period_start) / (time_period_end - time_period_start)
+            x_value = math.cos(normalized_time_elapsed * math.pi / 2) * period_time.weight
+            y_value = math.sin(normalized_time_elapsed * math.pi / 2) * period_time.weight
+        values.extend([x_value, y_value])
+        if period_time == embedding.max_period_time:
+            if context.is_query_context:
+                values.append(1.0)
+            else:
+                values.append(NEGATIVE_FILTER if out_of_time_scope else 0.0)
+    return values
+
+
+@pytest.mark.parametrize("environment", [ExecutionEnvironment.IN_MEMORY, ExecutionEnvironment.QUERY])
+def test_embed_multiple_matches_the_scalar_formulas(environment: ExecutionEnvironment) -> None:
+    embedding = RecencyEmbedding(RecencyEmbeddingConfig(int, PERIOD_TIMES, timedelta(hours=3), NEGATIVE_FILTER))
+    context = _create_context(environment)
+    # spans timestamps after the end, inside each period and before the start of the longest period
+    created_ats = [NOW + 2 * DAY, NOW, NOW - DAY // 2, NOW - 3 * DAY, NOW - 20 * DAY, NOW - 40 * DAY]
+
+    vectors = embedding.embed_multiple(created_ats, context)
+
+    assert [vector.dimension for vector in vectors] == [embedding.length] * len(created_ats)
+    for vector, created_at in zip(vectors, created_ats):
+        assert np.allclose(vector.value, _embed_scalar(embedding, created_at, context), rtol=0, atol=1e-12)
+        assert vector.negative_filter_indices == {embedding.length - 1}
+    assert embedding.embed(created_ats[1], context).value.tolist() == vectors[1].value.tolist()
+
+
+def test_inverse_embed_multiple_restores_the_timestamps() -> None:
+    embedding = RecencyEmbedding(RecencyEmbeddingConfig(int, PERIOD_TIMES, timedelta(hours=3), NEGATIVE_FILTER))
+    context = _create_context(ExecutionEnvironment.IN_MEMORY)
+    time_period_start = embedding._calculate_time_period_start(embedding.max_period_time, NOW)
+    created_ats = [NOW, NOW - 3 * DAY, NOW - 20 * DAY]
+
+    vectors = embedding.embed_multiple(created_ats + [NOW - 40 * DAY], context)
+
+    inverted = embedding.inverse_embed_multiple(vectors, context)
+
+    # timestamps before the longest period are restored as the second before it
+    assert inverted == created_ats + [time_period_start - 1]
+    assert embedding.inverse_embed_multiple([], context) == []
@@ -0,0 +1,86 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# pylint: disable=protected-access
+
+import numpy as np
+import pytest
+import torch
+from beartype.typing import Any, Sequence
+
+from superlinked.framework.common.dag.context import (
+    ExecutionContext,
+    ExecutionEnvironment,
+)
+from superlinked.framework.common.space.embedding.sentence_transformer_manager import (
+    SentenceTransformerManager,
+)
+
+BATCH_SIZE = 4
+TOKEN_BUDGET = 12
+
+
+class StubTokenizer:
+    padding_side = "right"
+
+
+class StubModel:
+    """
+    Tokenizes a text of space-separated numbers into those numbers as token ids,
+    and embeds it as `[sum of its token ids, number of its tokens]`. Records the shapes of the batches.
+    """
+
+    def __init__(self) -> None:
+        self.prompts: dict[str, str] = {}
+        self.default_prompt_name: str | None = None
+        self.tokenizer = StubTokenizer()
+        self.device = torch.device("cpu")
+        self.tokenize_count = 0
+        self.batch_shapes: list[tuple[int, int]] = []
+
+    def tokenize(self, texts: Sequence[str]) -> dict[str, Any]:
+        self.tokenize_count += 1
+        token_ids = [[int(token) for token in text.split()] for text in texts]
+        width = max(len(ids) for ids in token_ids)
+        return {
+            "input_ids": torch.tensor([ids + [0] * (width - len(ids)) for ids in token_ids]),
+            "attention_mask": torch.tensor([[1] * len(ids) + [0] * (width - len(ids)) for ids in token_ids]),
+        }
+
+    def forward(self, features: dict[str, Any]) -> dict[str, torch.Tensor]:
+        self.batch_shapes.append(tuple(features["input_ids"].shape))
+        input_ids, attention_mask = features["input_ids"], features["attention_mask"]
+        return {
+            "sentence_embedding": torch.stack(
+                [(input_ids * attention_mask).sum(dim=1), attention_mask.sum(dim=1)], dim=1
+            ).float()
+        }
+
+
+def test_token_budget_batching_preserves_the_input_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = np.random.default_rng(0)
+    texts = [" ".join(str(token) for token in rng.integers(1, 100, rng.integers(1, 10))) for _ in range(30)]
+    model = StubModel()
+    manager = SentenceTransformerManager("model", batch_size=BATCH_SIZE, token_budget=TOKEN_BUDGET)
+    monkeypatch.setattr(manager, "_get_embedding_model", lambda _: model)
+
+    embeddings = manager._embed(texts, ExecutionContext(ExecutionEnvironment.IN_MEMORY))
+
+    expected_embeddings = [[sum(int(token) for token in text.split()), len(text.split())] for text in texts]
+    assert embeddings.tolist() == expected_embeddings
+    assert model.tokenize_count == 1
+    assert len(model.batch_shapes) > 1
+    # every batch is padded to its own longest text only, and fits the budget unless it is a single long text
+    assert all(size <= BATCH_SIZE and (size * width <= TOKEN_BUDGET or size == 1) for size, width in model.batch_shapes)
@@ -0,0 +1,114 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+from beartype.typing import Any, Callable
+
+from superlinked.framework.common.interface.comparison_operand import (
+    ComparisonOperation,
+)
+from superlinked.framework.common.interface.comparison_operation_type import (
+    ComparisonOperationType,
+)
+from superlinked.framework.common.storage.field.field import Field
+from superlinked.framework.common.storage.field.field_data_type import FieldDataType
+from superlinked.framework.storage.in_memory.in_memory_field_index import (
+    InMemoryFieldIndex,
+)
+
+ROW_COUNT = 60
+NUMBER_FIELD = Field(FieldDataType.INT, "number")
+TEXT_FIELD = Field(FieldDataType.STRING, "text")
+TAGS_FIELD = Field(FieldDataType.STRING_LIST, "tags")
+
+
+def _create_number(row_id: int) -> int | None:
+    return None if row_id % 7 == 0 else row_id % 10
+
+
+def _create_text(row_id: int) -> str | None:
+    return None if row_id % 5 == 0 else f"text{row_id % 4}"
+
+
+def _create_tags(row_id: int) -> list[str] | None:
+    return None if row_id % 6 == 0 else [f"tag{row_id % 3}", f"tag{row_id % 5}"]
+
+
+def _create_index(values: dict[int, Any]) -> InMemoryFieldIndex:
+    index = InMemoryFieldIndex()
+    for row_id, value in values.items():
+        index.update(row_id, value)
+    # rewrites and removals, which have to be reflected by both the inverted maps and the sorted values
+    for row_id in range(0, ROW_COUNT, 4):
+        index.update(row_id, values[(row_id + 1) % ROW_COUNT])
+        values[row_id] = values[(row_id + 1) % ROW_COUNT]
+    for row_id in range(0, ROW_COUNT, 9):
+        index.update(row_id, None)
+        values[row_id] = None
+    return index
+
+
+@pytest.mark.parametrize(
+    ("field", "create_value", "operations"),
+    [
+        (
+            NUMBER_FIELD,
+            _create_number,
+            [
+                (ComparisonOperationType.EQUAL, 3),
+                (ComparisonOperationType.NOT_EQUAL, 3),
+                (ComparisonOperationType.IN, [1, 2, 11]),
+                (ComparisonOperationType.NOT_IN, [1, 2]),
+                (ComparisonOperationType.GREATER_THAN, 4),
+                (ComparisonOperationType.GREATER_EQUAL, 4),
+                (ComparisonOperationType.LESS_THAN, 6),
+                (ComparisonOperationType.LESS_EQUAL, 6),
+            ],
+        ),
+        (
+            TEXT_FIELD,
+            _create_text,
+            [
+                (ComparisonOperationType.EQUAL, "text1"),
+                (ComparisonOperationType.NOT_EQUAL, "text1"),
+                (ComparisonOperationType.IN, ["text0", "text2", "other"]),
+                (ComparisonOperationType.NOT_IN, ["text0"]),
+            ],
+        ),
+        (
+            TAGS_FIELD,
+            _create_tags,
+            [
+                (ComparisonOperationType.CONTAINS, ["tag1"]),
+                (ComparisonOperationType.CONTAINS, ["tag1", "tag4"]),
+                (ComparisonOperationType.NOT_CONTAINS, ["tag2"]),
+                (ComparisonOperationType.CONTAINS_ALL, ["tag0", "tag3"]),
+            ],
+        ),
+    ],
+)
+def test_find_row_ids_matches_evaluation(
+    field: Field, create_value: Callable[[int], Any], operations: list[tuple[ComparisonOperationType, Any]]
+) -> None:
+    values = {row_id: create_value(row_id) for row_id in range(ROW_COUNT)}
+    index = _create_index(values)
+    all_row_ids = set(values)
+
+    for op, other in operations:
+        operation = ComparisonOperation(op, field, other)
+        row_ids = index.find_row_ids(operation, all_row_ids)
+
+        assert row_ids is not None, op
+        assert set(row_ids) == {row_id for row_id, value in values.items() if operation.evaluate(value)}, op
@@ -0,0 +1,335 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from beartype.typing import Any, Callable, Mapping, Sequence
+
+from superlinked.framework.common.calculation.distance_metric import DistanceMetric
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.common.interface.comparison_operand import (
+    ComparisonOperation,
+)
+from superlinked.framework.common.storage.entity.entity import Entity
+from superlinked.framework.common.storage.entity.entity_data import EntityData
+from superlinked.framework.common.storage.entity.entity_id import EntityId
+from superlinked.framework.common.storage.field.field import Field
+from superlinked.framework.common.storage.field.field_data import (
+    FieldData,
+    VectorFieldData,
+)
+from superlinked.framework.common.storage.field.field_data_type import FieldDataType
+from superlinked.framework.common.storage.index_config import IndexConfig
+from superlinked.framework.common.storage.query.vdb_knn_search_params import (
+    VDBKNNSearchParams,
+)
+from superlinked.framework.common.storage.search_index.index_field_descriptor import (
+    IndexFieldDescriptor,
+    VectorIndexFieldDescriptor,
+)
+from superlinked.framework.common.storage.search_index.search_algorithm import (
+    SearchAlgorithm,
+)
+from superlinked.framework.common.storage.search_index.vector_component_precision import (
+    VectorComponentPrecision,
+)
+from superlinked.framework.storage.common.vdb_settings import VDBSettings
+from superlinked.framework.storage.in_memory.exception import (
+    VectorFieldDimensionException,
+)
+from superlinked.framework.storage.in_memory.in_memory_ivf_params import (
+    InMemoryIVFParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_quantization_params import (
+    InMemoryQuantizationParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_vdb import InMemoryVDB
+from superlinked.framework.storage.in_memory.in_memory_sharding_params import (
+    InMemoryShardingParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_precision import (
+    InMemoryVectorPrecision,
+)
+from superlinked.framework.storage.in_memory.in_memory_write_ahead_log_params import (
+    InMemoryWriteAheadLogParams,
+)
+from superlinked.framework.storage.in_memory.local_file_object_serializer import (
+    LocalFileObjectSerializer,
+)
+
+DIMENSION = 8
+SCHEMA_ID = "schema"
+INDEX_NAME = "index"
+ENTITY_COUNT = 400
+QUERY_COUNT = 20
+LIMIT = 10
+NUMBER_COUNT = 5
+MIN_QUANTIZED_RECALL = 0.9
+SCHEMA_ID_FIELD = Field(FieldDataType.STRING, "__schema_id__")
+NUMBER_FIELD = Field(FieldDataType.INT, "number")
+VECTOR_FIELD = Field(FieldDataType.VECTOR, "vector")
+
+
+def _create_vdb(search_algorithm: SearchAlgorithm = SearchAlgorithm.FLAT, **kwargs: Any) -> InMemoryVDB:
+    vdb = InMemoryVDB(VDBSettings(-1), search_algorithm, **kwargs)
+    vdb.init_search_index_configs(
+        [
+            IndexConfig(
+                INDEX_NAME,
+                VectorIndexFieldDescriptor(
+                    VECTOR_FIELD.name,
+                    DIMENSION,
+                    DistanceMetric.INNER_PRODUCT,
+                    search_algorithm,
+                    VectorComponentPrecision.FLOAT32,
+                ),
+                [
+                    IndexFieldDescriptor(FieldDataType.STRING, SCHEMA_ID_FIELD.name),
+                    IndexFieldDescriptor(FieldDataType.INT, NUMBER_FIELD.name),
+                ],
+            )
+        ],
+        create_search_indices=True,
+    )
+    return vdb
+
+
+def _create_vectors(count: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, DIMENSION))
+
+
+def _create_entity_data(
+    object_id: int, vector: np.ndarray, schema_id: str = SCHEMA_ID, number_shift: int = 0
+) -> EntityData:
+    return EntityData(
+        EntityId(schema_id, str(object_id)),
+        {
+            SCHEMA_ID_FIELD.name: FieldData.from_field(SCHEMA_ID_FIELD, schema_id),
+            NUMBER_FIELD.name: FieldData.from_field(NUMBER_FIELD, (object_id + number_shift) % NUMBER_COUNT),
+            VECTOR_FIELD.name: VectorFieldData(VECTOR_FIELD.name, Vector(vector)),
+        },
+    )
+
+
+def _write(
+    vdb: InMemoryVDB, vectors: Mapping[int, np.ndarray], schema_id: str = SCHEMA_ID, number_shift: int = 0
+) -> None:
+    vdb.write_entities(
+        [
+            _create_entity_data(object_id, vector, schema_id, number_shift)
+            for object_id, vector in vectors.items()
+        ]
+    )
+
+
+def _search(
+    vdb: InMemoryVDB,
+    query: np.ndarray,
+    filters: Sequence[ComparisonOperation[Field]] = (),
+    schema_id: str = SCHEMA_ID,
+) -> list[str]:
+    results = vdb.knn_search(
+        INDEX_NAME,
+        schema_id,
+        VDBKNNSearchParams(
+            VectorFieldData(VECTOR_FIELD.name, Vector(query)),
+            LIMIT,
+            [SCHEMA_ID_FIELD],
+            [SCHEMA_ID_FIELD == schema_id, *filters],
+            None,
+        ),
+    )
+    return [result.id_.object_id for result in results]
+
+
+def _read_vector(vdb: InMemoryVDB, object_id: int, schema_id: str = SCHEMA_ID) -> np.ndarray | None:
+    entity_data = vdb.read_entities([Entity(EntityId(schema_id, str(object_id)), {VECTOR_FIELD.name: VECTOR_FIELD})])
+    field_data = entity_data[0].field_data.get(VECTOR_FIELD.name)
+    return field_data.value.value if field_data else None
+
+
+def _search_exactly(
+    vectors: Mapping[int, np.ndarray], query: np.ndarray, is_included: Callable[[int], bool] = lambda _: True
+) -> list[str]:
+    object_ids = [object_id for object_id in vectors if is_included(object_id)]
+    similarities = np.array([vectors[object_id] @ query for object_id in object_ids])
+    return [str(object_ids[index]) for index in np.argsort(-similarities)[:LIMIT]]
+
+
+def _write_and_update(vdb: InMemoryVDB) -> dict[int, np.ndarray]:
+    vectors = dict(enumerate(_create_vectors(ENTITY_COUNT)))
+    _write(vdb, vectors)
+    # updates relocate the vectors of the rows, which have to be found at their new positions only
+    updated_vectors = dict(zip(range(0, ENTITY_COUNT, 3), _create_vectors(ENTITY_COUNT, seed=1)))
+    _write(vdb, updated_vectors)
+    return {**vectors, **updated_vectors}
+
+
+@pytest.mark.parametrize(
+    "vdb_kwargs",
+    [
+        {},
+        # probing every list, so the results are exact whether or not the lists are trained already
+        {
+            "search_algorithm": SearchAlgorithm.IVF,
+            "ivf_params": InMemoryIVFParams(list_count=8, probe_count=8, training_threshold=100),
+        },
+        # rescoring every candidate, so the results are exact despite the quantization
+        {"quantization_params": InMemoryQuantizationParams(rescore_factor=ENTITY_COUNT // LIMIT)},
+        {
+            "quantization_params": InMemoryQuantizationParams(
+                InMemoryVectorPrecision.FLOAT16, rescore_factor=ENTITY_COUNT // LIMIT
+            )
+        },
+    ],
+)
+def test_knn_search_matches_exact_search(vdb_kwargs: dict[str, Any]) -> None:
+    vdb = _create_vdb(**vdb_kwargs)
+    vectors = _write_and_update(vdb)
+
+    for query in _create_vectors(QUERY_COUNT, seed=2):
+        assert _search(vdb, query) == _search_exactly(vectors, query)
+        assert _search(vdb, query, [NUMBER_FIELD == 1]) == _search_exactly(
+            vectors, query, lambda object_id: object_id % NUMBER_COUNT == 1
+        )
+    vdb.close_connection()
+
+
+@pytest.mark.parametrize("precision", list(InMemoryVectorPrecision))
+def test_quantized_knn_search_without_rescoring_is_close_to_exact_search(precision: InMemoryVectorPrecision) -> None:
+    vdb = _create_vdb(quantization_params=InMemoryQuantizationParams(precision, rescore_factor=0))
+    vectors = _write_and_update(vdb)
+
+    recalls = [
+        len(set(_search(vdb, query)) & set(_search_exactly(vectors, query))) / LIMIT
+        for query in _create_vectors(QUERY_COUNT, seed=2)
+    ]
+    assert np.mean(recalls) >= MIN_QUANTIZED_RECALL
+    vdb.close_connection()
+
+
+def test_entities_of_different_schemas_are_kept_apart() -> None:
+    vdb = _create_vdb()
+    vectors_by_schema_id = {
+        schema_id: dict(enumerate(_create_vectors(ENTITY_COUNT, seed)))
+        for seed, schema_id in enumerate(["first", "second"])
+    }
+    for schema_id, vectors in vectors_by_schema_id.items():
+        _write(vdb, vectors, schema_id)
+    # the same object ids of the other schema are other entities, which the updates must leave unchanged
+    updated_vectors = {object_id: -vectors_by_schema_id["first"][object_id] for object_id in range(0, ENTITY_COUNT, 2)}
+    _write(vdb, updated_vectors, "first")
+    vectors_by_schema_id["first"].update(updated_vectors)
+
+    for schema_id, vectors in vectors_by_schema_id.items():
+        for query in _create_vectors(QUERY_COUNT, seed=2):
+            assert _search(vdb, query, schema_id=schema_id) == _search_exactly(vectors, query)
+        assert all(
+            np.array_equal(_read_vector(vdb, object_id, schema_id), vector) for object_id, vector in vectors.items()
+        )
+    vdb.close_connection()
+
+
+@pytest.mark.parametrize("vdb_kwargs", [{}, {"quantization_params": InMemoryQuantizationParams()}])
+def test_pinned_generation_is_unaffected_by_later_writes(vdb_kwargs: dict[str, Any]) -> None:
+    vdb = _create_vdb(**vdb_kwargs)
+    vectors = _write_and_update(vdb)
+    added_vectors = dict(enumerate(_create_vectors(ENTITY_COUNT, seed=3), start=ENTITY_COUNT))
+
+    with vdb._pin_generation() as generation:  # pylint: disable=protected-access
+        partition = generation.partitions[SCHEMA_ID]
+        # rewriting every row compacts the vector stores, the growing vectors re-quantize the int8 matrix
+        for scale in [2, 5, 10]:
+            _write(vdb, {object_id: vector * scale for object_id, vector in vectors.items()}, number_shift=1)
+        _write(vdb, added_vectors, number_shift=1)
+
+        assert partition.size == ENTITY_COUNT
+        for object_id, vector in vectors.items():
+            row = partition.get_row(str(object_id))
+            assert row[NUMBER_FIELD.name] == object_id % NUMBER_COUNT
+            assert np.array_equal(row[VECTOR_FIELD.name].value, vector)
+        assert partition.find_row_numbers(NUMBER_FIELD == 1) == {
+            row_number
+            for row_number in range(ENTITY_COUNT)
+            if int(partition.object_ids[row_number]) % NUMBER_COUNT == 1
+        }
+    latest_vectors = {**{object_id: vector * 10 for object_id, vector in vectors.items()}, **added_vectors}
+    for query in _create_vectors(QUERY_COUNT, seed=2):
+        assert _search(vdb, query, [NUMBER_FIELD == 1]) == _search_exactly(
+            latest_vectors, query, lambda object_id: (object_id + 1) % NUMBER_COUNT == 1
+        )
+    vdb.close_connection()
+
+
+# without rescoring, the quantized scores have to match as well
+@pytest.mark.parametrize("vdb_kwargs", [{}, {"quantization_params": InMemoryQuantizationParams(rescore_factor=0)}])
+def test_sharded_knn_search_matches_single_process_search(vdb_kwargs: dict[str, Any]) -> None:
+    # small shards, so every search is split among the workers
+    sharded_vdb = _create_vdb(
+        sharding_params=InMemoryShardingParams(worker_count=2, min_shard_size=ENTITY_COUNT // 8), **vdb_kwargs
+    )
+    vdb = _create_vdb(**vdb_kwargs)
+    for written_vdb in [sharded_vdb, vdb]:
+        _write_and_update(written_vdb)
+
+    for query in _create_vectors(QUERY_COUNT, seed=2):
+        for filters in [[], [NUMBER_FIELD == 1]]:
+            assert _search(sharded_vdb, query, filters) == _search(vdb, query, filters)
+    sharded_vdb.close_connection()
+    vdb.close_connection()
+
+
+def test_binary_snapshot_round_trip(tmp_path: Path) -> None:
+    vdb = _create_vdb()
+    vectors = _write_and_update(vdb)
+    vdb.persist(LocalFileObjectSerializer(tmp_path / "first"))
+    vdb.close_connection()
+    restored_vdb = _create_vdb()
+    restored_vdb.restore(LocalFileObjectSerializer(tmp_path / "first"))
+    # the restored vectors are mapped from the files, which persisting again must replace, not overwrite
+    restored_vdb.persist(LocalFileObjectSerializer(tmp_path / "first"))
+    restored_vdb.persist(LocalFileObjectSerializer(tmp_path / "second"))
+    twice_restored_vdb = _create_vdb()
+    twice_restored_vdb.restore(LocalFileObjectSerializer(tmp_path / "second"))
+
+    for restored in [restored_vdb, twice_restored_vdb]:
+        for query in _create_vectors(QUERY_COUNT, seed=2):
+            assert _search(restored, query) == _search_exactly(vectors, query)
+        assert all(np.array_equal(_read_vector(restored, object_id), vectors[object_id]) for object_id in vectors)
+        restored.close_connection()
+
+
+# compacting after every batch as well, so the log is also replayed on top of a compacted snapshot
+@pytest.mark.parametrize("write_ahead_log_kwargs", [{}, {"min_compaction_bytes": 0}])
+def test_write_ahead_log_replays_the_applied_batches_only(
+    tmp_path: Path, write_ahead_log_kwargs: dict[str, Any]
+) -> None:
+    write_ahead_log_params = InMemoryWriteAheadLogParams(str(tmp_path), **write_ahead_log_kwargs)
+    vdb = _create_vdb(write_ahead_log_params=write_ahead_log_params)
+    vectors = _write_and_update(vdb)
+    invalid_entity_data = _create_entity_data(ENTITY_COUNT + 1, np.ones(DIMENSION - 1))
+
+    with pytest.raises(VectorFieldDimensionException):
+        vdb.write_entities([_create_entity_data(ENTITY_COUNT, np.ones(DIMENSION)), invalid_entity_data])
+    # neither entity of the failed batch is applied, nor logged to be replayed
+    assert _read_vector(vdb, ENTITY_COUNT) is None
+    vdb.close_connection()
+    restored_vdb = _create_vdb(write_ahead_log_params=write_ahead_log_params)
+    restored_vdb.restore()
+
+    assert _read_vector(restored_vdb, ENTITY_COUNT) is None
+    assert all(np.array_equal(_read_vector(restored_vdb, object_id), vectors[object_id]) for object_id in vectors)
+    restored_vdb.close_connection()
@@ -0,0 +1,60 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+
+from superlinked.framework.common.data_types import Vector
+from superlinked.framework.storage.in_memory.in_memory_ivf_params import (
+    InMemoryIVFParams,
+)
+from superlinked.framework.storage.in_memory.in_memory_vector_store import (
+    InMemoryVectorStore,
+)
+
+DIMENSION = 8
+ROW_COUNT = 300
+LIST_COUNT = 8
+TRAINING_THRESHOLD = 100
+
+
+def test_ivf_lists_are_trained_off_the_write_path() -> None:
+    store = InMemoryVectorStore(
+        DIMENSION,
+        InMemoryIVFParams(list_count=LIST_COUNT, probe_count=LIST_COUNT, training_threshold=TRAINING_THRESHOLD),
+    )
+    vectors = np.random.default_rng(0).normal(size=(ROW_COUNT, DIMENSION))
+    query = Vector(vectors[0])
+    for row_number in range(TRAINING_THRESHOLD):
+        store.upsert(row_number, Vector(vectors[row_number]))
+
+    # reaching the threshold makes the training due, the queries are searched exhaustively until it is installed
+    assert store.snapshot().find_candidate_positions(query) is None
+    assert store.is_ivf_training_due()
+    training = store.start_ivf_training()
+    assert training is not None
+    assert not store.is_ivf_training_due()
+    # written while the training runs: new rows and updates relocating existing ones
+    for row_number in range(TRAINING_THRESHOLD, ROW_COUNT):
+        store.upsert(row_number, Vector(vectors[row_number]))
+    for row_number in range(0, ROW_COUNT, 10):
+        store.upsert(row_number, Vector(-vectors[row_number]))
+    training.run()
+    store.finish_ivf_training(training)
+
+    snapshot = store.snapshot()
+    candidate_positions = snapshot.find_candidate_positions(query)
+    # probing every list finds every current position exactly once
+    assert candidate_positions is not None
+    assert candidate_positions.tolist() == sorted(snapshot.get_positions(range(ROW_COUNT)).tolist())
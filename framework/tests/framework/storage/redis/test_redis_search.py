@@ -0,0 +1,151 @@
+# Copyright 2024 Superlinked, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+import pytest
+from beartype.typing import Any, Iterator
+from redis import Redis
+from redisvl.query.query import VectorQuery
+
+from superlinked.framework.common.calculation.distance_metric import DistanceMetric
+from superlinked.framework.common.storage.index_config import IndexConfig
+from superlinked.framework.common.storage.search_index.index_field_descriptor import (
+    VectorIndexFieldDescriptor,
+)
+from superlinked.framework.common.storage.search_index.search_algorithm import (
+    SearchAlgorithm,
+)
+from superlinked.framework.common.storage.search_index.vector_component_precision import (
+    VectorComponentPrecision,
+)
+from superlinked.framework.storage.redis.query.redis_vector_query_params import (
+    DISTANCE_ID,
+)
+from superlinked.framework.storage.redis.redis_field_encoder import RedisFieldEncoder
+from superlinked.framework.storage.redis.redis_search import RedisSearch
+from superlinked.framework.storage.redis.redis_vdb_client import RedisVDBClient
+
+INDEX_NAME = "index"
+VECTOR_FIELD_NAME = "vector"
+RESULT_COUNTS = [3, 1, 2]
+
+
+def _encode(value: Any, protocol: int) -> bytes:
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"${len(value.encode())}\r\n{value}\r\n".encode()
+    if isinstance(value, dict) and protocol == 3:
+        return f"%{len(value)}\r\n".encode() + b"".join(
+            _encode(key, protocol) + _encode(item, protocol) for key, item in value.items()
+        )
+    items = [element for pair in value.items() for element in pair] if isinstance(value, dict) else value
+    return f"*{len(items)}\r\n".encode() + b"".join(_encode(item, protocol) for item in items)
+
+
+def _create_search_reply(result_count: int, protocol: int) -> Any:
+    document_ids = [f"doc:{i}" for i in range(result_count)]
+    if protocol == 2:
+        return [result_count] + [
+            element for document_id in document_ids for element in [document_id, [DISTANCE_ID, "0.5"]]
+        ]
+    return {
+        "attributes": [],
+        "warning": [],
+        "total_results": result_count,
+        "format": "STRING",
+        "results": [
+            {"id": document_id, "extra_attributes": {DISTANCE_ID: "0.5"}, "values": []}
+            for document_id in document_ids
+        ],
+    }
+
+
+class StubRedisHandler(StreamRequestHandler):
+    """
+    Speaks enough RESP2 and RESP3 to answer `FT.SEARCH` with as many documents as the `LIMIT` of the query.
+    """
+
+    def handle(self) -> None:
+        protocol = 2
+        while line := self.rfile.readline():
+            args = [self.__read_bulk_string() for _ in range(int(line[1:]))]
+            command = args[0].upper()
+            if command == "HELLO":
+                protocol = int(args[1])
+                reply = _encode({"server": "redis", "proto": protocol}, protocol)
+            elif command == "FT.SEARCH":
+                result_count = int(args[args.index("LIMIT") + 2])
+                reply = _encode(_create_search_reply(result_count, protocol), protocol)
+            else:
+                reply = b"+OK\r\n"
+            self.wfile.write(reply)
+
+    def __read_bulk_string(self) -> str:
+        length = int(self.rfile.readline()[1:])
+        return self.rfile.read(length + 2)[:-2].decode(errors="replace")
+
+
+class Resp2VDBClient(RedisVDBClient):
+    def _create_client(self) -> Redis:
+        return Redis.from_url(self._connection_string, protocol=2)
+
+
+@pytest.fixture(name="redis_url")
+def fixture_redis_url() -> Iterator[str]:
+    server = ThreadingTCPServer(("127.0.0.1", 0), StubRedisHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"redis://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _get_document_ids(result: Any) -> list[Any]:
+    if isinstance(result, dict):
+        return [document[b"id"] for document in result[b"results"]]
+    return [document.id for document in result.docs]
+
+
+@pytest.mark.parametrize("client_type", [RedisVDBClient, Resp2VDBClient])
+def test_batch_search_parses_the_replies_like_single_searches(
+    redis_url: str, client_type: type[RedisVDBClient]
+) -> None:
+    search = RedisSearch(client_type(redis_url), RedisFieldEncoder())
+    index_config = IndexConfig(
+        INDEX_NAME,
+        VectorIndexFieldDescriptor(
+            VECTOR_FIELD_NAME, 2, DistanceMetric.INNER_PRODUCT, SearchAlgorithm.FLAT, VectorComponentPrecision.FLOAT32
+        ),
+        [],
+    )
+    queries = [
+        VectorQuery([1.0, 0.0], VECTOR_FIELD_NAME, [DISTANCE_ID], num_results=result_count)
+        for result_count in RESULT_COUNTS
+    ]
+
+    results = search.knn_search_batch(index_config, queries)
+    single_results = [search.knn_search(index_config, query) for query in queries]
+
+    assert [type(result) for result in results] == [type(result) for result in single_results]
+    assert [_get_document_ids(result) for result in results] == [
+        _get_document_ids(result) for result in single_results
+    ]
+    assert [len(_get_document_ids(result)) for result in results] == RESULT_COUNTS